@@ -0,0 +1,50 @@
+"""Time Dijkstra on a GenericGraph against the CSRGraphs built from it (by freeze and from_arrays),
+and report the memory each graph holds afterwards
+
+    python benchmarks/csr_search.py [num_vertices] [num_edges]
+
+"""
+import sys
+import time
+import numpy as np
+
+from simpleGraphM.graph import GenericGraph, CSRGraph
+from simpleGraphM.algorithms.search import BestFirstSearch
+
+def main(n=50000, m=250000, repeat=5):
+    rng = np.random.RandomState(0)
+    src, dst, w = rng.randint(0, n, m), rng.randint(0, n, m), rng.rand(m)
+    genG = GenericGraph.from_arrays(src, dst, w, num_vertices=n)
+    graphs = {"generic": genG, "freeze": genG.freeze(), "from_arrays": CSRGraph.from_arrays(src, dst, w, num_vertices=n)}
+
+    # best of interleaved runs, so load on the machine affects every graph alike
+    times = dict.fromkeys(graphs, float("inf"))
+    for _ in range(repeat):
+        for name, G in graphs.items():
+            t = time.perf_counter()
+            BestFirstSearch(G, 0, heuristic_type=None).run()
+            times[name] = min(times[name], time.perf_counter() - t)
+
+    for name, G in graphs.items():
+        print("{:12s} {:7.3f}s {:8.1f} MB".format(name, times[name], G.memory_usage()["total"] / 1e6))
+
+    # lookups of a named attribute (stored column-wise by freeze) against scalar weights, edges by source
+    multi = GenericGraph.from_arrays(src, dst, [{"cap": x, "cost": 1} for x in w.tolist()], num_vertices=n)
+    edges = sorted(multi.edge_dict)
+    lookups = {"generic scalar": lambda: [genG.cost(u, v) for u, v in edges],
+               "generic named": lambda: [multi.cost(u, v, name="cap") for u, v in edges],
+               "csr scalar": lambda: [graphs["freeze"].cost(u, v) for u, v in edges],
+               "csr named": lambda: [frozen.cost(u, v, name="cap") for u, v in edges],
+               "csr accessor": lambda: [cap(u, v) for u, v in edges]}
+    frozen = multi.freeze()
+    cap = frozen.cost_accessor("cap")
+    for name, run in lookups.items():
+        best = float("inf")
+        for _ in range(repeat):
+            t = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - t)
+        print("{:15s} {:7.3f}s".format(name, best))
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
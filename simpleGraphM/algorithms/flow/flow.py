@@ -2,7 +2,7 @@ import collections
 import numpy as np
 
 from simpleGraphM.algorithms.search import BreadthFirstSearch
-from simpleGraphM.graph import GraphFactory
+from simpleGraphM.graph import GraphFactory, CSRGraph
 
 INF = np.inf
 
@@ -26,11 +26,22 @@ class MaxFlow:
     """Solve a max flow problem (by default using edmonds-karp). Assumed all flow is initially zero.
     Instantiate this class and call run
 
+    A frozen CSRGraph is thawed into a GenericGraph first, since flows are written onto the edges,
+    and a read-only graph (i.e. shared by the GraphFactory cache, a view of one, or a snapshot) is
+    wrapped in an overlay. The resulting flows can be read from `self.G`. To leave a graph untouched,
+    pass `G.overlay()` instead. Views from `G.subgraph(...)` or `G.edge_filter(...)` are accepted too,
+    flows are then written onto the parent's weights (unless it is read-only)
+
     """
     def __init__(self, G, source=None, sink=None):
+        if isinstance(G, CSRGraph):
+            G = G.thaw()
+        elif getattr(G, "read_only", False):
+            G = G.overlay()
         # construct Gf, the residual graph.
         self.G = G
-        self.Gf = GraphFactory.create_graph("Generic", edge_dict=G.edge_dict, vertex_dict=None, graph_type="undirected", deep_copy=True)
+        # Gf is only used for its (undirected) adjacency, so the weights are not copied
+        self.Gf = GraphFactory.create_graph("Generic", edge_dict=dict.fromkeys(G.edge_dict), vertex_dict=None, graph_type="undirected", deep_copy=False)
         self.source = source
         self.sink = sink  
         # Add flow to edges
@@ -0,0 +1 @@
+from . partition import GraphPartition
\ No newline at end of file
@@ -0,0 +1,176 @@
+import collections
+import math
+
+class GraphPartition:
+    """Split a graph into k balanced parts with few cut edges. Instantiate this class and call run.
+    Edge directions and weights are ignored, only the number of cut edges is minimized
+
+    Regions are grown by breadth-first search from k seeds spread far apart (the smallest
+    region grows first), then refined by greedily moving boundary vertices to the neighboring
+    part holding most of their neighbors, as long as parts stay balanced
+
+    Example:
+        gp = GraphPartition(genG, k=4)
+        gp.run()
+        gp.parts['v1']          # part of vertex 'v1'
+        gp.boundary[0]          # vertices of part 0 with a neighbor in another part
+        subG = gp.subgraph(0)   # zero-copy view of part 0
+
+    Parameters:
+        G (GenericGraph): The graph to partition (or a view of it)
+        k (int): Number of parts
+        imbalance (float): Parts may hold up to (1 + imbalance) * n / k vertices (by default 0.05)
+
+    Attributes (defined at termination):
+        parts (dict): {vertex: part}
+        part_sizes (list): Number of vertices of each part
+        boundary (list of sets): For each part, its vertices adjacent to another part
+        cut_size (int): Number of (undirected) edges between different parts
+        max_size (int): Largest part size allowed
+
+    """
+    def __init__(self, G, k, imbalance=0.05):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.G = G
+        self.k = k
+        self.imbalance = imbalance
+        self.max_size = None
+
+        self.parts = None
+        self.part_sizes = None
+        self.boundary = None
+        self.cut_size = None
+
+    def _adjacency(self):
+        """Symmetric adjacency of G, {v: set of neighbors}, without self loops"""
+        G = self.G
+        adj = {v: set() for v in G.get_vertices()}
+        for v in list(adj):
+            for w in G.neighbors(v):
+                if w != v:
+                    adj[v].add(w)
+                    adj.setdefault(w, set()).add(v)
+        return adj
+
+    def run(self, refine_passes=10):
+        """Partition the graph
+
+        Arg:
+            refine_passes (int): Maximum number of refinement sweeps over the boundary (0 to skip refinement)
+
+        """
+        adj = self._adjacency()
+        n, k = len(adj), self.k
+        self.max_size = max(1, math.ceil((1 + self.imbalance) * n / k))
+
+        parts, sizes = self.__grow(adj, self.__seeds(adj))
+        for _ in range(refine_passes):
+            if not self.__refine(adj, parts, sizes):
+                break
+
+        self.parts = parts
+        self.part_sizes = sizes
+        self.boundary = [set() for _ in range(k)]
+        cut = 0
+        for v, p in parts.items():
+            for w in adj[v]:
+                if parts[w] != p:
+                    self.boundary[p].add(v)
+                    cut += 1
+        self.cut_size = cut // 2
+        return parts
+
+    def __bfs_hops(self, adj, sources):
+        hops = dict.fromkeys(sources, 0)
+        queue = collections.deque(sources)
+        while queue:
+            v = queue.popleft()
+            for w in adj[v]:
+                if w not in hops:
+                    hops[w] = hops[v] + 1
+                    queue.append(w)
+        return hops
+
+    def __seeds(self, adj):
+        """Pick k seeds far apart from each other: each new seed is the vertex farthest
+        from the seeds so far (an unreached vertex if the graph is disconnected)
+
+        """
+        if not adj:
+            return []
+        seeds = [min(adj, key=lambda v: len(adj[v]))]
+        while len(seeds) < min(self.k, len(adj)):
+            hops = self.__bfs_hops(adj, seeds)
+            unreached = [v for v in adj if v not in hops]
+            if unreached:
+                seeds.append(unreached[0])
+            else:
+                seeds.append(max(hops, key=hops.__getitem__))
+        return seeds
+
+    def __grow(self, adj, seeds):
+        """Grow one bfs region per seed, always extending the smallest region"""
+        k = self.k
+        parts = {}
+        sizes = [0] * k
+        queues = [collections.deque() for _ in range(k)]
+        for p, s in enumerate(seeds):
+            parts[s] = p
+            sizes[p] = 1
+            queues[p].append(s)
+
+        active = [p for p in range(k) if queues[p]]
+        while active:
+            p = min(active, key=sizes.__getitem__)
+            grown = False
+            while queues[p] and not grown:
+                # claim the free neighbors of the next vertex in the region's bfs queue
+                v = queues[p].popleft()
+                for w in adj[v]:
+                    if w not in parts and sizes[p] < self.max_size:
+                        parts[w] = p
+                        sizes[p] += 1
+                        queues[p].append(w)
+                        grown = True
+            if not grown or sizes[p] >= self.max_size:
+                active.remove(p)
+
+        # vertices no region could reach go to the smallest parts
+        for v in adj:
+            if v not in parts:
+                p = min(range(k), key=sizes.__getitem__)
+                parts[v] = p
+                sizes[p] += 1
+        return parts, sizes
+
+    def __refine(self, adj, parts, sizes):
+        """One sweep of greedy boundary moves. Returns whether any vertex moved"""
+        moved = False
+        for v in adj:
+            a = parts[v]
+            counts = collections.Counter(parts[w] for w in adj[v])
+            if not counts or (len(counts) == 1 and a in counts):
+                continue
+            b, cnt = max(counts.items(), key=lambda c: (c[1], c[0] == a))
+            if b != a and cnt > counts.get(a, 0) and sizes[b] < self.max_size and sizes[a] > 1:
+                parts[v] = b
+                sizes[a] -= 1
+                sizes[b] += 1
+                moved = True
+        return moved
+
+    def part_vertices(self, p):
+        """Return the vertices of part p"""
+        return [v for v, q in self.parts.items() if q == p]
+
+    def subgraph(self, p):
+        """Return a zero-copy view of G induced by the vertices of part p"""
+        return self.G.subgraph(self.part_vertices(p))
+
+    def subgraphs(self):
+        """Return a zero-copy view for every part, built in a single pass over the assignment"""
+        members = [[] for _ in range(self.k)]
+        for v, p in self.parts.items():
+            members[p].append(v)
+        return [self.G.subgraph(m) for m in members]
@@ -1,2 +1,3 @@
 from . search import BestFirstSearch
-from . search import BreadthFirstSearch
\ No newline at end of file
+from . search import BreadthFirstSearch
+from . grid_search import GridSearch
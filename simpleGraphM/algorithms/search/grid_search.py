@@ -0,0 +1,158 @@
+"""A-Star / Dijkstra specialized for occupancy grids
+
+Example:
+
+    # Create search object
+    gsearch = GridSearch(grid, start=(-15, -15), goal=(15, 15), heuristic_type='diagonal_nonuniform')
+
+    # Run it, path is a list of world coordinates from start to goal
+    path = gsearch.run()
+
+    # Cost-so-far and predecessor of every cell, shaped like grid.grid
+    gsearch.g, gsearch.parent
+
+"""
+import array
+import math
+import numpy as np
+
+from .search import Search
+from .search_utils import PriorityQueueHeap
+from simpleGraphM.graph.grid_utils import get_world
+
+# Grid based heuristics, in cells, given the absolute x and y cell differences
+_HEURISTICS = {
+    'manhattan': lambda dx, dy: dx + dy,
+    'euclidean': math.hypot,
+    'diagonal_uniform': max,
+    'diagonal_nonuniform': lambda dx, dy: 1.414*min(dx, dy) + abs(dx - dy),
+}
+
+class GridSearch(Search):
+    """A-Star or Dijkstra search on an OccupancySquareGrid, working on flat cell ids (iy * width + ix)
+    instead of world coordinate tuples. World coordinates are only used for start, goal and the final path
+
+    The search state is sized to grid.shape once: cost-so-far as float32, predecessors as int32
+    (-1 for none) and the closed set as a bitmap, i.e. about 8 bytes per cell instead of several
+    dict entries per visited node. Neighbors come from the grid's cached free-cell mask (unpacked
+    to a byte per cell for the search if the grid is bit-packed), and edge costs from `grid.cost`.
+    Closed cells are never reopened, as usual with consistent heuristics
+
+    Parameters:
+        graph (OccupancySquareGrid): The grid to search
+        start (tuple): Start (x, y) in world coordinates
+        goal (tuple): Goal (x, y) in world coordinates, or None to compute costs to every reachable cell
+        heuristic_type (str): 'manhattan', 'euclidean', 'diagonal_uniform', 'diagonal_nonuniform',
+            or 'zero'/None for Dijkstra
+
+    Attributes:
+        g (numpy.ndarray): float32 cost-so-far of each cell (inf if not reached), shaped like the grid
+        parent (numpy.ndarray): int32 cell id of the predecessor of each cell (-1 if none)
+        closed (bytearray): Bitmap of the expanded cells, bit (id & 7) of byte (id >> 3)
+
+    """
+    def __init__(self, graph, start, goal=None, heuristic_type='zero'):
+        Search.__init__(self, graph, start, goal)
+        self.heuristic_type = heuristic_type
+
+        h, w = graph.shape
+        n = h * w
+        # python arrays index quickly one cell at a time, g and parent are numpy views of them
+        self._g = array.array('f', [math.inf]) * n
+        self._parent = array.array('i', [-1]) * n
+        self.closed = bytearray((n + 7) // 8)
+        self.g = np.frombuffer(self._g, dtype=np.float32).reshape(h, w)
+        self.parent = np.frombuffer(self._parent, dtype=np.int32).reshape(h, w)
+
+        s = self.cell_id(start)
+        self._g[s] = 0
+        self.frontier = PriorityQueueHeap()
+        self.frontier.put(s, 0)
+
+    def _structures(self):
+        return {"g": self._g, "parent": self._parent, "closed": self.closed, "frontier": self.frontier.elements}
+
+    def cell_id(self, node):
+        """Return the flat cell id of a node given in world coordinates"""
+        (x, y) = node
+        h, w = self.graph.shape
+        indx = int(round((x - self.graph.grid_dim[0]) / self.graph.grid_size))
+        indy = int(round((y - self.graph.grid_dim[2]) / self.graph.grid_size))
+        if not (0 <= indx < w and 0 <= indy < h):
+            raise ValueError("{} is outside of the grid".format(node))
+        return indy * w + indx
+
+    def node(self, cell):
+        """Return the world coordinates of a flat cell id"""
+        indy, indx = divmod(cell, self.graph.shape[1])
+        return get_world(indx, indy, self.graph.grid_size, self.graph.grid_dim)
+
+    def run(self):
+        """ Usage:
+            - call to run the full algorithm until the goal is expanded or the frontier is empty
+
+            Returns:
+            - the path from start to goal in world coordinates ([] if unreachable or no goal)
+        """
+        grid = self.graph
+        w = grid.shape[1]
+        gs = grid.grid_size
+        free, width, steps = grid._neighbor_table()
+        if grid.storage == "packed":
+            free = np.unpackbits(np.frombuffer(free, dtype=np.uint8)).tobytes()
+        # (cell id step, padded mask step, dx, dy, edge cost) of each neighbor offset
+        moves = [(dy * w + dx, step, dx, dy, grid.cost((0, 0), (wdx, wdy))) for step, dx, dy, wdx, wdy in steps]
+
+        goal = -1 if self.goal is None else self.cell_id(self.goal)
+        heuristic = _HEURISTICS.get(self.heuristic_type) if goal >= 0 else None
+        goaly, goalx = divmod(goal, w)
+
+        frontier = self.frontier
+        g, parent, closed = self._g, self._parent, self.closed
+
+        while not frontier.empty():
+            _, current = frontier.get()
+            if closed[current >> 3] & (1 << (current & 7)):
+                # stale entry, expanded already with a lower cost
+                continue
+            closed[current >> 3] |= 1 << (current & 7)
+
+            # early exit if we reached our goal
+            if current == goal:
+                break
+
+            indy, indx = divmod(current, w)
+            i = current + 2 * indy + width + 1      # index in the padded free-cell mask
+            g_current = g[current]
+            for cell_step, step, dx, dy, step_cost in moves:
+                if not free[i + step]:
+                    continue
+                next = current + cell_step
+                if closed[next >> 3] & (1 << (next & 7)):
+                    continue
+                g_next = g_current + step_cost
+                if g_next < g[next]:
+                    g[next] = g_next
+                    parent[next] = current
+                    if heuristic is None:
+                        priority = g_next
+                    else:
+                        priority = g_next + gs * heuristic(abs(indx + dx - goalx), abs(indy + dy - goaly))
+                    frontier.put(next, priority)
+
+        return self.path() if self.goal is not None else []
+
+    def path(self, node=None):
+        """Return the path from start to node (by default the goal) in world coordinates,
+        or [] if it was not reached
+
+        """
+        cell = self.cell_id(self.goal if node is None else node)
+        if self._g[cell] == math.inf:
+            return []
+        cells = []
+        while cell != -1:
+            cells.append(cell)
+            cell = self._parent[cell]
+        cells.reverse()
+        return [self.node(c) for c in cells]
@@ -24,6 +24,7 @@ import time
 
 from .search_utils import PriorityQueueHeap
 from .search_utils import Queue
+from simpleGraphM.graph.memory import memory_report
 
 class Search:
     
@@ -52,6 +53,16 @@ class Search:
     def run(self):
         pass
 
+    def memory_usage(self, deep=True):
+        """Return the bytes held by the search state (g, parent, frontier), plus a "total".
+        The graph itself is not included, see its own `memory_usage`
+
+        """
+        return memory_report(self._structures(), deep=deep)
+
+    def _structures(self):
+        return {"g": self.g, "parent": self.parent, "frontier": getattr(self.frontier, "elements", self.frontier)}
+
 class BreadthFirstSearch(Search):
 
     def __init__(self, graph, start=None, goal=None):
@@ -109,6 +120,11 @@ class BestFirstSearch(Search):
         self.depth_limit = depth_limit
         self.boundary_nodes = set()
 
+    def _structures(self):
+        structures = Search._structures(self)
+        structures["boundary_nodes"] = self.boundary_nodes
+        return structures
+
     def heuristic(self, a, b, type_='manhattan'):
         """ Grid based heuristics """
         (x1, y1) = a
@@ -148,6 +164,8 @@ class BestFirstSearch(Search):
         frontier = self.frontier
         parent = self.parent
         g = self.g
+        neighbors = self.graph.neighbors
+        cost = self.graph.cost
 
         while not frontier.empty():
             _, current = frontier.get()  # update current to be the item with best priority
@@ -160,8 +178,8 @@ class BestFirstSearch(Search):
                 break
 
             # expand current node and check neighbors
-            for next in self.graph.neighbors(current):
-                g_next = g[current] + self.graph.cost(current, next)
+            for next in neighbors(current):
+                g_next = g[current] + cost(current, next)
                 # if next location not in CLOSED LIST or its cost is less than before
                 # Newer implementation
                 if next not in g or g_next < g[next]:
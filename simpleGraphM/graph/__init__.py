@@ -1 +1,8 @@
-from .graph_manager import GraphFactory
\ No newline at end of file
+from .graph_manager import GraphFactory
+from .generic_graph import GenericGraph
+from .csr_graph import CSRGraph
+from .overlay_graph import OverlayGraph
+from .disk_graph import DiskGraph
+from .vertex_table import VertexTable
+from .graph_view import GraphView
+from .snapshot import GraphSnapshot
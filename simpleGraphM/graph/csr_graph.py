@@ -0,0 +1,611 @@
+import collections
+import numpy as np
+
+from .graph import Graph
+from .generic_graph import GenericGraph, _coo_arrays
+from .vertex_table import VertexTable
+from .graph_io import write_graph_file, read_graph_file
+from .memory import memory_report
+
+def _pack_values(values):
+    """Pack a list of weights into a numpy array. Plain numbers get a numeric dtype,
+    anything else (dicts, lists, None) is kept as an object array
+
+    """
+    if all(type(w) in (int, float) for w in values):
+        return np.array(values)
+    arr = np.empty(len(values), dtype=object)
+    for i, w in enumerate(values):
+        arr[i] = w
+    return arr
+
+def _pack_columns(values):
+    """Split flat dict weights, i.e. {"cap": 16, "flow": 0}, into one numpy column per attribute.
+    Returns None unless every weight is a dict of plain numbers with the same attribute names
+
+    """
+    if not values or not all(isinstance(w, dict) for w in values):
+        return None
+    keys = values[0].keys()
+    if not keys or any(w.keys() != keys for w in values):
+        return None
+    columns = {}
+    for name in keys:
+        col = [w[name] for w in values]
+        if not all(type(x) in (int, float) for x in col):
+            return None
+        columns[name] = np.array(col)
+    return columns
+
+def _column_name(name):
+    """Return name as a single attribute name if it can refer to a column, else None"""
+    if type(name) == list:
+        return name[0] if len(name) == 1 else None
+    return name
+
+def _lookup(weight, name):
+    """Walk a (possibly nested) weight using a name or list of names"""
+    if type(name) == list:
+        for n in name:
+            weight = weight[n]
+        return weight
+    return weight[name]
+
+class _SortedKeyIndex:
+    """Vertex key -> vertex id lookup by binary search over a sorted copy of the keys. Unlike a
+    dict, nothing has to be built per vertex, so memory mapped graphs are usable right away.
+    Only used for memory mapped keys, graphs held in memory use a dict
+
+    Parameters:
+        keys (numpy.ndarray): Integer or string vertex keys, indexed by vertex id
+        order (numpy.ndarray): Optional permutation sorting keys, i.e. np.argsort(keys)
+        sorted_keys (numpy.ndarray): Optional keys[order]
+
+    """
+    def __init__(self, keys, order=None, sorted_keys=None):
+        if order is None:
+            order = np.argsort(keys, kind="stable")
+        if sorted_keys is None:
+            sorted_keys = keys[order]
+        self.order = order
+        self.sorted_keys = sorted_keys
+
+    def get(self, key, default=None):
+        try:
+            k = np.searchsorted(self.sorted_keys, key)
+            if k < len(self.sorted_keys) and self.sorted_keys[k] == key:
+                return int(self.order[k])
+        except (TypeError, ValueError):
+            pass
+        return default
+
+    def __getitem__(self, key):
+        i = self.get(key)
+        if i is None:
+            raise KeyError(key)
+        return i
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+def _read_csr_file(path, mmap=True):
+    """Read a csr graph file, returning its metadata, raw arrays and CSRGraph constructor kwargs"""
+    kind, meta, arrays = read_graph_file(path, mmap=mmap)
+    if kind != "csr":
+        raise ValueError('{} holds a "{}", not a csr graph'.format(path, kind))
+
+    keys = arrays["vertex_keys"]
+    if meta.get("tuple_keys"):
+        keys = [tuple(v) for v in keys.tolist()]
+    kwargs = {"indptr": arrays["indptr"], "indices": arrays["indices"], "weights": arrays.get("weights"),
+              "vertices": keys, "vertex_weights": arrays.get("vertex_weights"), "graph_type": meta["graph_type"],
+              "edge_attrs": {name: arrays["edge_attr_{}".format(i)] for i, name in enumerate(meta["edge_attrs"])},
+              "vertex_attrs": {name: arrays["vertex_attr_{}".format(i)] for i, name in enumerate(meta["vertex_attrs"])},
+              "key_order": arrays.get("key_order"), "sorted_keys": arrays.get("sorted_keys")}
+    return meta, arrays, kwargs
+
+# key of no vertex, for the empty last-row cache of CSRGraph
+_NO_ROW = object()
+
+class CSRGraph(Graph):
+    """A read-only graph with its adjacency packed into compressed sparse row (CSR) arrays.
+    Usually built by freezing a GenericGraph, i.e. `genG.freeze()`, and exposes the same
+    `neighbors`/`cost` interface so search and flow algorithms can run on it directly.
+
+    The neighbors of vertex id i are `indices[indptr[i]:indptr[i+1]]` (sorted), with
+    edge weights stored at the same positions in `weights`. Multi-weighted edges (i.e.
+    {"cap": 16, "flow": 0}) are stored column-wise instead, with one array per attribute
+    in `edge_attrs` indexed by the same edge position.
+
+    Parameters:
+        indptr (numpy.ndarray): Row pointers, of size node_count()+1
+        indices (numpy.ndarray): Neighbor vertex id of every edge
+        weights (numpy.ndarray): Weight of every edge, aligned with indices
+        vertices (list or numpy.ndarray): Vertex keys, i.e. vertex id i has key vertices[i].
+            Memory mapped integer or string keys are kept on disk and searched with a sorted index
+        vertex_weights (numpy.ndarray): Optional weight of every vertex
+        graph_type (str): "undirected" or "directed". Undirected edges are stored in both directions
+        edge_attrs (dict): Optional {name: numpy.ndarray} edge attribute columns, used when weights is None
+        vertex_attrs (dict): Optional {name: numpy.ndarray} vertex attribute columns, used when vertex_weights is None
+        key_order, sorted_keys (numpy.ndarray): Optional precomputed sorted index of numpy vertex keys
+        max_rows (int): Maximum number of rows kept decoded by neighbors/cost, least recently
+            used first out (by default 4096)
+
+    Attributes:
+        indptr (numpy.ndarray): see above
+        indices (numpy.ndarray): see above
+        weights (numpy.ndarray): see above
+        vertex_weights (numpy.ndarray): see above
+        edge_attrs (dict): see above
+        vertex_attrs (dict): see above
+        graph_type (str): see above
+        max_rows (int): see above
+
+    """
+    def __init__(self, indptr, indices, weights, vertices, vertex_weights=None, graph_type="directed", edge_attrs=None, vertex_attrs=None,
+                 key_order=None, sorted_keys=None, max_rows=4096):
+        self.indptr = np.asanyarray(indptr, dtype=np.int64)
+        self.indices = np.asanyarray(indices, dtype=np.int64)
+        self.weights = weights
+        self.vertex_weights = vertex_weights
+        self.edge_attrs = edge_attrs if edge_attrs is not None else {}
+        self.vertex_attrs = vertex_attrs if vertex_attrs is not None else {}
+        self.graph_type = graph_type
+
+        # sorted src*n+dst code of every edge, built on first use by cost_many
+        self._edge_codes = None
+
+        # rows decoded to Python objects by neighbors/cost, see `_cached_row`
+        self.max_rows = max_rows
+        self._rows = collections.OrderedDict()
+        # the row used last, searches ask for a row's neighbors and then for each of their costs
+        self._last = (_NO_ROW, None)
+
+        assert len(self.indptr) == len(vertices) + 1, "indptr must have node_count()+1 entries"
+        assert len(self.indices) == self.indptr[-1], "indices does not agree with indptr"
+
+        # vertex key <-> vertex id tables
+        if isinstance(vertices, np.ndarray) and vertices.ndim == 1 and vertices.dtype.kind in "iuU":
+            self._keys = vertices
+            if isinstance(vertices, np.memmap):
+                self._index = _SortedKeyIndex(vertices, key_order, sorted_keys)
+            else:
+                self._index = dict(zip(vertices.tolist(), range(len(vertices))))
+        else:
+            self._keys = np.empty(len(vertices), dtype=object)
+            for i, v in enumerate(vertices):
+                self._keys[i] = v
+            self._index = dict(zip(self._keys.tolist(), range(len(self._keys))))
+
+    @classmethod
+    def from_arrays(cls, src, dst, weight=None, num_vertices=None, graph_type="directed"):
+        """Build a graph from parallel edge arrays in vectorized passes
+
+        Parameters:
+            src (numpy.ndarray): Tail vertex of every edge
+            dst (numpy.ndarray): Head vertex of every edge
+            weight (numpy.ndarray or dict): Weight of every edge (by default all int 1), or a dict of
+                {name: numpy.ndarray} attribute columns
+            num_vertices (int): If given, src/dst are vertex ids in range(num_vertices) and the
+                vertex keys are the ids themselves. Otherwise the keys are the unique values of src/dst
+            graph_type (str): "undirected" or "directed"
+
+        Duplicate edges are collapsed, keeping the last one (like dict updates). In undirected
+        graphs (u, v) and (v, u) are the same edge, so both directions get the weight of its last
+        occurrence, as in `GenericGraph.from_arrays`
+
+        """
+        src, dst = np.asarray(src), np.asarray(dst)
+        assert src.shape == dst.shape and src.ndim == 1, "src and dst must be 1d arrays of the same size"
+        if weight is None:
+            columns = {None: np.ones(len(src), dtype=np.int64)}
+        elif isinstance(weight, dict):
+            columns = {name: np.asarray(col) for name, col in weight.items()}
+        else:
+            columns = {None: np.asarray(weight)}
+
+        if num_vertices is None:
+            vertices, inv = np.unique(np.concatenate((src, dst)), return_inverse=True)
+            src, dst = inv[:len(src)], inv[len(src):]
+        else:
+            vertices = np.arange(num_vertices)
+        n = len(vertices)
+
+        if graph_type == "undirected":
+            # collapse duplicates on the canonical (low, high) edge first, so both directions agree
+            lo, hi = np.minimum(src, dst), np.maximum(src, dst)
+            order = np.lexsort((hi, lo))
+            lo, hi = lo[order], hi[order]
+            keep = np.ones(len(lo), dtype=bool)
+            keep[:-1] = (lo[1:] != lo[:-1]) | (hi[1:] != hi[:-1])
+            src, dst, sel = lo[keep], hi[keep], order[keep]
+            columns = {name: col[sel] for name, col in columns.items()}
+            # then mirror every edge but self loops
+            loop = src == dst
+            src, dst = np.concatenate((src, dst[~loop])), np.concatenate((dst, src[~loop]))
+            columns = {name: np.concatenate((col, col[~loop])) for name, col in columns.items()}
+
+        # stable sort by (src, dst), then keep the last of any duplicated edges
+        order = np.lexsort((dst, src))
+        src, dst = src[order], dst[order]
+        keep = np.ones(len(src), dtype=bool)
+        keep[:-1] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst, sel = src[keep], dst[keep], order[keep]
+        columns = {name: col[sel] for name, col in columns.items()}
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+        if None in columns:
+            return cls(indptr, dst, columns[None], vertices, graph_type=graph_type)
+        return cls(indptr, dst, None, vertices, graph_type=graph_type, edge_attrs=columns)
+
+    @classmethod
+    def from_dense(cls, mat, graph_type="directed"):
+        """Build a graph from a dense (n x n) adjacency matrix, where nonzero entries are edges.
+        Vertex keys are the row/column indices
+
+        """
+        mat = np.asarray(mat)
+        assert mat.ndim == 2 and mat.shape[0] == mat.shape[1], "mat must be a square matrix"
+        src, dst = np.nonzero(mat)
+        return cls.from_arrays(src, dst, mat[src, dst], num_vertices=mat.shape[0], graph_type=graph_type)
+
+    @classmethod
+    def from_sparse(cls, coo, shape=None, graph_type="directed"):
+        """Build a graph from a COO-style sparse matrix
+
+        Parameters:
+            coo (tuple): (row, col, data) arrays, or any object with a `tocoo()` method (i.e. scipy.sparse)
+            shape (tuple): Matrix shape (n, n). By default inferred from the largest index
+
+        """
+        row, col, data, n = _coo_arrays(coo, shape)
+        return cls.from_arrays(row, col, data, num_vertices=n, graph_type=graph_type)
+
+    @classmethod
+    def from_generic(cls, graph):
+        """Pack a GenericGraph into CSR arrays
+
+        Parameter:
+            graph (GenericGraph): the graph to freeze. Numeric weights and flat dicts of numbers are
+                packed into arrays (copies), other weights are shared through an object array
+
+        """
+        vertices = list(graph.vertex_dict)
+        vertices.extend(v for v in graph.adjList if v not in graph.vertex_dict)
+        index = {v: i for i, v in enumerate(vertices)}
+
+        n, m = len(vertices), len(graph.edge_dict)
+        src = np.fromiter((index[e[0]] for e in graph.edge_dict), dtype=np.int64, count=m)
+        dst = np.fromiter((index[e[1]] for e in graph.edge_dict), dtype=np.int64, count=m)
+        values = list(graph.edge_dict.values())
+
+        # sort edges by (src, dst) so each row is contiguous and sorted
+        order = np.lexsort((dst, src))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+        # multi-weighted edges are stored column-wise when possible
+        weights, edge_attrs = None, _pack_columns(values)
+        if edge_attrs is None:
+            weights = _pack_values(values)[order]
+        else:
+            edge_attrs = {name: col[order] for name, col in edge_attrs.items()}
+
+        vertex_weights, vertex_attrs = None, None
+        if any(graph.vertex_dict.get(v) is not None for v in vertices):
+            values = [graph.vertex_dict.get(v) for v in vertices]
+            vertex_attrs = _pack_columns(values)
+            if vertex_attrs is None:
+                vertex_weights = _pack_values(values)
+
+        return cls(indptr, dst[order], weights, vertices, vertex_weights=vertex_weights, graph_type=graph.graph_type,
+                   edge_attrs=edge_attrs, vertex_attrs=vertex_attrs)
+
+    def thaw(self, deep_copy=True):
+        """Return a mutable GenericGraph with the same edges and vertices
+
+        Arg:
+            deep_copy (bool): Whether weights should be deep copied (by default True)
+
+        """
+        if self.weights is not None:
+            weights = self.weights.tolist()
+        else:
+            weights = [self._edge_weight(k) for k in range(self.edge_count())]
+        edge_dict = dict(zip(self.edges, weights))
+        vertex_dict = {v: self._vertex_weight(i) for i, v in enumerate(self._keys.tolist())}
+        return GenericGraph(edge_dict=edge_dict, vertex_dict=vertex_dict, graph_type=self.graph_type, deep_copy=deep_copy)
+
+    def _structures(self):
+        return {"indptr": self.indptr, "indices": self.indices, "weights": self.weights,
+                "vertex_weights": self.vertex_weights, "edge_attrs": self.edge_attrs, "vertex_attrs": self.vertex_attrs,
+                "vertex_keys": self._keys, "key_index": self._index, "edge_codes": self._edge_codes,
+                "row_cache": self._rows}
+
+    def memory_usage(self, deep=True):
+        """Return the bytes held by each internal structure, plus a "total". Memory mapped
+        arrays only count their header, see `memory.sizeof`
+
+        """
+        return memory_report(self._structures(), deep=deep)
+
+    def save(self, path):
+        """Write the graph to a versioned binary file (see graph_io), which `CSRGraph.load`
+        can memory map. Vertex keys must be all ints, all strings, or equal length tuples of
+        numbers, and weights must be numeric (or numeric attribute columns)
+
+        """
+        arrays = {"indptr": self.indptr, "indices": self.indices}
+        meta = {"graph_type": self.graph_type, "edge_attrs": list(self.edge_attrs), "vertex_attrs": list(self.vertex_attrs)}
+
+        keys = self._keys
+        if keys.dtype == object:
+            keys = keys.tolist()
+            if all(type(v) is int for v in keys):
+                keys = np.array(keys, dtype=np.int64)
+            elif all(type(v) is str for v in keys):
+                keys = np.array(keys, dtype=str)
+            elif keys and all(type(v) is tuple for v in keys) and len(set(map(len, keys))) == 1:
+                keys = np.array(keys)
+                meta["tuple_keys"] = True
+            elif keys:
+                raise TypeError("vertex keys must be all ints, all strings or equal length tuples to be saved")
+            else:
+                keys = np.zeros(0, dtype=np.int64)
+        arrays["vertex_keys"] = keys
+        if keys.ndim == 1:
+            order = np.argsort(keys, kind="stable")
+            arrays["key_order"], arrays["sorted_keys"] = order, keys[order]
+
+        for name, weights in (("weights", self.weights), ("vertex_weights", self.vertex_weights)):
+            if weights is None:
+                continue
+            if weights.dtype == object:
+                # numbers mixed with None (unweighted) are written as NaN
+                values = weights.tolist()
+                if not all(w is None or type(w) in (int, float) for w in values):
+                    raise TypeError("only numeric {} (or numeric attribute columns) can be saved".format(name))
+                weights = np.array([np.nan if w is None else w for w in values], dtype=np.float64)
+                meta[name + "_none_as_nan"] = True
+            arrays[name] = weights
+        for i, col in enumerate(self.edge_attrs.values()):
+            arrays["edge_attr_{}".format(i)] = col
+        for i, col in enumerate(self.vertex_attrs.values()):
+            arrays["vertex_attr_{}".format(i)] = col
+
+        write_graph_file(path, "csr", meta, arrays)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a graph written by `save`
+
+        Parameters:
+            path (str): File to read
+            mmap (bool): If True (default), arrays are memory mapped read-only straight from the file,
+                so the graph is usable without reading it and the pages are shared across processes
+
+        """
+        meta, arrays, kwargs = _read_csr_file(path, mmap)
+        for name in ("weights", "vertex_weights"):
+            if meta.get(name + "_none_as_nan"):
+                weights = arrays[name].astype(object)
+                weights[np.isnan(arrays[name])] = None
+                kwargs[name] = weights
+        return cls(**kwargs)
+
+    def _edge_weight(self, k):
+        """Return the weight of the edge at position k (a new dict for column-wise weights)"""
+        if self.weights is not None:
+            w = self.weights[k]
+            return w.item() if isinstance(w, np.generic) else w
+        return {name: col[k].item() for name, col in self.edge_attrs.items()}
+
+    def _vertex_weight(self, i):
+        if self.vertex_weights is not None:
+            w = self.vertex_weights[i]
+            return w.item() if isinstance(w, np.generic) else w
+        if self.vertex_attrs:
+            return {name: col[i].item() for name, col in self.vertex_attrs.items()}
+        return None
+
+    def _cached_row(self, v):
+        """Return the row of vertex key v as (neighbor keys, {neighbor key: offset in the row}, position of
+        the row's first edge, list of the row's weights or None for column-wise weights, {attribute name:
+        list of the row's values} filled by `_row_column`), or None if v is not a vertex. The `max_rows` most recently used rows are kept decoded, so the neighbors/cost
+        calls a search makes on a vertex cost a dict lookup, as on a GenericGraph. See `clear_cache`
+
+        """
+        last = self._last
+        if last[0] == v:
+            return last[1]
+        rows = self._rows
+        row = rows.get(v)
+        if row is not None:
+            rows.move_to_end(v)
+            self._last = (v, row)
+            return row
+        i = self._index.get(v)
+        if i is None:
+            return None
+        a, b = self.indptr[i:i+2].tolist()
+        keys = self._keys[self.indices[a:b]].tolist()
+        weights = self.weights[a:b].tolist() if self.weights is not None else None
+        row = rows[v] = (keys, dict(zip(keys, range(b - a))), a, weights, {})
+        if len(rows) > self.max_rows:
+            rows.popitem(last=False)
+        self._last = (v, row)
+        return row
+
+    def _row_column(self, row, name):
+        """Return the values of attribute column `name` over a row from `_cached_row`, as a list decoded on first use"""
+        values = row[4].get(name)
+        if values is None:
+            a = row[2]
+            values = row[4][name] = self.edge_attrs[name][a:a + len(row[0])].tolist()
+        return values
+
+    def clear_cache(self):
+        """Drop the rows cached by neighbors/cost"""
+        self._rows.clear()
+        self._last = (_NO_ROW, None)
+
+    def _edge_pos(self, from_node, to_node):
+        """Return position of edge (from_node, to_node) in indices/weights. Raises KeyError if not found"""
+        row = self._cached_row(from_node)
+        j = None if row is None else row[1].get(to_node)
+        if j is None:
+            raise KeyError((from_node, to_node))
+        return row[2] + j
+
+    @property
+    def edges(self):
+        """An iterator of (from_node, to_node) keys"""
+        src = np.repeat(np.arange(self.node_count()), np.diff(self.indptr))
+        return zip(self._keys[src].tolist(), self._keys[self.indices].tolist())
+
+    @property
+    def vertices(self):
+        return self._keys.tolist()
+
+    def edge_count(self):
+        return len(self.indices)
+
+    def node_count(self):
+        return len(self._keys)
+
+    def get_vertices(self):
+        return self._keys.tolist()
+
+    def vertex_table(self):
+        """Return a (frozen) VertexTable over the vertex ids of this graph, sharing its key arrays"""
+        return VertexTable(self._keys, self._index, frozen=True)
+
+    def vertex_id(self, v):
+        """Return the integer id of vertex key v"""
+        return self._index[v]
+
+    def neighbor_ids(self, i):
+        """Return the neighbor ids of vertex id i, as a view into indices (no copy)"""
+        return self.indices[self.indptr[i]:self.indptr[i+1]]
+
+    def neighbors(self, v):
+        """Return a list of neighbors of v"""
+        row = self._cached_row(v)
+        if row is None:
+            return []
+        return row[0][:]
+
+    def cost(self, *args, **kwargs):
+        """Return cost of edge or vertex based on number of args
+
+        Args:
+            from_node, to_node (vertex, vertex): Key of vertices of an edge
+            node (vertex): Key of a single vertex
+
+        Kwargs:
+            name (str): To determine the specific reference for multi-weighted edges of graphs
+
+        """
+        if len(args) == 2:
+            row = self._cached_row(args[0])
+            j = None if row is None else row[1].get(args[1])
+            if j is None:
+                raise KeyError(args)
+            if not kwargs:
+                if row[3] is not None:
+                    # scalar weights, the common case in search loops
+                    return row[3][j]
+            else:
+                # an attribute column is read from the row as well, as fast as scalar weights
+                name = kwargs.get("name")
+                values = row[4].get(name) if type(name) is str else None
+                if values is None and _column_name(name) in self.edge_attrs:
+                    values = self._row_column(row, _column_name(name))
+                if values is not None:
+                    return values[j]
+            k, attrs, weight = row[2] + j, self.edge_attrs, self._edge_weight
+        elif len(args) == 1:
+            k, attrs, weight = self._index[args[0]], self.vertex_attrs, self._vertex_weight
+        else:
+            raise KeyError("vertex or edge not found using arguments: {}".format(args))
+
+        if "name" in kwargs:
+            name = kwargs["name"]
+            col = _column_name(name)
+            if col in attrs:
+                return attrs[col][k].item()
+            return _lookup(weight(k), name)
+        return weight(k)
+
+    def cost_accessor(self, name=None, vertex=False):
+        """Return a function that looks up edge costs (or vertex costs) for a fixed `name`,
+        reading straight from an attribute column when there is one. See `GenericGraph.cost_accessor`
+
+        """
+        index = self._index
+        attrs = self.vertex_attrs if vertex else self.edge_attrs
+        col = _column_name(name)
+        if col in attrs:
+            if vertex:
+                col = attrs[col]
+                return lambda node: col[index[node]].item()
+
+            def get(from_node, to_node):
+                row = self._cached_row(from_node)
+                j = None if row is None else row[1].get(to_node)
+                if j is None:
+                    raise KeyError((from_node, to_node))
+                return self._row_column(row, col)[j]
+            return get
+
+        if vertex:
+            if name is None:
+                return lambda node: self._vertex_weight(index[node])
+            return lambda node: _lookup(self._vertex_weight(index[node]), name)
+        if name is None:
+            return lambda from_node, to_node: self._edge_weight(self._edge_pos(from_node, to_node))
+        return lambda from_node, to_node: _lookup(self._edge_weight(self._edge_pos(from_node, to_node)), name)
+
+    def edge_positions(self, src, dst):
+        """Return the positions of many edges in indices/weights/edge_attrs, in one vectorized pass
+
+        Args:
+            src, dst (numpy.ndarray): Vertex ids of the edges
+
+        """
+        n = self.node_count()
+        if self._edge_codes is None:
+            rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+            self._edge_codes = rows * n + self.indices
+        codes = np.asarray(src, dtype=np.int64) * n + np.asarray(dst, dtype=np.int64)
+        pos = np.searchsorted(self._edge_codes, codes)
+        found = pos < len(self._edge_codes)
+        found[found] = self._edge_codes[pos[found]] == codes[found]
+        if not found.all():
+            bad = np.flatnonzero(~found)[0]
+            raise KeyError((self._keys[codes[bad] // n], self._keys[codes[bad] % n]))
+        return pos
+
+    def cost_many(self, edges, name=None):
+        """Return the costs of many edges at once as a numpy array. Column-wise and scalar
+        weights are gathered without a per-edge Python lookup of the weight
+
+        Args:
+            edges (iter): (from_node, to_node) pairs
+            name (str or list): Attribute name, or list of nested names (by default None, the whole weight)
+
+        """
+        index = self._index
+        edges = list(edges)
+        src = np.fromiter((index[e[0]] for e in edges), dtype=np.int64, count=len(edges))
+        dst = np.fromiter((index[e[1]] for e in edges), dtype=np.int64, count=len(edges))
+        pos = self.edge_positions(src, dst)
+
+        col = _column_name(name)
+        if col in self.edge_attrs:
+            return self.edge_attrs[col][pos]
+        if name is None and self.weights is not None:
+            return self.weights[pos]
+        get = self.cost_accessor(name)
+        return np.array([get(*e) for e in edges])
@@ -0,0 +1,153 @@
+import collections
+
+from .csr_graph import CSRGraph, _read_csr_file, _lookup
+
+class DiskGraph(CSRGraph):
+    """A disk-resident, read-only graph for graphs larger than memory. Adjacency stays in a
+    memory mapped binary graph file (see `CSRGraph.save`), and neighbor slices are decoded one
+    page of vertices at a time into a bounded LRU cache of hot pages. Memory use is therefore
+    bounded by `max_pages * page_size` vertices worth of adjacency, plus whatever the OS keeps
+    in its page cache, no matter how large the file is
+
+    Parameters:
+        path (str): A csr graph file, i.e. written by `genG.save(path)`
+        page_size (int): Number of consecutive vertex ids per page (by default 1024)
+        max_pages (int): Maximum number of decoded pages kept in memory (by default 256)
+
+    Attributes:
+        page_size (int): see above
+        max_pages (int): see above
+        hits (int): Number of neighbor/cost lookups served from a cached page
+        misses (int): Number of pages decoded from disk
+
+    Todo:
+        - Tuple vertex keys are held in memory, only int and str keys stay on disk
+
+    """
+    def __init__(self, path, page_size=1024, max_pages=256):
+        meta, _, kwargs = _read_csr_file(path, mmap=True)
+        super().__init__(**kwargs)
+        self.path = path
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._none_as_nan = meta.get("weights_none_as_nan", False)
+        self._vertex_none_as_nan = meta.get("vertex_weights_none_as_nan", False)
+
+        self._pages = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        return cls(path)
+
+    def _page(self, p):
+        """Return decoded page p as (row offsets, neighbor keys, edge weights), caching it"""
+        pages = self._pages
+        if p in pages:
+            self.hits += 1
+            pages.move_to_end(p)
+            return pages[p]
+
+        self.misses += 1
+        lo = p * self.page_size
+        hi = min(lo + self.page_size, self.node_count())
+        a, b = int(self.indptr[lo]), int(self.indptr[hi])
+        offsets = (self.indptr[lo:hi+1] - a).tolist()
+        keys = self._keys[self.indices[a:b]].tolist()
+        if self.weights is not None:
+            weights = self.weights[a:b].tolist()
+            if self._none_as_nan:
+                weights = [None if w != w else w for w in weights]
+        else:
+            names = list(self.edge_attrs)
+            columns = [self.edge_attrs[name][a:b].tolist() for name in names]
+            weights = [dict(zip(names, vals)) for vals in zip(*columns)]
+
+        pages[p] = (offsets, keys, weights)
+        if len(pages) > self.max_pages:
+            pages.popitem(last=False)
+        return pages[p]
+
+    def _row(self, i):
+        offsets, keys, weights = self._page(i // self.page_size)
+        r = i % self.page_size
+        return offsets[r], offsets[r+1], keys, weights
+
+    def _edge_pos(self, from_node, to_node):
+        """Return position of edge (from_node, to_node) in indices/weights, found through the
+        page cache rather than the rows of CSRGraph. Raises KeyError if not found
+
+        """
+        i = self._index.get(from_node)
+        if i is None:
+            raise KeyError((from_node, to_node))
+        a, b, keys, _ = self._row(i)
+        try:
+            k = keys.index(to_node, a, b)
+        except ValueError:
+            raise KeyError((from_node, to_node))
+        return int(self.indptr[i]) + k - a
+
+    def _structures(self):
+        structures = super()._structures()
+        structures["pages"] = self._pages
+        return structures
+
+    def clear_cache(self):
+        """Drop every decoded page"""
+        super().clear_cache()
+        self._pages.clear()
+
+    def _edge_weight(self, k):
+        w = super()._edge_weight(k)
+        if self._none_as_nan and w != w:
+            return None
+        return w
+
+    def _vertex_weight(self, i):
+        w = super()._vertex_weight(i)
+        if self._vertex_none_as_nan and w != w:
+            return None
+        return w
+
+    def cost_accessor(self, name=None, vertex=False):
+        """Return a function that looks up edge costs (or vertex costs) for a fixed `name`, see
+        `CSRGraph.cost_accessor`. Edge costs are read from the page cache
+
+        """
+        if vertex:
+            return super().cost_accessor(name, vertex)
+        if name is None:
+            return self.cost
+        return lambda from_node, to_node: self.cost(from_node, to_node, name=name)
+
+    def neighbors(self, v):
+        """Return a list of neighbors of v, read from the page cache"""
+        i = self._index.get(v)
+        if i is None:
+            return []
+        a, b, keys, _ = self._row(i)
+        return keys[a:b]
+
+    def cost(self, *args, **kwargs):
+        """Return cost of edge or vertex based on number of args, see `CSRGraph.cost`.
+        Edge costs are read from the page cache
+
+        """
+        if len(args) != 2:
+            return super().cost(*args, **kwargs)
+        from_node, to_node = args
+        i = self._index.get(from_node)
+        if i is None:
+            raise KeyError(args)
+        a, b, keys, weights = self._row(i)
+        try:
+            k = keys.index(to_node, a, b)
+        except ValueError:
+            raise KeyError(args)
+        weight = weights[k]
+
+        if "name" in kwargs:
+            return _lookup(weight, kwargs["name"])
+        return weight
@@ -1,5 +1,140 @@
 import copy
+import weakref
+from collections.abc import Mapping, MutableMapping
+import numpy as np
+
 from .graph import Graph
+from .vertex_table import VertexTable
+from .memory import memory_report
+
+class _UndirectedEdgeDict(MutableMapping):
+    """Edge dict of an undirected graph holding a single record per edge. Both (u, v) and (v, u)
+    resolve to the same weight object, so in-place updates, i.e. `edge_dict[e]['flow'] += 1`,
+    are seen from either direction. Iteration and len() still cover both directions, like
+    a mirrored edge dict
+
+    Parameters:
+        edges (dict): Initial edges, mirrored pairs are collapsed into the first one seen
+
+    Attributes:
+        records (dict): The underlying storage, one canonical (u, v) key per edge
+
+    """
+    def __init__(self, edges=None):
+        self.records = {}
+        self._loops = 0
+        if edges is not None:
+            for key, w in edges.items():
+                if key not in self:
+                    self[key] = w
+
+    def _key(self, key):
+        """Return the stored orientation of key, raises KeyError if not there"""
+        if key in self.records:
+            return key
+        rev = (key[1], key[0])
+        if rev in self.records:
+            return rev
+        raise KeyError(key)
+
+    def __getitem__(self, key):
+        records = self.records
+        if key in records:
+            return records[key]
+        return records[(key[1], key[0])]
+
+    def __setitem__(self, key, val):
+        rev = (key[1], key[0])
+        if rev in self.records:
+            key = rev
+        elif key not in self.records:
+            self._loops += key[0] == key[1]
+        self.records[key] = val
+
+    def __delitem__(self, key):
+        key = self._key(key)
+        del self.records[key]
+        self._loops -= key[0] == key[1]
+
+    def __contains__(self, key):
+        return key in self.records or (key[1], key[0]) in self.records
+
+    def __iter__(self):
+        for u, v in self.records:
+            yield (u, v)
+            if u != v:
+                yield (v, u)
+
+    def __len__(self):
+        return 2 * len(self.records) - self._loops
+
+class _FrozenDict(dict):
+    """A dict that refuses writes, used for the dicts and weights of graphs shared by the GraphFactory
+    cache. Reads are those of a plain dict, copies are plain (writable) dicts
+
+    """
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("graph is read-only (i.e. shared by the GraphFactory cache), modify a copy or overlay() instead")
+
+    __setitem__ = __delitem__ = __ior__ = pop = popitem = update = setdefault = clear = _read_only
+
+    def copy(self):
+        return dict(self)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+class _FrozenList(list):
+    """A list that refuses writes, see _FrozenDict"""
+    _read_only = _FrozenDict._read_only
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = extend = insert = pop = remove = clear = \
+        sort = reverse = _read_only
+
+    def copy(self):
+        return list(self)
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+def _frozen(w, memo):
+    """Return a read-only version of weight w, nested dicts and lists included. memo maps the id of
+    each weight already frozen to its frozen version, so weights shared by several edges stay shared
+
+    """
+    if isinstance(w, (dict, list)) and not isinstance(w, (_FrozenDict, _FrozenList)):
+        if id(w) not in memo:
+            if isinstance(w, dict):
+                memo[id(w)] = _FrozenDict((k, _frozen(x, memo)) for k, x in w.items())
+            else:
+                memo[id(w)] = _FrozenList(_frozen(x, memo) for x in w)
+        return memo[id(w)]
+    return w
+
+def _coo_arrays(coo, shape=None):
+    """Return (row, col, data, n) of a COO triple or an object with a `tocoo()` method"""
+    if hasattr(coo, "tocoo"):
+        coo = coo.tocoo()
+        shape = coo.shape if shape is None else shape
+        coo = (coo.row, coo.col, coo.data)
+    row, col, data = (np.asarray(a) for a in coo)
+    if shape is not None:
+        n = shape[0]
+    else:
+        n = int(max(row.max(initial=-1), col.max(initial=-1))) + 1
+    return row, col, data, n
 
 class GenericGraph(Graph):
     """A class for the most generic graph type. Stores both an adjaceny list and cost table
@@ -10,11 +145,28 @@ class GenericGraph(Graph):
         graph_type (str): "undirected" or "directed" (by default "directed")
         visualize (str): Whether to visualize results using matplotlib (not implemented yet)
         deep_copy (bool): Whether to create a deep copy (rather than a shallow copy) of input dictionaries
+        predecessor_index (bool): Whether to build the predecessor index of a directed graph up front.
+            Otherwise it is built on the first call to `predecessors` or `in_degree` (by default False)
+        canonical (bool): Only for undirected graphs. Store a single record per edge instead of
+            mirroring every edge into edge_dict, with (u, v) and (v, u) resolving to the same weight.
+            Halves edge memory and keeps mutable weights consistent (by default False)
+        versioned (bool): Whether every mutation is appended to `mutation_log` (by default False).
+            The version counter and snapshots work either way
 
     Attributes:
-        adjList (dict): For each node, a list of adjacent nodes are given
-        edge_dict (dict): For each edge, a weight is given
+        adjList (dict): For each node, a dict whose keys are the adjacent nodes (an ordered set)
+        predList (dict): For each node of a directed graph, a dict whose keys are its in-neighbors.
+            None until the predecessor index is built
+        edge_dict (dict): For each edge, a weight is given. A `_UndirectedEdgeDict` for canonical
+            undirected graphs
         vertex_dict (dict): For each node, a weight is given
+        read_only (bool): If True, every mutation through the graph's API raises a TypeError. Set on graphs
+            shared by `GraphFactory.create_graph(..., cache=True)`
+        version (int): Incremented by every mutation made through the graph's API (one per edge or vertex)
+        mutation_log (list): None unless versioned. Append-only (version, op, key, value) tuples, where op is
+            one of "add_edge", "reweight_edge", "remove_edge", "add_vertex", "reweight_vertex", "remove_vertex",
+            key is an edge or vertex, and value its new weight (None for removals). `reorder` logs a
+            ("reorder", None, order) entry
 
     Todo: 
         - Add visualization capabilities
@@ -38,9 +190,92 @@ class GenericGraph(Graph):
                     edge_dict.update({(i,j): val})
         return edge_dict
 
-    def __init__(self, edge_dict=None, vertex_dict=None, graph_type="directed", deep_copy=True):
+    @classmethod
+    def from_arrays(cls, src, dst, weight=None, num_vertices=None, graph_type="directed", frozen=False):
+        """Build a graph from parallel (src, dst, weight) numpy arrays
+
+        Parameters:
+            src, dst (numpy.ndarray): Tail and head vertex of every edge
+            weight (numpy.ndarray): Weight of every edge (by default all int 1)
+            num_vertices (int): If given, vertices 0..num_vertices-1 are all added, even if isolated
+            graph_type (str): "undirected" or "directed"
+            frozen (bool): If True, return a CSRGraph built entirely with vectorized passes,
+                without creating a per-edge dict
+
+        Duplicate edges are collapsed and the last one wins, like dict updates. In undirected
+        graphs (u, v) and (v, u) are the same edge: it keeps the orientation it first appeared
+        with, the weight of its last occurrence, and both directions share that weight
+
+        """
+        if frozen:
+            from .csr_graph import CSRGraph
+            return CSRGraph.from_arrays(src, dst, weight, num_vertices=num_vertices, graph_type=graph_type)
+        src, dst = np.asarray(src).tolist(), np.asarray(dst).tolist()
+        if weight is None:
+            weights = [1] * len(src)
+        else:
+            weights = np.asarray(weight).tolist()
+        if graph_type == "undirected":
+            edge_dict = {}
+            for e, w in zip(zip(src, dst), weights):
+                if e not in edge_dict and (e[1], e[0]) in edge_dict:
+                    e = (e[1], e[0])
+                edge_dict[e] = w
+        else:
+            edge_dict = dict(zip(zip(src, dst), weights))
+        vertex_dict = None if num_vertices is None else dict.fromkeys(range(num_vertices))
+        return cls(edge_dict=edge_dict, vertex_dict=vertex_dict, graph_type=graph_type, deep_copy=False)
+
+    @classmethod
+    def from_dense(cls, mat, graph_type="directed", frozen=False):
+        """Build a graph from a dense numpy adjacency matrix, nonzero entries being edges.
+        See `from_arrays` for the other parameters
+
+        """
+        if frozen:
+            from .csr_graph import CSRGraph
+            return CSRGraph.from_dense(mat, graph_type=graph_type)
+        mat = np.asarray(mat)
+        src, dst = np.nonzero(mat)
+        return cls.from_arrays(src, dst, mat[src, dst], num_vertices=mat.shape[0], graph_type=graph_type)
+
+    @classmethod
+    def from_sparse(cls, coo, shape=None, graph_type="directed", frozen=False):
+        """Build a graph from a COO triple (row, col, data), or any object with a `tocoo()`
+        method (i.e. scipy.sparse). All shape[0] vertices are added, even if isolated. See
+        `from_arrays` for the other parameters
+
+        Parameters:
+            shape (tuple): Matrix shape (n, n). By default the sparse matrix shape, or inferred
+                from the largest index of a triple
+
+        """
+        if frozen:
+            from .csr_graph import CSRGraph
+            return CSRGraph.from_sparse(coo, shape=shape, graph_type=graph_type)
+        row, col, data, n = _coo_arrays(coo, shape)
+        return cls.from_arrays(row, col, data, num_vertices=n, graph_type=graph_type)
+
+    @classmethod
+    def from_edge_list(cls, source, **kwargs):
+        """Stream a csv/tsv/whitespace edge list file (or any iterable of edges) into a new
+        graph in bounded-size chunks. See `graph_io.read_edge_list` for the kwargs
+
+        """
+        from .graph_io import read_edge_list
+        return read_edge_list(source, graph=cls(graph_type=kwargs.pop("graph_type", "directed")), **kwargs)
+
+    def __init__(self, edge_dict=None, vertex_dict=None, graph_type="directed", deep_copy=True, predecessor_index=False,
+                 canonical=False, versioned=False):
         self.adjList = {}
+        self.predList = None
         self.graph_type = graph_type
+        self._vertex_table = None
+
+        self.read_only = False
+        self.version = 0
+        self.mutation_log = [] if versioned else None
+        self._snapshots = weakref.WeakSet()
 
         # Deep copy to avoid modifying original graph by reference
         if deep_copy:
@@ -54,47 +289,122 @@ class GenericGraph(Graph):
             self.edge_dict = {}
         if vertex_dict is None:
             self.vertex_dict = {}
+        if canonical and graph_type == "undirected" and not isinstance(self.edge_dict, _UndirectedEdgeDict):
+            self.edge_dict = _UndirectedEdgeDict(self.edge_dict)
 
         if self.edge_dict is not None:
             self._update_adj_list()
-            
+
+        if predecessor_index:
+            self._build_pred_list()
+
     def _update_adj_list(self):
+        """(Re)build the adjacency list from edge_dict in a single linear pass"""
         # undirected vs directed edges
-        if self.graph_type is "undirected":
-            temp = {}
-            for key in self.edge_dict.keys():
-                temp.update({(key[1], key[0]): self.edge_dict[key]})
-            self.edge_dict.update(temp)
-        
-            # create an adjacency list!
-            for key in self.edge_dict.keys():
-                if key[0] not in self.adjList:
-                    self.adjList[key[0]] = [key[1]]
-                if key[1] not in self.adjList:
-                    self.adjList[key[1]] = [key[0]]
-                else:
-                    if key[0] not in self.adjList[key[1]]:
-                        self.adjList[key[1]].append(key[0])
-                    if key[1] not in self.adjList[key[0]]:
-                        self.adjList[key[0]].append(key[1])       
-        else:
-            for key in self.edge_dict.keys():
-                if key[0] not in self.adjList:
-                    self.adjList[key[0]] = [key[1]]
-                else:
-                    if key[1] not in self.adjList[key[0]]:
-                        self.adjList[key[0]].append(key[1])
-                if key[1] not in self.adjList:
-                    self.adjList[key[1]] = []    
+        if self.graph_type == "undirected" and not self.is_canonical():
+            # mirror every edge, existing reverse entries are kept
+            for key, w in list(self.edge_dict.items()):
+                self.edge_dict.setdefault((key[1], key[0]), w)
+
+        # create an adjacency list! each entry is a dict used as an ordered set
+        adj = self.adjList
+        for u, v in self.edge_dict:
+            if u not in adj:
+                adj[u] = {}
+            adj[u][v] = None
+            if v not in adj:
+                adj[v] = {}
 
         # CONSIDER DELETING EMPTY ADJACENCY KEYS
 
         # Update self.vertex_dict
         if self.vertex_dict is not None:
-            for v in self.adjList:
+            for v in adj:
                 if v not in self.vertex_dict:
                     self.vertex_dict[v] = None
 
+    def _check_writable(self):
+        if self.read_only:
+            raise TypeError("graph is read-only (i.e. shared by the GraphFactory cache), modify a copy or overlay() instead")
+
+    def _log(self, op, key, value=None):
+        """Bump the version and append to the mutation log (if any)"""
+        self.version += 1
+        if self.mutation_log is not None:
+            self.mutation_log.append((self.version, op, key, value))
+
+    def _before_change(self, edges=(), vertices=(), adj=()):
+        """Let live snapshots keep the current state of what is about to change"""
+        for snap in list(self._snapshots):
+            snap._preserve(edges, vertices, adj)
+
+    def _edge_keys(self, u, v):
+        return ((u, v), (v, u)) if self.graph_type == "undirected" else ((u, v),)
+
+    def _insert_edge(self, u, v, weight):
+        """Add or replace a single edge, updating adjacency of u and v only. O(1)"""
+        if self.read_only:
+            self._check_writable()
+        if self._snapshots:
+            self._before_change(self._edge_keys(u, v), (u, v), (u, v))
+        op = "reweight_edge" if self.mutation_log is not None and (u, v) in self.edge_dict else "add_edge"
+        adj = self.adjList
+        self.edge_dict[(u, v)] = weight
+        if u not in adj:
+            adj[u] = {}
+        if v not in adj:
+            adj[v] = {}
+        self.vertex_dict.setdefault(u, None)
+        self.vertex_dict.setdefault(v, None)
+        if self._vertex_table is not None:
+            self._vertex_table.intern(u)
+            self._vertex_table.intern(v)
+        adj[u][v] = None
+        if self.graph_type == "undirected":
+            if not self.is_canonical():
+                self.edge_dict[(v, u)] = weight
+            adj[v][u] = None
+        elif self.predList is not None:
+            pred = self.predList
+            if u not in pred:
+                pred[u] = {}
+            if v not in pred:
+                pred[v] = {}
+            pred[v][u] = None
+        self._log(op, (u, v), weight)
+
+    def _delete_edge(self, u, v):
+        """Delete a single edge, raises KeyError if not there. O(1)"""
+        if self.read_only:
+            self._check_writable()
+        if self._snapshots:
+            self._before_change(self._edge_keys(u, v), (), (u, v))
+        del self.edge_dict[(u, v)]
+        self.adjList[u].pop(v, None)
+        if self.graph_type == "undirected":
+            # already gone for self loops and canonical storage
+            self.edge_dict.pop((v, u), None)
+            self.adjList[v].pop(u, None)
+        elif self.predList is not None:
+            self.predList[v].pop(u, None)
+        self._log("remove_edge", (u, v))
+
+    def _build_pred_list(self):
+        """Build the predecessor index of a directed graph in one O(E) pass. It is kept in
+        sync by every edge insertion and deletion afterwards
+
+        """
+        if self.graph_type == "undirected":
+            return
+        pred = {v: {} for v in self.adjList}
+        for u, v in self.edge_dict:
+            pred[v][u] = None
+        self.predList = pred
+
+    def is_canonical(self):
+        """Whether edges of this undirected graph are stored once, see the `canonical` parameter"""
+        return isinstance(self.edge_dict, _UndirectedEdgeDict)
+
     # CREATE SETTER AND GETTER FUNCTION FOR vertex_dict attribute
     # LET adjList keep track of vertex_dict instead! j
 
@@ -119,6 +429,125 @@ class GenericGraph(Graph):
     def get_vertices(self):
         return list(self.vertex_dict)
 
+    def memory_usage(self, deep=True):
+        """Return the bytes held by each internal structure, plus a "total"
+
+        Arg:
+            deep (bool): Whether keys and weights are included, rather than just the containers
+
+        """
+        return memory_report({"edge_dict": self.edge_dict, "vertex_dict": self.vertex_dict, "adjList": self.adjList,
+                              "predList": self.predList, "vertex_table": self._vertex_table}, deep=deep)
+
+    def save(self, path):
+        """Write the graph to a versioned binary file, see `CSRGraph.save`"""
+        self.freeze().save(path)
+
+    @staticmethod
+    def load(path, mmap=True):
+        """Load a graph written by `save`. Returns a read-only CSRGraph whose arrays are memory
+        mapped from the file (by default), call `thaw()` on it for a mutable GenericGraph
+
+        """
+        from .csr_graph import CSRGraph
+        return CSRGraph.load(path, mmap=mmap)
+
+    def overlay(self):
+        """Return a copy-on-write OverlayGraph sharing this graph's storage. Changes made to the
+        overlay are recorded locally and never modify this graph
+
+        """
+        from .overlay_graph import OverlayGraph
+        return OverlayGraph(self)
+
+    def subgraph(self, vertices):
+        """Return a lazy GraphView of the subgraph induced by `vertices`. Nothing is copied,
+        the view filters this graph's adjacency and shares its weights
+
+        Arg:
+            vertices (iter): Vertices to keep
+
+        """
+        from .graph_view import GraphView
+        return GraphView(self, vertices=vertices)
+
+    def edge_filter(self, edges):
+        """Return a lazy GraphView keeping only some edges of this graph, without copying
+
+        Example:
+            G.edge_filter(lambda u, v, w: w["cap"] > 3)
+
+        Arg:
+            edges (callable or iter): A predicate f(u, v, weight) -> bool, a collection of edges,
+                or a boolean mask aligned with `list(self.edge_dict)`
+
+        """
+        from .graph_view import GraphView
+        return GraphView(self, edges=edges)
+
+    def reorder(self, method="rcm", relabel=False):
+        """Renumber vertices for memory locality, so that neighbors end up with nearby ids once the
+        graph is frozen (or interned with `vertex_table`). Run it before `freeze()`. Vertex and
+        adjacency dicts are reordered in place, and the vertex table (if any) is rebuilt
+
+        Args:
+            method (str or list): "rcm" (reverse Cuthill-McKee), "bfs", "dfs" or "hilbert" (for (x, y)
+                vertices), see `reorder.py`. Or an explicit list of every vertex in the new order
+            relabel (bool): Whether vertex keys should also be replaced by their new integer ids
+
+        Returns:
+            order (list): The permutation, order[i] is the (original) key of new vertex id i
+
+        """
+        self._check_writable()
+        from .reorder import ORDERINGS
+        if isinstance(method, str):
+            if method not in ORDERINGS:
+                raise ValueError("Please select a method from this list: {}".format(str(list(ORDERINGS))))
+            order = ORDERINGS[method](self)
+        else:
+            order = list(method)
+        if relabel and self._snapshots:
+            raise ValueError("can not relabel vertices while snapshots of the graph are alive")
+        rank = {v: i for i, v in enumerate(order)}
+        if len(rank) != len(order) or len(rank) != max(len(self.adjList), len(self.vertex_dict)) \
+                or any(v not in rank for v in self.adjList):
+            raise ValueError("order must hold every vertex exactly once")
+
+        # reorder (or rekey) in place, so views and overlays keep referring to the same dicts
+        key = rank.__getitem__ if relabel else (lambda v: v)
+        weights = [self.vertex_dict.get(v) for v in order]
+        self.vertex_dict.clear()
+        self.vertex_dict.update(zip(map(key, order), weights))
+
+        adj = self.adjList
+        rows = [sorted(adj.get(v, ()), key=rank.__getitem__) for v in order]
+        adj.clear()
+        for v, row in zip(order, rows):
+            adj[key(v)] = dict.fromkeys(map(key, row))
+
+        if relabel:
+            edges = list(self.edge_dict.items())
+            self.edge_dict.clear()
+            for (u, v), w in edges:
+                self.edge_dict[(rank[u], rank[v])] = w
+            self.predList = None
+        elif self.predList is not None:
+            self._build_pred_list()
+        self._vertex_table = None
+        self._log("reorder", None, order)
+        return order
+
+    def freeze(self):
+        """Return a read-only CSRGraph copy of this graph, with adjacency packed into numpy arrays.
+        Numeric weights are copied into a numeric array, and flat dict weights with the same numeric
+        attributes, i.e. {"cap": 16, "flow": 0}, into one column per attribute (`cost` then builds a
+        new dict on every call). Any other weight is kept in an object array, shared with this graph
+
+        """
+        from .csr_graph import CSRGraph
+        return CSRGraph.from_generic(self)
+
     def add_edge(self, edge_dict):
         """Add edges to our graph. Will silently replace edges if it already exists. 
         
@@ -126,8 +555,26 @@ class GenericGraph(Graph):
             edge_dict (dict): i.e. {('v1', 'v2'): 5.0}
         
         """
-        self.edge_dict.update(edge_dict)
-        self._update_adj_list()
+        self.add_edges(edge_dict)
+
+    def add_edges(self, edges, weight=None):
+        """Add edges in bulk. Only the adjacency of affected vertices is touched, so
+        adding k edges is O(k) regardless of graph size. Existing edges are silently replaced
+
+        Args:
+            edges (dict or iter): Either a dict {('v1', 'v2'): 5.0}, or an iterable
+                of (u, v) pairs and/or (u, v, weight) triples
+            weight: Weight given to (u, v) pairs without their own weight (by default None)
+
+        """
+        if isinstance(edges, Mapping):
+            edges = ((e[0], e[1], w) for e, w in edges.items())
+        insert = self._insert_edge
+        for e in edges:
+            if len(e) == 3:
+                insert(e[0], e[1], e[2])
+            else:
+                insert(e[0], e[1], weight)
 
     def add_vertex(self, vertex_dict):
         """Vertex to our graph
@@ -136,65 +583,168 @@ class GenericGraph(Graph):
             vertex_dict (dict): {'v1': 5}
         
         """
-        self.vertex_dict.update(vertex_dict)
+        self._check_writable()
+        if self._snapshots:
+            self._before_change(vertices=vertex_dict)
+        for v, w in vertex_dict.items():
+            op = "reweight_vertex" if v in self.vertex_dict else "add_vertex"
+            self.vertex_dict[v] = w
+            self._log(op, v, w)
+        if self._vertex_table is not None:
+            for v in vertex_dict:
+                self._vertex_table.intern(v)
         # SHOULD WE ALSO UPDATE ADJ LIST TO CONTAIN NEW NODES?
    
     def remove_edges(self, edge_list):
-        """Delete specific edges in our graph
+        """Delete specific edges in our graph, O(1) per edge. For undirected graphs
+        both directions are removed
 
         Arg:
             edge_list (iter of edges): 
 
         """
+        delete = self._delete_edge
         for e in edge_list:
-            
-            # update adjacency list and edge dict
-            if self.graph_type == "directed":
-                # update adjacency list
-                if e[1] in self.adjList[e[0]]:
-                    self.adjList[e[0]].remove(e[1])
-                
-                # update edge_dict 
-                # self.edge_dict.pop(e)  #slightly slower
-                del self.edge_dict[e]   #raises KeyError if not there
-            else:
-                # update adjacency list in both directions
-                if e[1] in self.adjList[e[0]]:
-                    self.adjList[e[0]].remove(e[1])
-                if e[0] in self.adjList[e[1]]:
-                    self.adjList[e[1]].remove(e[0])
-                
-                # update edge dicts in both directions
-                del self.edge_dict[e]
-                del self.edge_dict[(e[1], e[0])]
+            delete(e[0], e[1])
 
     def remove_vertices(self, vertex_list):
-        """Delete vertices from our graph
+        """Delete vertices from our graph, along with all of their incident edges. Uses the
+        adjacency list and predecessor index, so each removal is O(degree)
 
         Arg:
             vertex_list (iter of vertices):
 
-        Todo:
-            - delete edges associated with deleted vertex
-        
         """
+        self._check_writable()
         for v in vertex_list:
-            del self.vertex_dict[v]
+            if v not in self.vertex_dict and v not in self.adjList:
+                raise KeyError(v)
+            if self._snapshots:
+                self._before_change(vertices=(v,), adj=(v,))
+            self.vertex_dict.pop(v, None)
+            if v not in self.adjList:
+                self._log("remove_vertex", v)
+                continue
+
+            # outgoing edges (both directions for undirected graphs)
+            for w in list(self.adjList[v]):
+                self._delete_edge(v, w)
+
+            # incoming edges of a directed graph
+            if self.graph_type != "undirected":
+                for u in list(self.predecessors(v)):
+                    self._delete_edge(u, v)
+                del self.predList[v]
+            del self.adjList[v]
+            self._log("remove_vertex", v)
+
+    def set_weight(self, *args, value=None, name=None):
+        """Replace the weight of an existing edge or vertex (a "reweight" mutation)
+
+        Args:
+            from_node, to_node (vertex, vertex): An edge
+            node (vertex): A single vertex
+
+        Kwargs:
+            value: The new weight
+            name (str): If given, only this attribute of a multi-weighted edge or vertex is changed.
+                The weight dict is copied rather than modified in place, so snapshots keep the old one
 
-    def neighbors(self, v):
-        """Return a list of neighbors of v
-        
-        Todo:
-            - just return adjList[v]!
-        
         """
-        # neighs = [n for n in self.adjList[v]]
+        self._check_writable()
+        if len(args) == 2:
+            data, key = self.edge_dict, tuple(args)
+        else:
+            data, key = self.vertex_dict, args[0]
+        if key not in data:
+            raise KeyError(key)
+        if name is not None:
+            weight = copy.copy(data[key])
+            weight[name] = value
+            value = weight
+
+        if len(args) == 2:
+            if self._snapshots:
+                self._before_change(self._edge_keys(*args))
+            data[key] = value
+            if self.graph_type == "undirected" and not self.is_canonical():
+                data[(key[1], key[0])] = value
+            self._log("reweight_edge", key, value)
+        else:
+            if self._snapshots:
+                self._before_change(vertices=(key,))
+            data[key] = value
+            self._log("reweight_vertex", key, value)
+
+    def snapshot(self):
+        """Return a read-only GraphSnapshot showing the graph as it is now. Taking one is O(1),
+        afterwards each mutation of the graph costs O(1) extra per live snapshot
+
+        """
+        from .snapshot import GraphSnapshot
+        snap = GraphSnapshot(self)
+        self._snapshots.add(snap)
+        return snap
+
+    def changes_since(self, version):
+        """Return the mutation log entries made after `version`, see `mutation_log`"""
+        if self.mutation_log is None:
+            raise ValueError("the mutation log is off, create the graph with versioned=True")
+        # binary search, versions in the log are increasing
+        log = self.mutation_log
+        lo, hi = 0, len(log)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if log[mid][0] <= version:
+                lo = mid + 1
+            else:
+                hi = mid
+        return log[lo:]
+
+    def neighbors(self, v):
+        """Return a list of neighbors of v"""
         if v in self.adjList:
-            neighs = self.adjList[v]
-            return neighs
+            return list(self.adjList[v])
         else:
             return []
     
+    def vertex_table(self):
+        """Return the VertexTable interning this graph's vertices as dense integer ids. It is built
+        on first use and kept up to date as vertices and edges are added
+
+        """
+        if self._vertex_table is None:
+            table = VertexTable(self.vertex_dict)
+            for v in self.adjList:
+                table.intern(v)
+            self._vertex_table = table
+        return self._vertex_table
+
+    def vertex_id(self, v):
+        """Return the integer id of vertex key v, see `vertex_table`"""
+        return self.vertex_table().id(v)
+
+    def neighbor_ids(self, i):
+        """Return the ids of the neighbors of vertex id i, as a list"""
+        table = self.vertex_table()
+        ids = table._ids
+        return [ids[w] for w in self.neighbors(table.key(i))]
+
+    def predecessors(self, v):
+        """Return a list of in-neighbors of v. For undirected graphs these are just the neighbors"""
+        if self.graph_type == "undirected":
+            return self.neighbors(v)
+        if self.predList is None:
+            self._build_pred_list()
+        if v in self.predList:
+            return list(self.predList[v])
+        else:
+            return []
+
+    def in_degree(self, v):
+        """Return the number of edges entering v"""
+        return len(self.predecessors(v))
+
     def cost(self, *args, **kwargs):
         """Return cost of edge or vertex based on number of args
 
@@ -206,42 +756,64 @@ class GenericGraph(Graph):
             name (str): To determine the specific reference for multi-weighted edges of graphs
 
         """
-        # unpack name if in kwargs
-        try:
-            # case 1) gets an edge weight. case 2) gets a vertex weight
-            if len(args) == 2:
-                from_node, to_node = args
-                if "name" in kwargs:
-                    name = kwargs["name"]
-
-                    # if a list of names, then iterate through the list
-                    if type(name)==list:
-                        weight = self.edge_dict[(from_node, to_node)]
-                        for n in name:
-                            weight = weight[n]     
-                    else:
-                        weight = self.edge_dict[(from_node, to_node)][name]               
-                    return weight
-                weight = self.edge_dict[(from_node, to_node)]
-                return weight
-            elif len(args) == 1:
-                node = args[0]
-                if "name" in kwargs:
-                    name = kwargs["name"]
-                    
-                    # if a list of names, then iterate through the list
-                    if type(name)==list:
-                        weight = self.vertex_dict[node]
-                        for n in name:
-                            weight = weight[n]     
-                    else:
-                        weight = self.vertex_dict[node][name]
-                    return weight
-
-                weight = self.vertex_dict[node]
-                return weight
+        # case 1) gets an edge weight. case 2) gets a vertex weight
+        if len(args) == 2:
+            weight = self.edge_dict[args]
+        elif len(args) == 1:
+            weight = self.vertex_dict[args[0]]
+        else:
+            raise KeyError("vertex or edge not found using arguments: {}".format(args))
+
+        if "name" in kwargs:
+            name = kwargs["name"]
+            # if a list of names, then iterate through the list
+            if type(name) == list:
+                for n in name:
+                    weight = weight[n]
             else:
-                print("vertex or edge not found using arguments: ", args)
-                raise KeyError("vertex or edge not found using arguments: ")
-        except Exception as E_:
-            raise E_
\ No newline at end of file
+                weight = weight[name]
+        return weight
+
+    def cost_accessor(self, name=None, vertex=False):
+        """Return a function that looks up edge costs (or vertex costs) for a fixed `name`.
+        The name path is resolved once, so hot loops skip the argument parsing done by `cost`
+
+        Example:
+            cap = genG.cost_accessor("cap")
+            cap('v1', 'v2')     # same as genG.cost('v1', 'v2', name="cap")
+
+        Args:
+            name (str or list): Attribute name, or list of nested names (by default None, the whole weight)
+            vertex (bool): Return a vertex cost function f(v) instead of an edge cost function f(u, v)
+
+        """
+        data = self.vertex_dict if vertex else self.edge_dict
+        if type(name) == list and len(name) == 1:
+            name = name[0]
+
+        if name is None:
+            get = data.__getitem__
+        elif type(name) == list:
+            names = tuple(name)
+            def get(key):
+                weight = data[key]
+                for n in names:
+                    weight = weight[n]
+                return weight
+        else:
+            get = lambda key: data[key][name]
+
+        if vertex:
+            return get
+        return lambda from_node, to_node: get((from_node, to_node))
+
+    def cost_many(self, edges, name=None):
+        """Return the costs of many edges at once as a numpy array
+
+        Args:
+            edges (iter): (from_node, to_node) pairs
+            name (str or list): see `cost_accessor`
+
+        """
+        get = self.cost_accessor(name)
+        return np.array([get(u, v) for u, v in edges])
@@ -0,0 +1,195 @@
+""" Reading and writing graphs to disk
+
+Binary graph files hold a set of named numpy arrays plus some metadata, laid out as:
+
+    :magic: 8 bytes, b"SGMGRAPH"
+    :version: uint32 (little-endian), currently 1
+    :header_len: uint32 (little-endian), length of the json header
+    :header: utf-8 json {"kind": str, "meta": dict, "arrays": {name: {"dtype", "shape", "offset"}}}
+    :data: raw (C-order) array bytes, each aligned to 64 bytes. Offsets are relative to the data start
+
+Since arrays are stored raw, they can be memory mapped straight from disk without parsing,
+and the pages are shared between every process mapping the same file.
+
+Plain text edge lists (csv, tsv, whitespace separated) can be streamed into a graph
+in bounded-size chunks with `read_edge_list`.
+
+"""
+import csv
+import itertools
+import json
+import struct
+import numpy as np
+
+MAGIC = b"SGMGRAPH"
+VERSION = 1
+ALIGN = 64
+
+def _aligned(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+def write_graph_file(path, kind, meta, arrays):
+    """Write named numpy arrays and json metadata to a binary graph file
+
+    Parameters:
+        path (str): File to write
+        kind (str): What the file holds, i.e. "csr" or "grid"
+        meta (dict): json serializable metadata
+        arrays (dict): {name: numpy.ndarray}, arrays must not have an object dtype
+
+    """
+    layout, offset = {}, 0
+    for name, arr in arrays.items():
+        arr = np.asarray(arr)
+        if arr.dtype.hasobject:
+            raise TypeError('array "{}" has an object dtype and cannot be saved'.format(name))
+        layout[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset = _aligned(offset + arr.nbytes)
+
+    header = json.dumps({"kind": kind, "meta": meta, "arrays": layout}).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<II", VERSION, len(header)))
+        f.write(header)
+        for name, arr in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(arr).tobytes())
+        # pad the file so the last array is fully backed
+        f.truncate(data_start + offset)
+
+def _read_header(f, path):
+    """Return the json header and the data start offset of an open graph file"""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("{} is not a simpleGraphM graph file".format(path))
+    version, header_len = struct.unpack("<II", f.read(8))
+    if version > VERSION:
+        raise ValueError("{} has format version {}, only up to {} is supported".format(path, version, VERSION))
+    header = json.loads(f.read(header_len).decode("utf-8"))
+    return header, _aligned(len(MAGIC) + 8 + header_len)
+
+def read_graph_file(path, mmap=True, mode="r"):
+    """Read a binary graph file written by `write_graph_file`
+
+    Parameters:
+        path (str): File to read
+        mmap (bool): Whether arrays should be memory mapped rather than read into memory
+        mode (str): numpy memmap mode, "r" (read-only) or "c" (copy-on-write)
+
+    Returns:
+        kind (str), meta (dict), arrays (dict of numpy.ndarray)
+
+    """
+    with open(path, "rb") as f:
+        header, data_start = _read_header(f, path)
+        arrays = {}
+        for name, info in header["arrays"].items():
+            dtype, shape = np.dtype(info["dtype"]), tuple(info["shape"])
+            offset = data_start + info["offset"]
+            if mmap and int(np.prod(shape)) > 0:
+                arrays[name] = np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape)
+            else:
+                f.seek(offset)
+                arrays[name] = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+    return header["kind"], header["meta"], arrays
+
+def load_graph(path, mmap=True):
+    """Load any binary graph file, returning a CSRGraph or a grid depending on its contents"""
+    with open(path, "rb") as f:
+        kind = _read_header(f, path)[0]["kind"]
+    if kind == "csr":
+        from .csr_graph import CSRGraph
+        return CSRGraph.load(path, mmap=mmap)
+    elif kind == "grid":
+        from .square_grid import SquareGrid
+        return SquareGrid.load(path, mmap=mmap)
+    raise ValueError('unknown graph file kind "{}"'.format(kind))
+
+
+def _split_lines(lines, delimiter, comments):
+    """Yield the fields of every non-empty, non-comment line"""
+    lines = (l for l in lines if l.strip() and not (comments and l.lstrip().startswith(comments)))
+    if delimiter is None:
+        return (l.split() for l in lines)
+    return csv.reader(lines, delimiter=delimiter)
+
+def read_edge_list(source, graph=None, chunk_size=100000, delimiter="auto", src_col=0, dst_col=1,
+                   weight_col=None, columns=None, vertex_type=None, weight_type=float, default_weight=1,
+                   skip_header=False, comments="#", graph_type="directed"):
+    """Stream an edge list into a graph, `chunk_size` edges at a time. Only one chunk is held in
+    memory, so peak memory does not grow with the size of the file
+
+    Parameters:
+        source (str or iter): A file path, or any iterable of text lines or of (u, v[, weight]) sequences
+        graph (GenericGraph): Graph to append to. A new one is created if None
+        chunk_size (int): Number of edges added per batch
+        delimiter (str): Field separator. "auto" picks "," for .csv, tab for .tsv and whitespace otherwise.
+            None always splits on whitespace
+        src_col, dst_col (int): Columns holding the edge endpoints
+        weight_col (int): Column holding a scalar weight. Ignored if `columns` is given. Edges given as
+            (u, v, weight) sequences use their third item by default
+        columns (dict): Mapping of weight attribute names to columns, i.e. {"cap": 2, "cost": 3},
+            which gives multi-weighted edges {"cap": .., "cost": ..}
+        vertex_type (callable): Converts endpoint fields to vertex keys, i.e. int. By default keys are kept as read
+        weight_type (callable): Converts weight fields of text lines (by default float)
+        default_weight: Weight of edges when neither weight_col nor columns is given (by default 1)
+        skip_header (bool): Whether the first line is a header
+        comments (str): Lines starting with this prefix are skipped
+        graph_type (str): "undirected" or "directed", only used when creating a new graph
+
+    Returns:
+        graph (GenericGraph)
+
+    """
+    if graph is None:
+        from .generic_graph import GenericGraph
+        graph = GenericGraph(graph_type=graph_type)
+
+    f = None
+    if isinstance(source, str):
+        if delimiter == "auto":
+            delimiter = {".csv": ",", ".tsv": "\t"}.get(source[source.rfind("."):].lower())
+        f = open(source, "r", newline="")
+        rows = f
+    else:
+        rows = iter(source)
+        if delimiter == "auto":
+            delimiter = None
+
+    try:
+        if skip_header:
+            next(rows, None)
+        # text lines get split into fields lazily, other items are used as they are
+        first = next(rows, None)
+        if first is None:
+            return graph
+        rows = itertools.chain([first], rows)
+        if isinstance(first, str):
+            rows = _split_lines(rows, delimiter, comments)
+        else:
+            weight_type = lambda w: w
+        if vertex_type is None:
+            vertex_type = lambda v: v
+
+        if columns is not None:
+            names = list(columns.items())
+            weight_of = lambda r: {name: weight_type(r[c]) for name, c in names}
+        elif weight_col is not None:
+            weight_of = lambda r: weight_type(r[weight_col])
+        elif not isinstance(first, str):
+            # (u, v, weight) triples carry their own weight
+            weight_of = lambda r: r[2] if len(r) > 2 else default_weight
+        else:
+            weight_of = lambda r: default_weight
+
+        while True:
+            chunk = [(vertex_type(r[src_col]), vertex_type(r[dst_col]), weight_of(r))
+                     for r in itertools.islice(rows, chunk_size)]
+            if not chunk:
+                break
+            graph.add_edges(chunk)
+    finally:
+        if f is not None:
+            f.close()
+    return graph
@@ -1,6 +1,16 @@
+import collections
+import contextlib
+import copy
+import hashlib
+import itertools
+import threading
+import numpy as np
+
 from .graph import Graph
 from .square_grid import OccupancySquareGrid, SquareGrid
-from .generic_graph import GenericGraph
+from .generic_graph import GenericGraph, _FrozenDict, _UndirectedEdgeDict, _frozen
+from .memory import memory_report, sizeof
+from .graph_io import load_graph
 
 class GraphFactory:
     """ A factory class used to create graph objects
@@ -36,17 +46,48 @@ class GraphFactory:
         # Create a generic graph using factory method
         genG = GraphFactory.create_graph("Generic", edge_dict = edgeDict, graph_type = "undirected", visualize=False)
 
+    Create a frozen (read-only) generic graph backed by CSR arrays. Takes the same kwargs as "Generic"
+
+    Example:
+        csrG = GraphFactory.create_graph("CSR", edge_dict = edgeDict, graph_type = "directed")
+
+    Cached creation (opt-in). Identical specs and data give the same shared, read-only instance
+
+    Example:
+        sq = GraphFactory.create_graph("OccupancySquareGrid", cache=True, grid_dim=grid_dim, grid_size=1, obstacles=obs)
+        GraphFactory.cache_info()   # {"hits": 0, "misses": 1, "size": 1, "maxsize": 32}
+        GraphFactory.invalidate()   # drop every cached graph
+
     """
+    cache_size = 32
+    _cache = collections.OrderedDict()
+    _cache_lock = threading.Lock()
+    _cache_counters = {"hits": 0, "misses": 0}
+
     @staticmethod
-    def create_graph(type_: str, **kwargs ) -> Graph:
+    def create_graph(type_: str, cache=False, **kwargs ) -> Graph:
+        """Create a graph of type `type_` from kwargs
+
+        Parameters:
+            type_ (str): "Generic", "CSR", "SquareGrid" or "OccupancySquareGrid"
+            cache (bool): Whether to memoize the graph by a content hash of type_ and kwargs. Cached graphs
+                are shared between callers and read-only, dicts and arrays included, see `cache_key`. Needs
+                deep_copy=True (the default). At most `cache_size` graphs are kept, least recently used
+                first out (by default False)
+
+        """
+        if cache:
+            return GraphFactory.__create_cached(type_, kwargs)
         try:
-            if type_ is "OccupancySquareGrid":
+            if type_ == "OccupancySquareGrid":
                 # GraphManager.add_layer(OccupancySquareGrid(**kwargs), name)
                 return OccupancySquareGrid(**kwargs)
-            elif type_ is "Generic":
+            elif type_ == "Generic":
                 # GraphManager.add_layer(GenericGraph(**kwargs), name)
                 return GenericGraph(**kwargs)
-            elif type_ is "SquareGrid":
+            elif type_ == "CSR":
+                return GenericGraph(**kwargs).freeze()
+            elif type_ == "SquareGrid":
                 # GraphManager.add_layer(SquareGraph(**kwargs), name)
                 return SquareGrid(**kwargs)
             else:
@@ -56,46 +97,516 @@ class GraphFactory:
             print(_e)
             raise
 
+    @staticmethod
+    def cache_key(type_, **kwargs):
+        """Return the content hash identifying a graph spec. Arrays are hashed by dtype, shape and
+        bytes, containers by their items (in order). Raises TypeError for other kinds of objects
+
+        """
+        h = hashlib.blake2b(digest_size=20)
+        _digest(h, (type_, sorted(kwargs.items(), key=lambda kv: kv[0])))
+        return h.hexdigest()
+
+    @staticmethod
+    def __create_cached(type_, kwargs):
+        cls = GraphFactory
+        if not kwargs.get("deep_copy", True):
+            # the cached graph would alias the caller's dicts, which can change under its key
+            raise ValueError("cache=True needs deep_copy=True, cached graphs can not share the caller's dicts")
+        key = cls.cache_key(type_, **kwargs)
+        with cls._cache_lock:
+            if key in cls._cache:
+                cls._cache_counters["hits"] += 1
+                cls._cache.move_to_end(key)
+                return cls._cache[key]
+            cls._cache_counters["misses"] += 1
+
+        graph = cls.create_graph(type_, **kwargs)
+        grid = getattr(graph, "grid", None)
+        if grid is not None:
+            # never make the caller's own array read-only
+            if grid is kwargs.get("grid"):
+                graph.grid = grid = grid.copy()
+            grid.flags.writeable = False
+        if getattr(graph, "bits", None) is not None:
+            graph.bits.flags.writeable = False
+        if isinstance(graph, GenericGraph):
+            # refuse writes that bypass the graph's API, i.e. `graph.edge_dict[e] = w` or
+            # `graph.edge_dict[e]['cap'] = 5`, at every level of the weights
+            memo = {}
+            freeze = lambda d: _FrozenDict((k, _frozen(w, memo)) for k, w in d.items())
+            if isinstance(graph.edge_dict, _UndirectedEdgeDict):
+                graph.edge_dict.records = freeze(graph.edge_dict.records)
+            else:
+                graph.edge_dict = freeze(graph.edge_dict)
+            graph.vertex_dict = freeze(graph.vertex_dict)
+        graph.read_only = True
+
+        with cls._cache_lock:
+            # keep the first instance if another thread built the same graph meanwhile
+            graph = cls._cache.setdefault(key, graph)
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.cache_size:
+                cls._cache.popitem(last=False)
+        return graph
+
+    @staticmethod
+    def invalidate(type_=None, **kwargs):
+        """Drop a cached graph (given the same type_ and kwargs it was created with), or every cached graph"""
+        cls = GraphFactory
+        with cls._cache_lock:
+            if type_ is None:
+                cls._cache.clear()
+            else:
+                cls._cache.pop(cls.cache_key(type_, **kwargs), None)
+
+    @staticmethod
+    def cache_info():
+        """Return cache hit/miss counters and its size"""
+        cls = GraphFactory
+        with cls._cache_lock:
+            info = dict(cls._cache_counters)
+            info.update(size=len(cls._cache), maxsize=cls.cache_size)
+        return info
+
+def _digest(h, obj):
+    """Feed a canonical encoding of obj into hash h"""
+    if isinstance(obj, np.ndarray):
+        h.update("A{}{}".format(obj.dtype.str, obj.shape).encode())
+        if obj.dtype.hasobject:
+            _digest(h, obj.tolist())
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update("D{}".format(len(obj)).encode())
+        for k, v in obj.items():
+            _digest(h, k)
+            _digest(h, v)
+    elif isinstance(obj, (list, tuple)):
+        h.update("{}{}".format(type(obj).__name__[0], len(obj)).encode())
+        for item in obj:
+            _digest(h, item)
+    elif obj is None or isinstance(obj, (bool, int, float, complex, str, bytes, np.generic)):
+        h.update(repr((type(obj).__name__, obj)).encode())
+        h.update(b";")
+    else:
+        raise TypeError("can not hash {} objects for the graph cache".format(type(obj).__name__))
+
 class GraphManager:
-    """Singleton Metaclass to keep track of all graph instances.
-        Will overwrite existing layers!
-    
+    """Singleton Metaclass to keep track of all graph instances. Thread-safe, and reads never block.
+
+    Layers are either graphs, or lazy loaders (a graph file path, see `graph_io.load_graph`, or a
+    function returning a graph) which are only loaded on the first `get_layer`. When a memory budget
+    is set, least recently used lazy layers are unloaded to stay within it, and simply loaded again
+    when needed. Layers added as graphs are never evicted, since they could not be reloaded
+
+    Layers are published read-copy-update style: `layers` is an immutable snapshot that writers
+    replace as a whole, in a single assignment. Readers just look the graph up, without locking,
+    and keep the version they got for as long as they hold on to it (i.e. for a whole search),
+    even if a newer version is published meanwhile. Published graphs must therefore not be modified
+    in place, writers build the next version off to the side with `publish` or `edit_layer`
+
+    Example:
+        GraphManager.set_memory_budget(2**30)
+        GraphManager.add_layer("maps/floor1.sgm", "floor1")
+        GraphManager.add_layer(lambda: build_graph(), "floor2")
+        graph = GraphManager.get_layer("floor1")     # loaded here
+        GraphManager.stats()                         # {"hits": 0, "misses": 1, "evictions": 0, ...}
+
+        # searches holding `graph` are unaffected by this update
+        with GraphManager.edit_layer("floor2") as g:
+            g.remove_vertices([(3, 4)])
+
+    Attributes:
+        layers (dict): Snapshot of the loaded layers, do not modify it
+        memory_budget (int): Bytes the loaded layers may hold (by default None, unlimited)
+
     """
     layers = {}
+    memory_budget = None
+
+    _loaders = {}
+    _sizes = {}
+    _versions = {}
+    _last_used = {}
+    _load_locks = {}
+    _write_locks = {}
+    _lock = threading.RLock()
+    # itertools.count is advanced atomically, and every thread counts its hits in its own
+    # cell, so readers never need a lock
+    _clock = itertools.count()
+    _local = threading.local()
+    _hit_cells = []
+    _counters = {"misses": 0, "evictions": 0}
 
     @classmethod
     def add_layer(cls, graph, name=""):
-        assert not name in cls.layers, '"{}" ALREADY EXISTS'.format(name)
-        cls.layers[name] = graph
+        """Add a layer
+
+        Parameters:
+            graph: A graph, or a lazy loader: a graph file path or a function returning a graph
+            name (str): Name of the layer, must be new
+
+        """
+        with cls._lock:
+            assert not cls.has_layer(name), '"{}" ALREADY EXISTS'.format(name)
+            cls.__set(graph, name)
 
     @classmethod
     def update_layer(cls, graph, name):
-        assert name in cls.layers, '"{}" NOT FOUND,  ADD IT FIRST via add_layer(graph, name)'.format(name)
-        cls.layers[name] = graph
+        """Replace a layer by a new graph (or lazy loader), see `add_layer`. Readers holding
+        the previous graph keep using it
+
+        """
+        with cls._lock:
+            assert cls.has_layer(name), '"{}" NOT FOUND,  ADD IT FIRST via add_layer(graph, name)'.format(name)
+            cls.__set(graph, name)
+
+    @classmethod
+    def __set(cls, graph, name):
+        layers = dict(cls.layers)
+        layers.pop(name, None)
+        cls._sizes.pop(name, None)
+        if isinstance(graph, str) or callable(graph) and not isinstance(graph, Graph):
+            cls._loaders[name] = graph
+        else:
+            cls._loaders.pop(name, None)
+            layers[name] = graph
+            cls._sizes[name] = cls._sizeof(graph)
+            cls._last_used[name] = next(cls._clock)
+        cls._versions[name] = cls._versions.get(name, 0) + 1
+        cls.__publish(layers, keep=name)
+
+    @classmethod
+    def __publish(cls, layers, keep=None):
+        """Evict layers over the memory budget, then swap in the new snapshot"""
+        if cls.memory_budget is not None:
+            total = sum(cls._sizes.values())
+            lru = sorted((n for n in layers if n != keep and n in cls._loaders), key=lambda n: cls._last_used.get(n, -1))
+            for name in lru:
+                if total <= cls.memory_budget:
+                    break
+                del layers[name]
+                total -= cls._sizes.pop(name)
+                cls._counters["evictions"] += 1
+        cls.layers = layers
+
+    @classmethod
+    def publish(cls, name, update):
+        """Publish the next version of a layer. Writers of the same layer are serialized, readers are never blocked
+
+        Parameters:
+            name (str): Name of the layer
+            update (callable): update(current graph) -> next graph. Must build a new graph rather than
+                modify the current one in place, since readers may be using it
+
+        Returns:
+            version (int): The layer's new version
+
+        """
+        with cls.__write_lock(name):
+            graph = update(cls.get_layer(name))
+            with cls._lock:
+                # a modified layer can not be reloaded, so it is pinned from now on
+                cls.__set(graph, name)
+                return cls._versions[name]
+
+    @classmethod
+    @contextlib.contextmanager
+    def edit_layer(cls, name, copy_fn=copy.deepcopy):
+        """Context manager yielding a private copy of a layer, published when the block exits
+        without an exception. See `publish`
+
+        Parameters:
+            name (str): Name of the layer
+            copy_fn (callable): Makes the copy to edit (by default copy.deepcopy)
+
+        """
+        with cls.__write_lock(name):
+            draft = copy_fn(cls.get_layer(name))
+            yield draft
+            with cls._lock:
+                cls.__set(draft, name)
+
+    @classmethod
+    def __write_lock(cls, name):
+        with cls._lock:
+            return cls._write_locks.setdefault(name, threading.RLock())
+
+    @classmethod
+    def layer_version(cls, name):
+        """Return how many times a layer was added or updated, 0 if it does not exist"""
+        return cls._versions.get(name, 0)
 
     @classmethod
     def delete_layer(cls, name):
-        del cls.layers[name]
+        with cls._lock:
+            if not cls.has_layer(name):
+                raise KeyError(name)
+            layers = dict(cls.layers)
+            layers.pop(name, None)
+            cls._loaders.pop(name, None)
+            cls._sizes.pop(name, None)
+            cls._versions.pop(name, None)
+            cls.layers = layers
         print('Deleted "{}"'.format(name))
 
+    @classmethod
+    def has_layer(cls, name):
+        """Whether a layer is registered, loaded or not"""
+        return name in cls.layers or name in cls._loaders
+
+    @classmethod
+    def is_loaded(cls, name):
+        return name in cls.layers
+
     @classmethod
     def get_layer(cls, name):
-        return cls.layers[name]
+        """Return a layer, loading it first if it is lazy and not loaded yet. Never blocks
+        unless the layer has to be loaded
+
+        """
+        graph = cls.layers.get(name)
+        if graph is not None:
+            cls.__count_hit()
+            cls._last_used[name] = next(cls._clock)
+            return graph
+
+        with cls._lock:
+            loader = cls._loaders[name]
+            load_lock = cls._load_locks.setdefault(name, threading.Lock())
+
+        # load outside of the registry lock so other layers stay available, while
+        # concurrent requests for this layer wait for a single load
+        with load_lock:
+            graph = cls.layers.get(name)
+            if graph is not None:
+                cls.__count_hit()
+                return graph
+            with cls._lock:
+                cls._counters["misses"] += 1
+            if isinstance(loader, str):
+                graph = load_graph(loader)
+            else:
+                graph = loader()
+            size = cls._sizeof(graph)
+            with cls._lock:
+                # the layer may have been replaced or deleted meanwhile
+                if cls._loaders.get(name) is loader:
+                    layers = dict(cls.layers)
+                    layers[name] = graph
+                    cls._sizes[name] = size
+                    cls._last_used[name] = next(cls._clock)
+                    cls.__publish(layers, keep=name)
+            return graph
+
+    @classmethod
+    def __count_hit(cls):
+        cell = getattr(cls._local, "hits", None)
+        if cell is None:
+            cell = cls._local.hits = [0]
+            with cls._lock:
+                cls._hit_cells.append(cell)
+        cell[0] += 1
+
+    @staticmethod
+    def _sizeof(graph):
+        if hasattr(graph, "memory_usage"):
+            return graph.memory_usage()["total"]
+        return sizeof(graph)
+
+    @classmethod
+    def set_memory_budget(cls, budget):
+        """Set the bytes loaded layers may hold (None for unlimited), evicting layers if needed"""
+        with cls._lock:
+            cls.memory_budget = budget
+            cls.__publish(dict(cls.layers))
+
+    @classmethod
+    def memory_usage(cls):
+        """Return the bytes held by each loaded layer, plus a "total" """
+        with cls._lock:
+            report = dict(cls._sizes)
+        report["total"] = sum(report.values())
+        return report
+
+    @classmethod
+    def stats(cls):
+        """Return hit/miss/eviction counters, and the number of registered and loaded layers"""
+        with cls._lock:
+            stats = {"hits": sum(cell[0] for cell in cls._hit_cells)}
+            stats.update(cls._counters)
+            stats["layers"] = len(set(cls.layers) | set(cls._loaders))
+            stats["loaded"] = len(cls.layers)
+        return stats
+
+    @classmethod
+    def clear(cls):
+        """Remove every layer and reset the counters"""
+        with cls._lock:
+            cls.layers = {}
+            cls._loaders.clear()
+            cls._sizes.clear()
+            cls._versions.clear()
+            cls._last_used.clear()
+            cls._load_locks.clear()
+            cls._write_locks.clear()
+            for cell in cls._hit_cells:
+                cell[0] = 0
+            cls._counters.update(misses=0, evictions=0)
 
 import numpy as np
 class CostMapManager: 
-    """Cost map class assuming maps are representing as 2D numpy arrays """
+    """Cost map class assuming maps are representing as 2D numpy arrays (all of the same shape).
+
+    The weighted total of all layers is cached and kept up to date incrementally: replacing a
+    layer, or writing a rectangle of it through `update_region`, only re-adds the cells of that
+    rectangle. So `return_total_map` costs nothing and allocates nothing when the layers did not change
+
+    Example:
+        cm = CostMapManager()
+        cm.add_layer(static_map, "static")
+        cm.add_layer(people, "people", weight=5)
+        total = cm.return_total_map()
+        # only people's cells of the rectangle are re-added
+        cm.update_region("people", np.s_[10:20, 30:40], new_people)
+        # after people[10:20, 30:40] was modified in place, every layer is re-added over the rectangle
+        cm.mark_dirty("people", np.s_[10:20, 30:40])
+
+    Attributes:
+        layers (dict): The layers, {name: 2d numpy array}
+        weights (dict): Weight of each layer in the total, {name: float} (by default 1)
+
+    """
     def __init__(self):    
         self.layers= {}
+        self.weights = {}
+        # weighted total and a scratch buffer of the same shape, built on first use
+        self._total = None
+        self._scratch = None
 
-    def add_layer(self, grid=None, name=""):
+    def add_layer(self, grid=None, name="", weight=1):
         assert  not name in self.layers, '"{}"  ALREADY EXISTS'.format(name)
         self.layers[name] = grid
+        self.weights[name] = weight
+        self.__add(name, grid, weight)
     
-    # THIS FUCNTION MAY BE USELESS
-    def update_layer(self, grid, name):
+    def update_layer(self, grid, name, region=None):
+        """Replace a layer, only updating the total over `region`
+
+        Parameters:
+            grid (numpy.ndarray): The new layer
+            name (str): Name of the layer
+            region (tuple of slices): Rectangle where grid differs from the old layer, i.e. np.s_[10:20, 5:15].
+                By default the whole map
+
+        """
         assert name in self.layers, '"{}" NOT FOUND, ADD IT FIRST'.format(name)
-        self.layers[name] = grid 
+        old = self.layers[name]
+        self.layers[name] = grid
+        if grid is old:
+            # modified in place, the old values are gone
+            self.mark_dirty(name, region)
+        elif self._total is not None:
+            if region is None:
+                region = (slice(None), slice(None))
+            if not self.__fits(grid, self.weights[name]):
+                self._total = None
+                return
+            # add the difference over the region only, computed in the dtype of the total so that
+            # unsigned layers do not wrap around
+            self._total.flags.writeable = True
+            scratch, total = self._scratch[region], self._total[region]
+            np.multiply(old[region], self.weights[name], out=scratch, dtype=scratch.dtype)
+            np.subtract(total, scratch, out=total)
+            np.multiply(grid[region], self.weights[name], out=scratch, dtype=scratch.dtype)
+            np.add(total, scratch, out=total)
+            self._total.flags.writeable = False
+
+    def set_weight(self, name, weight):
+        """Change the weight of a layer in the total"""
+        assert name in self.layers, '"{}" NOT FOUND, ADD IT FIRST'.format(name)
+        self.weights[name] = weight
+        self._total = None
+
+    def update_region(self, name, region, values):
+        """Write values into a rectangle of a layer, updating the total by the difference of that
+        layer only, i.e. O(rectangle) whatever the number of layers
+
+        Parameters:
+            name (str): Name of the layer
+            region (tuple of slices): i.e. np.s_[10:20, 5:15]
+            values (numpy.ndarray or scalar): The new values, broadcast to the rectangle and cast to the
+                layer's dtype like any numpy assignment
+
+        """
+        assert name in self.layers, '"{}" NOT FOUND, ADD IT FIRST'.format(name)
+        grid, weight = self.layers[name], self.weights[name]
+        if self._total is None:
+            grid[region] = values
+            return
+        scratch = self._scratch[region]
+        np.multiply(grid[region], weight, out=scratch, dtype=scratch.dtype)
+        # written before the total is touched, in case the layer is read-only
+        grid[region] = values
+        self._total.flags.writeable = True
+        total = self._total[region]
+        np.subtract(total, scratch, out=total)
+        np.multiply(grid[region], weight, out=scratch, dtype=scratch.dtype)
+        np.add(total, scratch, out=total)
+        self._total.flags.writeable = False
+
+    def mark_dirty(self, name=None, region=None):
+        """Recompute the total over a rectangle after layers were modified in place. The old values
+        are gone by then, so every layer is re-added over the rectangle: write through `update_region`
+        instead to only re-add the layer that changed
+
+        Parameters:
+            name (str): Layer that changed, must exist. None when several layers changed
+            region (tuple of slices): i.e. np.s_[10:20, 5:15]. By default the whole map
+
+        """
+        assert name is None or name in self.layers, '"{}" NOT FOUND, ADD IT FIRST'.format(name)
+        if self._total is None:
+            return
+        if region is None:
+            self._total = None
+            return
+        self._total.flags.writeable = True
+        total, scratch = self._total[region], self._scratch[region]
+        total.fill(0)
+        for n, grid in self.layers.items():
+            np.multiply(grid[region], self.weights[n], out=scratch, dtype=scratch.dtype)
+            np.add(total, scratch, out=total)
+        self._total.flags.writeable = False
+
+    @staticmethod
+    def __dtype(grid, weight):
+        """dtype of the weighted layer in the total: the one np.sum would use (i.e. uint8 is summed
+        as uint64), widened by the weight (a negative weight turns unsigned layers into floats)
+
+        """
+        return np.result_type(np.sum(grid[:0]).dtype, np.min_scalar_type(weight))
+
+    def __fits(self, grid, weight):
+        """Whether grid (times weight) can be added into the total without changing its dtype"""
+        return grid.shape == self._total.shape and \
+            np.result_type(self._total, self.__dtype(grid, weight)) == self._total.dtype
+
+    def __add(self, name, grid, weight, subtract=False):
+        """Add (or subtract) a whole weighted layer to the total"""
+        if self._total is None:
+            return
+        if not self.__fits(grid, weight):
+            self._total = None
+            return
+        self._total.flags.writeable = True
+        np.multiply(grid, weight, out=self._scratch, dtype=self._scratch.dtype)
+        if subtract:
+            np.subtract(self._total, self._scratch, out=self._total)
+        else:
+            np.add(self._total, self._scratch, out=self._total)
+        self._total.flags.writeable = False
 
     def does_layer_exist(self, name):
         ''' helper function to only add layer once 
@@ -107,10 +618,33 @@ class CostMapManager:
         return  all(n in self.layers for n in name)
 
     def return_total_map(self):  
-        # Convert self.layers to a 3d array
-        array_3d = np.dstack(list(self.layers.values()))
-        return np.sum(array_3d, axis=2)
+        """Return the weighted sum of all layers. The returned array is the cache itself, it is
+        read-only and updated in place as layers change, copy it to keep a fixed version
+
+        """
+        if self._total is None:
+            grids = list(self.layers.values())
+            weights = list(self.weights.values())
+            dtype = np.result_type(*(self.__dtype(g, w) for g, w in zip(grids, weights)))
+            self._total = np.zeros(grids[0].shape, dtype=dtype)
+            self._scratch = np.empty_like(self._total)
+            for grid, w in zip(grids, weights):
+                np.multiply(grid, w, out=self._scratch, dtype=dtype)
+                np.add(self._total, self._scratch, out=self._total)
+            self._total.flags.writeable = False
+        return self._total
 
     def delete_layer(self, name):
+        self.__add(name, self.layers[name], self.weights[name], subtract=True)
         del self.layers[name]
-        print('Deleted "{}"'.format(name))
\ No newline at end of file
+        del self.weights[name]
+        if not self.layers:
+            self._total = None
+        print('Deleted "{}"'.format(name))
+
+    def memory_usage(self, deep=True):
+        """Return the bytes held by each layer and by the cached total, plus a "total" """
+        structures = dict(self.layers)
+        structures["total_map"] = self._total
+        structures["scratch"] = self._scratch
+        return memory_report(structures, deep=deep)
@@ -0,0 +1,152 @@
+from collections.abc import MutableMapping
+import numpy as np
+
+from .graph import Graph
+
+class _FilteredDict(MutableMapping):
+    """Dict-like view of the entries of a base dict accepted by `keep`. Reads and weight
+    updates go straight to the base dict, entries can not be added or removed through the view
+
+    """
+    def __init__(self, base, keep):
+        self._base = base
+        self._keep = keep
+
+    def __getitem__(self, key):
+        if not self._keep(key):
+            raise KeyError(key)
+        return self._base[key]
+
+    def __setitem__(self, key, val):
+        if key not in self:
+            raise KeyError(key)
+        self._base[key] = val
+
+    def __delitem__(self, key):
+        raise TypeError("entries can not be removed through a graph view, modify the parent graph instead")
+
+    def __contains__(self, key):
+        return key in self._base and self._keep(key)
+
+    def __iter__(self):
+        keep = self._keep
+        return (key for key in self._base if keep(key))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+class GraphView(Graph):
+    """A lazy, zero-copy view of a graph restricted to a set of vertices and/or edges. Nothing is
+    copied, `neighbors` and `cost` filter the parent graph on the fly. Weights are shared with
+    the parent, so algorithms writing onto weights (i.e. MaxFlow flows) update the parent's weights.
+    Use `view.overlay()` to keep the parent untouched
+
+    Usually created with `genG.subgraph(vertices)` or `genG.edge_filter(predicate)`, views can
+    also be chained, i.e. `genG.subgraph(region).edge_filter(lambda u, v, w: w["cap"] > 0)`
+
+    Parameters:
+        base (Graph): The parent graph, a GenericGraph or another view
+        vertices (iter): If given, only these vertices and the edges between them are kept
+        edges (callable or iter): If given, only the edges accepted are kept. Either a predicate
+            f(u, v, weight) -> bool, a collection of edges (tuples or lists), or a boolean mask
+            (all bools) over `list(base.edge_dict)`. Edges of an undirected parent are kept in both
+            directions, whichever one is given
+
+    Attributes:
+        base (Graph): see above
+        graph_type (str): same as the parent graph
+        edge_dict (MutableMapping): Dict-like view of the visible edges of the parent
+        vertex_dict (MutableMapping): Dict-like view of the visible vertices of the parent
+
+    """
+    def __init__(self, base, vertices=None, edges=None):
+        self.base = base
+        self.graph_type = base.graph_type
+        self._vertices = None if vertices is None else set(vertices)
+
+        if edges is None or callable(edges):
+            self._edge_pred = edges
+            self._edge_set = None
+        else:
+            edges = list(edges)
+            if edges and all(isinstance(keep, (bool, np.bool_)) for keep in edges):
+                # boolean mask aligned with the parent's edge order
+                edges = [e for e, keep in zip(base.edge_dict, edges) if keep]
+            self._edge_pred = None
+            self._edge_set = set(map(tuple, edges))
+            if base.graph_type == "undirected":
+                # either orientation names the same edge
+                self._edge_set.update([(v, u) for u, v in self._edge_set])
+
+        self.edge_dict = _FilteredDict(base.edge_dict, lambda e: self.has_edge(e[0], e[1]))
+        self.vertex_dict = _FilteredDict(base.vertex_dict, self.has_vertex)
+
+    @property
+    def read_only(self):
+        """Whether the parent is read-only. Weights are shared with the parent, so writing to them
+        through the view would change it
+
+        """
+        return getattr(self.base, "read_only", False)
+
+    def has_vertex(self, v):
+        """Whether v is visible in this view (assuming the parent has it)"""
+        return self._vertices is None or v in self._vertices
+
+    def has_edge(self, u, v):
+        """Whether edge (u, v) is visible in this view (assuming the parent has it)"""
+        if self._vertices is not None and (u not in self._vertices or v not in self._vertices):
+            return False
+        if self._edge_set is not None:
+            return (u, v) in self._edge_set
+        if self._edge_pred is not None:
+            return self._edge_pred(u, v, self.base.cost(u, v))
+        return True
+
+    @property
+    def edges(self):
+        return self.edge_dict
+
+    @property
+    def vertices(self):
+        return self.vertex_dict
+
+    def edge_count(self):
+        return len(self.edge_dict)
+
+    def node_count(self):
+        return len(self.vertex_dict)
+
+    def get_vertices(self):
+        return list(self.vertex_dict)
+
+    def subgraph(self, vertices):
+        """Return a view of this view induced by `vertices`, see `GenericGraph.subgraph`"""
+        return GraphView(self, vertices=vertices)
+
+    def edge_filter(self, edges):
+        """Return a view of this view with only some edges kept, see `GenericGraph.edge_filter`"""
+        return GraphView(self, edges=edges)
+
+    def overlay(self):
+        """Return a copy-on-write OverlayGraph of this view, see `GenericGraph.overlay`"""
+        from .overlay_graph import OverlayGraph
+        return OverlayGraph(self)
+
+    def neighbors(self, v):
+        """Return a list of the visible neighbors of v"""
+        if not self.has_vertex(v):
+            return []
+        has_edge = self.has_edge
+        return [w for w in self.base.neighbors(v) if has_edge(v, w)]
+
+    def cost(self, *args, **kwargs):
+        """Return cost of a visible edge or vertex, see `GenericGraph.cost`. Raises KeyError
+        for edges and vertices filtered out of the view
+
+        """
+        if len(args) == 2 and not self.has_edge(*args):
+            raise KeyError(tuple(args))
+        if len(args) == 1 and not self.has_vertex(args[0]):
+            raise KeyError(args[0])
+        return self.base.cost(*args, **kwargs)
@@ -49,7 +49,7 @@ def filter_points(path, points, grid_dim):
     thresh = points[ (grid_dim[0] <= x)*(x <= grid_dim[1])* (grid_dim[2] <= y)*(y <= grid_dim[3])]
     return thresh
 
-def init_grid(grid_dim, grid_size, init_val):
+def init_grid(grid_dim, grid_size, init_val, dtype=np.float64):
     # Add 1 to even out world coordinates
     # Add np ceil to ensure actual grid size is not bigger than desired
     # since for some values, the grid dim wont divide evenly by grid size
@@ -60,9 +60,9 @@ def init_grid(grid_dim, grid_size, init_val):
     yvals = int((grid_dim[3] - grid_dim[2]) / grid_size + 1)
 
     if init_val != 0:
-        return init_val * np.ones((yvals, xvals))
+        return np.full((yvals, xvals), init_val, dtype=dtype)
     else:
-        return np.zeros((yvals, xvals))
+        return np.zeros((yvals, xvals), dtype=dtype)
 
 
 def get_index(x, y, grid_size, grid_dim):
@@ -0,0 +1,98 @@
+""" Memory footprint accounting
+
+functions:
+
+    :sizeof(obj, deep=True): bytes held by an object and (if deep) everything it references
+    :memory_report(structures, deep=True): per-structure breakdown, used by the `memory_usage` methods
+    :peak_memory(fn, *args, **kwargs): run fn and return its result with the peak bytes allocated meanwhile
+
+Sizes come from `sys.getsizeof`, so they are estimates of what the interpreter holds: shared objects
+are counted once, numpy arrays count their data buffer only if they own it (memory mapped arrays
+and views are just their header), and small ints/interned strings cached by Python are still counted
+
+"""
+import collections
+import sys
+import tracemalloc
+import types
+import numpy as np
+
+_CONTAINERS = (list, tuple, set, frozenset, collections.deque)
+_SKIP = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType)
+
+def sizeof(obj, deep=True, seen=None):
+    """Return the bytes held by obj
+
+    Parameters:
+        obj: Any object
+        deep (bool): Whether referenced objects (container items, dict keys and values,
+            attributes of plain objects) are included
+        seen (set): ids of objects already counted, which are skipped. Updated in place
+
+    """
+    if seen is None:
+        seen = set()
+    if not deep:
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        return sys.getsizeof(obj)
+
+    total, stack = 0, [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, _SKIP):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, np.ndarray):
+            if o.dtype.hasobject:
+                stack.extend(o.ravel().tolist())
+        elif isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, _CONTAINERS):
+            stack.extend(o)
+        elif hasattr(o, "__dict__") and not isinstance(o, (str, bytes, int, float, complex)):
+            stack.append(o.__dict__)
+    return total
+
+def memory_report(structures, deep=True):
+    """Return {name: bytes} for every structure plus a "total". Objects shared between
+    structures are only counted for the first one
+
+    Parameters:
+        structures (dict): {name: object}, None values are reported as 0 bytes
+        deep (bool): see `sizeof`
+
+    """
+    seen, report = set(), {}
+    for name, obj in structures.items():
+        report[name] = 0 if obj is None else sizeof(obj, deep=deep, seen=seen)
+    report["total"] = sum(report.values())
+    return report
+
+def peak_memory(fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) while tracing allocations with tracemalloc
+
+    Example:
+        parent_g, peak = peak_memory(BestFirstSearch(graph, start, goal).run)
+
+    Returns:
+        result: Whatever fn returned
+        peak (int): Peak bytes allocated during the call, on top of what was allocated before it
+
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        result = fn(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if started:
+            tracemalloc.stop()
+    return result, peak
@@ -0,0 +1,324 @@
+import copy
+from collections.abc import MutableMapping, MutableSequence
+
+from .graph import Graph
+
+class _Removed:
+    """Marker for a base entry deleted in the overlay"""
+    pass
+
+_REMOVED = _Removed()
+
+class _CopyOnWrite:
+    """Mixin for a mutable base weight handed out by an _OverlayDict. Reads go straight to the
+    base weight, the first write copies it into the overlay's changes and goes to the copy. Nested
+    dicts and lists are handed out wrapped as well, with the weight above as their owner, so a
+    write at any depth copies the whole weight first
+
+    """
+    __slots__ = ("_owner", "_key", "_val")
+
+    def __init__(self, owner, key, val):
+        self._owner = owner
+        self._key = key
+        self._val = val
+
+    def _write(self):
+        self._val = self._owner._writable(self._key)
+        return self._val
+
+    def _writable(self, i):
+        """Return the local copy of the nested weight at i (the copy of the weight is a deep one)"""
+        return self._write()[i]
+
+    def __getitem__(self, i):
+        val = self._val[i]
+        if isinstance(val, dict):
+            return _CopyOnWriteDict(self, i, val)
+        if isinstance(val, list):
+            return _CopyOnWriteList(self, i, val)
+        return val
+
+    def __setitem__(self, i, x):
+        self._write()[i] = x
+
+    def __delitem__(self, i):
+        del self._write()[i]
+
+    def __len__(self):
+        return len(self._val)
+
+    def __eq__(self, other):
+        if isinstance(other, _CopyOnWrite):
+            other = other._val
+        return self._val == other
+
+    def __repr__(self):
+        return repr(self._val)
+
+    def __copy__(self):
+        return copy.copy(self._val)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self._val, memo)
+
+class _CopyOnWriteDict(_CopyOnWrite, MutableMapping):
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(self._val)
+
+    def __contains__(self, k):
+        return k in self._val
+
+class _CopyOnWriteList(_CopyOnWrite, MutableSequence):
+    __slots__ = ()
+
+    def insert(self, i, x):
+        self._write().insert(i, x)
+
+def _unwrap(val):
+    """Return the weight behind a _CopyOnWrite wrapper, handed out when the base is an overlay or snapshot itself"""
+    return val._val if isinstance(val, _CopyOnWrite) else val
+
+class _OverlayDict(MutableMapping):
+    """Dict-like view of a base dict plus local changes. Mutable weights (dicts, lists) of the
+    base are handed out wrapped, and only copied into the changes when first written to, so
+    in-place updates, i.e. `edge_dict[e]['flow'] += 1`, never leak into the base graph while
+    reads cost nothing
+
+    Parameters:
+        base (dict): The base graph's dict
+        changes (dict): Local changes, {key: value or _REMOVED}
+        mirror (bool): Whether keys are undirected edges, whose (u, v) and (v, u) entries share
+            one weight. A copied weight is then shared by both entries as well
+
+    """
+    def __init__(self, base, changes, mirror=False):
+        self._base = base
+        self._changes = changes
+        self._mirror = mirror
+
+    def __getitem__(self, key):
+        if key in self._changes:
+            val = self._changes[key]
+            if val is _REMOVED:
+                raise KeyError(key)
+            return val
+        val = _unwrap(self._base[key])
+        if isinstance(val, dict):
+            return _CopyOnWriteDict(self, key, val)
+        if isinstance(val, list):
+            return _CopyOnWriteList(self, key, val)
+        return val
+
+    def _writable(self, key):
+        """Return the local copy of the base weight of key, copying it on first use. The copy is a
+        deep one, so nested weights handed out unwrapped afterwards are local too
+
+        """
+        if key in self._changes:
+            return self[key]
+        val = _unwrap(self._base[key])
+        copied = self._changes[key] = copy.deepcopy(val)
+        if self._mirror:
+            rkey = (key[1], key[0])
+            if rkey not in self._changes and rkey in self._base and _unwrap(self._base[rkey]) is val:
+                self._changes[rkey] = copied
+        return copied
+
+    def __setitem__(self, key, val):
+        self._changes[key] = val
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._changes[key] = _REMOVED
+
+    def __contains__(self, key):
+        if key in self._changes:
+            return self._changes[key] is not _REMOVED
+        return key in self._base
+
+    def __iter__(self):
+        changes = self._changes
+        for key in self._base:
+            if key not in changes or changes[key] is not _REMOVED:
+                yield key
+        for key, val in list(changes.items()):
+            if val is not _REMOVED and key not in self._base:
+                yield key
+
+    def __len__(self):
+        n = len(self._base)
+        for key, val in self._changes.items():
+            if key in self._base:
+                n -= val is _REMOVED
+            else:
+                n += val is not _REMOVED
+        return n
+
+class OverlayGraph(Graph):
+    """A copy-on-write view of a GenericGraph. Shares the base graph's storage and only records
+    local modifications (added/removed edges and vertices, changed weights), so deriving a
+    residual or what-if graph costs O(changes) rather than O(graph). The base graph is never
+    modified by the overlay
+
+    Usually created with `genG.overlay()`
+
+    Parameters:
+        base (GenericGraph): The graph to overlay. Should not be modified while the overlay is in use
+
+    Attributes:
+        base (GenericGraph): see above
+        graph_type (str): same as the base graph
+        edge_dict (MutableMapping): Dict-like view of the edges of the overlay
+        vertex_dict (MutableMapping): Dict-like view of the vertices of the overlay
+
+    """
+    def __init__(self, base):
+        self.base = base
+        self.graph_type = base.graph_type
+
+        # local changes, keyed like the base dicts
+        self._edge_changes = {}
+        self._vertex_changes = {}
+
+        # adjacency of vertices touched by the overlay, copied from the base on first change
+        self._adj = {}
+
+        self.edge_dict = _OverlayDict(base.edge_dict, self._edge_changes, mirror=base.graph_type == "undirected")
+        self.vertex_dict = _OverlayDict(base.vertex_dict, self._vertex_changes)
+
+    def _local_adj(self, v):
+        if v not in self._adj:
+            self._adj[v] = dict.fromkeys(self.base.neighbors(v))
+        return self._adj[v]
+
+    def _insert_edge(self, u, v, weight):
+        self._edge_changes[(u, v)] = weight
+        self._local_adj(u)[v] = None
+        self._local_adj(v)
+        for x in (u, v):
+            if x not in self.vertex_dict:
+                self._vertex_changes[x] = None
+        if self.graph_type == "undirected":
+            self._edge_changes[(v, u)] = weight
+            self._local_adj(v)[u] = None
+
+    def _delete_edge(self, u, v):
+        del self.edge_dict[(u, v)]
+        self._local_adj(u).pop(v, None)
+        if self.graph_type == "undirected":
+            # already gone if it is a self loop
+            self.edge_dict.pop((v, u), None)
+            self._local_adj(v).pop(u, None)
+
+    def change_count(self):
+        """Return the number of locally recorded edge and vertex changes"""
+        return len(self._edge_changes) + len(self._vertex_changes)
+
+    @property
+    def edges(self):
+        return self.edge_dict
+
+    @property
+    def vertices(self):
+        return self.vertex_dict
+
+    def edge_count(self):
+        return len(self.edge_dict)
+
+    def node_count(self):
+        return len(self.vertex_dict)
+
+    def get_vertices(self):
+        return list(self.vertex_dict)
+
+    def add_edge(self, edge_dict):
+        """Add edges to the overlay. Will silently replace edges if it already exists
+
+        Arg:
+            edge_dict (dict): i.e. {('v1', 'v2'): 5.0}
+
+        """
+        self.add_edges(edge_dict)
+
+    def add_edges(self, edges, weight=None):
+        """Add edges in bulk, see `GenericGraph.add_edges`"""
+        if isinstance(edges, dict):
+            edges = ((e[0], e[1], w) for e, w in edges.items())
+        for e in edges:
+            if len(e) == 3:
+                self._insert_edge(e[0], e[1], e[2])
+            else:
+                self._insert_edge(e[0], e[1], weight)
+
+    def add_vertex(self, vertex_dict):
+        """Add or replace vertex weights in the overlay
+
+        Arg:
+            vertex_dict (dict): {'v1': 5}
+
+        """
+        self._vertex_changes.update(vertex_dict)
+
+    def remove_edges(self, edge_list):
+        """Delete specific edges from the overlay, raises KeyError if an edge is not there"""
+        for e in edge_list:
+            self._delete_edge(e[0], e[1])
+
+    def set_weight(self, *args, value=None, name=None):
+        """Change the weight of an edge or vertex in the overlay only
+
+        Args:
+            from_node, to_node (vertex, vertex): An edge
+            node (vertex): A single vertex
+
+        Kwargs:
+            value: The new weight
+            name (str): If given, only this attribute of a multi-weighted edge or vertex is changed
+
+        """
+        if len(args) == 2:
+            data, key = self.edge_dict, tuple(args)
+        else:
+            data, key = self.vertex_dict, args[0]
+        if key not in data:
+            raise KeyError(key)
+        if name is None:
+            data[key] = value
+        else:
+            # the view copies mutable weights on write, so the base is untouched
+            data[key][name] = value
+        if len(args) == 2 and self.graph_type == "undirected":
+            self._edge_changes[(args[1], args[0])] = self._edge_changes[key]
+
+    def neighbors(self, v):
+        """Return a list of neighbors of v"""
+        if v in self._adj:
+            return list(self._adj[v])
+        return self.base.neighbors(v)
+
+    def cost(self, *args, **kwargs):
+        """Return cost of edge or vertex based on number of args, see `GenericGraph.cost`"""
+        if len(args) == 2:
+            key, changes, base = tuple(args), self._edge_changes, self.base.edge_dict
+        elif len(args) == 1:
+            key, changes, base = args[0], self._vertex_changes, self.base.vertex_dict
+        else:
+            raise KeyError("vertex or edge not found using arguments: {}".format(args))
+
+        # read through to the base without copying
+        weight = changes[key] if key in changes else base[key]
+        if weight is _REMOVED:
+            raise KeyError(key)
+
+        if "name" in kwargs:
+            name = kwargs["name"]
+            if type(name) == list:
+                for n in name:
+                    weight = weight[n]
+            else:
+                weight = weight[name]
+        return weight
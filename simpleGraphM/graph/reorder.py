@@ -0,0 +1,115 @@
+""" Vertex orderings improving memory locality
+
+Searches on array-backed graphs (`CSRGraph`, id-space algorithms) touch the neighbor and per-vertex
+arrays of nearby vertices together. Giving such vertices nearby ids, before freezing, turns many
+of those accesses into cache hits. Every function here returns a list of all vertex keys, in the
+order they should be numbered. See `GenericGraph.reorder` to apply an ordering.
+
+functions:
+
+    :rcm_order(graph): reverse Cuthill-McKee, reduces the bandwidth of the adjacency matrix
+    :bfs_order(graph): breadth-first order
+    :dfs_order(graph): depth-first (preorder) order
+    :hilbert_order(graph): Hilbert curve order of 2D coordinate vertices, i.e. grid cells
+
+"""
+import collections
+import numpy as np
+
+def _vertices(graph):
+    vertices = list(graph.vertex_dict)
+    vertices.extend(v for v in graph.adjList if v not in graph.vertex_dict)
+    return vertices
+
+def _adjacency(graph):
+    """Return a function giving the neighbors of v, ignoring edge direction"""
+    if graph.graph_type == "undirected":
+        return graph.neighbors
+    def adj(v):
+        out = graph.neighbors(v)
+        return list(out) + [u for u in graph.predecessors(v) if u not in out]
+    return adj
+
+def _search_order(graph, depth_first=False, by_degree=False):
+    """Visit every component starting from its lowest degree vertex"""
+    adj = _adjacency(graph)
+    vertices = _vertices(graph)
+    degree = {v: len(adj(v)) for v in vertices}
+
+    order, seen = [], set()
+    for start in sorted(vertices, key=degree.__getitem__):
+        if start in seen:
+            continue
+        if depth_first:
+            stack = [start]
+            while stack:
+                v = stack.pop()
+                if v in seen:
+                    continue
+                seen.add(v)
+                order.append(v)
+                # push in reverse so the first neighbor is visited first
+                stack.extend(w for w in reversed(list(adj(v))) if w not in seen)
+        else:
+            seen.add(start)
+            queue = collections.deque([start])
+            while queue:
+                v = queue.popleft()
+                order.append(v)
+                nbrs = [w for w in adj(v) if w not in seen]
+                if by_degree:
+                    nbrs.sort(key=degree.__getitem__)
+                seen.update(nbrs)
+                queue.extend(nbrs)
+    return order
+
+def bfs_order(graph):
+    """Return the vertices in breadth-first order"""
+    return _search_order(graph)
+
+def dfs_order(graph):
+    """Return the vertices in depth-first preorder"""
+    return _search_order(graph, depth_first=True)
+
+def rcm_order(graph):
+    """Return the vertices in reverse Cuthill-McKee order"""
+    order = _search_order(graph, by_degree=True)
+    order.reverse()
+    return order
+
+def hilbert_order(graph, bits=16):
+    """Return the vertices sorted along a Hilbert curve. Vertices must be (x, y) tuples of numbers
+
+    Parameters:
+        graph (GenericGraph): Graph with 2D coordinate vertices
+        bits (int): Coordinates are quantized to a 2^bits x 2^bits grid first
+
+    """
+    vertices = _vertices(graph)
+    if not vertices:
+        return vertices
+    coords = np.array(vertices, dtype=float)
+    if coords.ndim != 2 or coords.shape[1] != 2:
+        raise ValueError("hilbert ordering needs (x, y) vertices")
+
+    n = 1 << bits
+    lo, span = coords.min(axis=0), np.ptp(coords, axis=0)
+    span[span == 0] = 1
+    xy = ((coords - lo) / span * (n - 1)).round().astype(np.int64)
+    x, y = xy[:, 0], xy[:, 1]
+
+    d = np.zeros(len(vertices), dtype=np.int64)
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # rotate the quadrant
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return [vertices[i] for i in np.argsort(d, kind="stable")]
+
+ORDERINGS = {"rcm": rcm_order, "bfs": bfs_order, "dfs": dfs_order, "hilbert": hilbert_order}
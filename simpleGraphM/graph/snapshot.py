@@ -0,0 +1,69 @@
+from .overlay_graph import OverlayGraph, _OverlayDict, _CopyOnWriteDict, _CopyOnWriteList, _REMOVED
+
+class _SnapshotDict(_OverlayDict):
+    """A read-only _OverlayDict, nothing can be written through it, not even weights in place"""
+    def __getitem__(self, key):
+        val = super().__getitem__(key)
+        # preserved weights are handed out wrapped too, writes to them end up in _writable
+        if isinstance(val, dict):
+            return _CopyOnWriteDict(self, key, val)
+        if isinstance(val, list):
+            return _CopyOnWriteList(self, key, val)
+        return val
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("graph snapshots are read-only, modify the graph itself or use overlay()")
+
+    __setitem__ = __delitem__ = pop = popitem = update = setdefault = clear = _writable = _read_only
+
+class GraphSnapshot(OverlayGraph):
+    """A read-only, consistent view of a GenericGraph as it was at `version`. Nothing is copied
+    when the snapshot is taken: while it is alive, the graph hands over the old weight and
+    adjacency row of each edge or vertex right before changing it, so a snapshot costs
+    O(changes made since) rather than O(graph)
+
+    Usually created with `genG.snapshot()`. Weights replaced through the graph's API (add_edges,
+    set_weight, ...) are preserved, but in-place edits of a weight object, i.e.
+    `genG.edge_dict[e]['flow'] += 1`, can not be seen by the graph and show up in snapshots too
+
+    Parameters:
+        base (GenericGraph): The graph to snapshot
+
+    Attributes:
+        version (int): The graph version this snapshot shows
+
+    """
+    # nothing can be written, algorithms writing onto weights (i.e. MaxFlow) work on an overlay of it
+    read_only = True
+
+    def __init__(self, base):
+        super().__init__(base)
+        self.version = base.version
+        self.edge_dict = _SnapshotDict(base.edge_dict, self._edge_changes)
+        self.vertex_dict = _SnapshotDict(base.vertex_dict, self._vertex_changes)
+
+    def _preserve(self, edges, vertices, adj):
+        """Record the current state of these edges, vertices and adjacency rows of the base,
+        unless an older state is already recorded. Called by the base before it changes them
+
+        """
+        base = self.base
+        for key in edges:
+            if key not in self._edge_changes:
+                self._edge_changes[key] = base.edge_dict[key] if key in base.edge_dict else _REMOVED
+        for v in vertices:
+            if v not in self._vertex_changes:
+                self._vertex_changes[v] = base.vertex_dict[v] if v in base.vertex_dict else _REMOVED
+        for v in adj:
+            if v not in self._adj:
+                self._adj[v] = dict.fromkeys(base.neighbors(v))
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("graph snapshots are read-only, modify the graph itself or use overlay()")
+
+    _insert_edge = _delete_edge = _read_only
+    add_edge = add_edges = add_vertex = remove_edges = set_weight = _read_only
+
+    def overlay(self):
+        """Return a mutable copy-on-write OverlayGraph on top of this snapshot"""
+        return OverlayGraph(self)
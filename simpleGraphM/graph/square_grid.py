@@ -1,11 +1,18 @@
 import numpy as np
-import matplotlib.pyplot as plt
 
 from .graph import Graph
+from .graph_io import write_graph_file, read_graph_file
+from .memory import memory_report
 from .grid_utils import init_grid
 from .grid_utils import get_index
 from .grid_utils import get_world
 
+# Neighbor offsets (dx, dy) in grid cells, in the order neighbors are returned
+_OFFSETS = {
+    4: ((1, 0), (0, -1), (-1, 0), (0, 1)),
+    8: ((1, 0), (0, -1), (-1, 0), (0, 1), (1, 1), (1, -1), (-1, -1), (-1, 1)),
+}
+
 class SquareGrid(Graph):
     """Class for defining SquareGrid type graphs, to be subclassed to use properly
 
@@ -14,8 +21,12 @@ class SquareGrid(Graph):
         self.yheight 
         self.grid (2D numpy array)
 
+    Parameters:
+        dtype (numpy dtype): Element type of the grid, by default float64 for new grids. A given grid
+            is converted if needed
+
     """
-    def __init__(self, grid=None, grid_dim=None, grid_size=None, neighbor_type=4, init_val=0):
+    def __init__(self, grid=None, grid_dim=None, grid_size=None, neighbor_type=4, init_val=0, dtype=None):
         self.xwidth = grid_dim[1] - grid_dim[0]  + 1
         self.yheight = grid_dim[3] - grid_dim[2] + 1
         self.grid_size = grid_size
@@ -23,9 +34,18 @@ class SquareGrid(Graph):
         self.neighbor_type = neighbor_type
 
         if grid is not None:
-            self.grid = grid
+            self.grid = grid if dtype is None else np.asarray(grid, dtype=dtype)
         else:
-            self.grid = init_grid(grid_dim, grid_size, init_val=init_val)
+            self.grid = init_grid(grid_dim, grid_size, init_val=init_val, dtype=np.float64 if dtype is None else dtype)
+
+    @property
+    def shape(self):
+        """(rows, columns) of the grid"""
+        return self.grid.shape
+
+    def _data(self):
+        """The array actually holding the grid"""
+        return self.grid
 
     def neighbors(self):
         pass
@@ -36,6 +56,50 @@ class SquareGrid(Graph):
     def set_node_value(self, x, y, values):
         self.grid[y][x] = values
 
+    def memory_usage(self, deep=True):
+        """Return the bytes held by the grid (obstacle list and neighbor table), plus a "total" """
+        return memory_report({"grid": self._data(), "obstacles": getattr(self, "obstacles", None),
+                              "neighbor_table": getattr(self, "_table", None)}, deep=deep)
+
+    def save(self, path):
+        """Write the grid to a versioned binary file (see graph_io), which `load` can memory map.
+        Packed grids are written as their bits, never unpacked
+
+        """
+        meta = {"class": type(self).__name__, "grid_dim": list(self.grid_dim), "grid_size": self.grid_size,
+                "neighbor_type": self.neighbor_type}
+        arrays = {"grid": self._data()}
+        if hasattr(self, "storage"):
+            meta["storage"] = self.storage
+            if self.storage == "packed":
+                meta["width"] = self.shape[1]
+                arrays = {"bits": self.bits}
+        write_graph_file(path, "grid", meta, arrays)
+
+    @staticmethod
+    def load(path, mmap=True):
+        """Load a grid written by `save`, as an instance of the class that saved it
+
+        Parameters:
+            path (str): File to read
+            mmap (bool): If True (default), the grid is memory mapped copy-on-write: pages are
+                shared across processes until modified, and changes never reach the file
+
+        """
+        kind, meta, arrays = read_graph_file(path, mmap=mmap, mode="c")
+        if kind != "grid":
+            raise ValueError('{} holds a "{}", not a grid'.format(path, kind))
+        grid_cls = {"SquareGrid": SquareGrid, "OccupancySquareGrid": OccupancySquareGrid}[meta["class"]]
+        kwargs = dict(grid_dim=meta["grid_dim"], grid_size=meta["grid_size"], neighbor_type=meta["neighbor_type"])
+        if "bits" in arrays:
+            return grid_cls._from_bits(arrays["bits"], meta["width"], **kwargs)
+        if "storage" in meta:
+            kwargs["storage"] = meta["storage"]
+        sq = grid_cls(grid=arrays["grid"], **kwargs)
+        # the mapping was made here, the grid can lock it rather than a copy
+        sq._caller_grid = None
+        return sq
+
 class OccupancySquareGrid(SquareGrid):
     """A grid-based occupancy graph class. Physical coordinates origin (0,0) starts at the lower-left corner,
         while the index coordinate origin starts at the top-left. To add obstacles, the user has a couple of options.
@@ -43,12 +107,26 @@ class OccupancySquareGrid(SquareGrid):
         Second, users may pass in a list of obstacles (in physical coordinates) 
         Third, users may call the "set_obstacles(o)" function, where 'o' is a list of obstacles
 
+        Since cells are only 0 or 1, the grid can be stored as uint8 (dtype=np.uint8, 8x smaller than
+        the float64 default), or bit-packed (storage='packed', 64x smaller). Packed grids keep one bit
+        per cell in `bits` (np.packbits along rows), which obstacle tests and updates work on directly;
+        `grid` then returns a read-only unpacked uint8 copy, so edit them through set_obstacles or
+        set_node_value
+
+        `neighbors` caches a free-cell mask of the grid. While it is cached, the grid array (or `bits`)
+        is read-only, so writing to it directly raises a ValueError instead of leaving stale neighbors.
+        Edit cells through set_obstacles or set_node_value, assign a new `grid`, or call clear_cache()
+        before writing to the array. An array given by the caller is never made read-only: the grid
+        switches to a copy of it instead, so later writes to the caller's array no longer reach the grid
+
     Parameters:
         grid (numpy 2d Array): Optional, 0s indicate free space, 1s indicate obstacles
         grid_dim (tuple): In the form of (minX, maxX, minY ,maxY) 
         grid_size (float or int): Discrete size of each grid block (assumed uniform)
         n_type (int): Number of neighbors for each node, 4 or 8
         obstacles (list): Each element is a tuple, representing the obstacles on the graph 
+        dtype (numpy dtype): Element type of a dense grid, see SquareGrid (by default float64)
+        storage (str): 'dense' (default) for a numpy array of dtype, or 'packed' for a bitmap
 
     Attributes:
         obstacles (list): A list of tuples, representing obstacles (x,y)
@@ -58,23 +136,75 @@ class OccupancySquareGrid(SquareGrid):
         grid_dim (tuple): The physical coord limits expressed as (minX, maxX, minY ,maxY) 
         grid_size (float or int): Discrete size of each grid block (assumed uniform)
         neighbor_type (int): Number of neighbors for each node, 4 or 8 
+        storage (str): 'dense' or 'packed'
+        bits (numpy.ndarray): The packed grid, rows x ceil(columns / 8) uint8 (None if dense)
 
     Todo:
         - Allow for grid transformations?
         - Fix height and width
 
     """
-    def __init__(self, grid=None, grid_dim=None, grid_size=None, neighbor_type=4, obstacles=None):
-        super().__init__(grid=grid, grid_dim=grid_dim, grid_size=grid_size, neighbor_type=neighbor_type)
+    # (grid, whether it was locked, key, free-cell mask, offset table) used by neighbors, see `_neighbor_table`
+    _table = None
+    # the caller's own array while the grid still uses it, see `_neighbor_table`
+    _caller_grid = None
+
+    def __init__(self, grid=None, grid_dim=None, grid_size=None, neighbor_type=4, obstacles=None, dtype=None,
+                 storage="dense"):
+        if storage not in ("dense", "packed"):
+            raise ValueError('storage must be "dense" or "packed", not "{}"'.format(storage))
+        # must be known before SquareGrid assigns the grid
+        self.storage = storage
+        self.bits = None
+        if storage == "packed":
+            dtype = np.uint8
+        super().__init__(grid=grid, grid_dim=grid_dim, grid_size=grid_size, neighbor_type=neighbor_type, dtype=dtype)
+        if self._grid is not grid:
+            # made or converted here, not the caller's
+            self._caller_grid = None
         self.obstacles = obstacles
 
-        # if obstacles are defined, add ogm. Else init an empty grid
-        if obstacles is not None and obstacles:
+        # if obstacles are defined, add ogm. An empty grid is made by SquareGrid if none was given
+        if obstacles is not None and len(obstacles) > 0:
             # ogm = OccupancyGridMap(grid_size, grid_dim, obstacles)
             # self.grid = ogm.grid 
             self.set_obstacles(obstacles)
+
+    @property
+    def grid(self):
+        if self.storage == "packed":
+            grid = np.unpackbits(self.bits, axis=1, count=self._width)
+            grid.flags.writeable = False
+            return grid
+        return self._grid
+
+    @grid.setter
+    def grid(self, grid):
+        self.clear_cache()
+        if self.storage == "packed":
+            grid = np.asarray(grid)
+            self.bits = np.packbits(grid != 0, axis=1)
+            self._width = grid.shape[1]
+            self._grid = None
         else:
-            self.grid = init_grid(grid_dim, grid_size, init_val=0)
+            self._grid = self._caller_grid = grid
+
+    @classmethod
+    def _from_bits(cls, bits, width, **kwargs):
+        """Create a packed grid holding `bits` as they are (i.e. memory mapped by `load`), of `width` columns"""
+        sq = cls(grid=np.zeros((0, width), dtype=np.uint8), storage="packed", **kwargs)
+        sq.bits = bits
+        return sq
+
+    @property
+    def shape(self):
+        """(rows, columns) of the grid, without unpacking it"""
+        if self.storage == "packed":
+            return (self.bits.shape[0], self._width)
+        return self._grid.shape
+
+    def _data(self):
+        return self.bits if self.storage == "packed" else self._grid
 
     def set_obstacles(self, obs):
         """ 
@@ -87,11 +217,68 @@ class OccupancySquareGrid(SquareGrid):
             obs = np.array(obs)
 
         obj_inds = get_index(obs[:, 0], obs[:, 1], self.grid_size, self.grid_dim)
-        self.grid[obj_inds[1], obj_inds[0]] = 1.0
+        self.clear_cache()
+        if self.storage == "packed":
+            indx, indy = np.asarray(obj_inds[0]), np.asarray(obj_inds[1])
+            np.bitwise_or.at(self.bits, (indy, indx >> 3), (128 >> (indx & 7)).astype(np.uint8))
+        else:
+            self.grid[obj_inds[1], obj_inds[0]] = 1.0
 
         # Store obs list
         self.obstacles = obs
 
+    def set_node_value(self, x, y, values):
+        self.clear_cache()
+        if self.storage == "packed":
+            if values:
+                self.bits[y, x >> 3] |= 128 >> (x & 7)
+            else:
+                self.bits[y, x >> 3] &= ~(128 >> (x & 7)) & 0xFF
+        else:
+            super().set_node_value(x, y, values)
+
+    def clear_cache(self):
+        """Drop the cached free-cell mask used by `neighbors`, making the grid array writable again
+        (unless it was read-only to begin with). set_obstacles and set_node_value already do it
+
+        """
+        table, self._table = self._table, None
+        if table is not None and table[1]:
+            table[0].flags.writeable = True
+
+    def _neighbor_table(self):
+        """Return the free-cell mask and offset table, rebuilt if the grid, its size or neighbor type changed
+
+        Returns:
+            free (bytes): 1 for free cells, row by row over the grid padded with one blocked cell
+                on each side, so a neighbor is valid iff its byte is 1 (no bounds check needed).
+                For packed grids it is a bitmap as well: cell j is bit 7 - (j & 7) of byte j >> 3
+            width (int): Row length of the padded grid
+            steps (list): (flat index offset, dx, dy in cells, dx, dy in world units) for each neighbor offset
+
+        """
+        key = (self.neighbor_type, self.grid_size, self.grid_dim[0], self.grid_dim[2])
+        table = self._table
+        if table is None or table[0] is not self._data() or table[2] != key:
+            self.clear_cache()
+            h, w = self.shape
+            free = np.zeros((h + 2, w + 2), dtype=np.uint8)
+            free[1:-1, 1:-1] = self.grid == 0
+            free = np.packbits(free) if self.storage == "packed" else free
+            gs = self.grid_size
+            # keep untouched coordinates as they are (x + 0 rather than x + 0.0)
+            steps = [(dy * (w + 2) + dx, dx, dy, dx and dx * gs, dy and dy * gs) for dx, dy in _OFFSETS[self.neighbor_type]]
+            # lock the grid while the mask is cached, so it can not go stale
+            data = self._data()
+            locked = data.flags.writeable
+            if locked and data is self._caller_grid:
+                # never make the caller's own array read-only
+                self._grid = data = data.copy()
+                self._caller_grid = None
+            data.flags.writeable = False
+            table = self._table = (data, locked, key, free.tobytes(), w + 2, steps)
+        return table[3:]
+
     def in_bounds(self, ind, type_='map'):
         """ Test whether a coordinate is inside the grid boundaries
 
@@ -129,10 +316,11 @@ class OccupancySquareGrid(SquareGrid):
         if type_ == 'world':
             # convert world to ind first
             (indx, indy) = get_index(ind[0], ind[1], self.grid_size, self.grid_dim)
-            return self.grid[indy, indx] == 0
         else:
             (indx, indy) = ind
-            return self.grid[indy, indx] == 0
+        if self.storage == "packed":
+            return ((self.bits[indy, indx >> 3] >> (7 - (indx & 7))) & 1) == 0
+        return self._grid[indy, indx] == 0
             
 
     def neighbors(self, node):
@@ -142,26 +330,53 @@ class OccupancySquareGrid(SquareGrid):
             node (tuple): node that we want to find neighbors about
 
         Returns:
-            results (iterable): an iterable generator of neighbors
+            results (list): neighbors that are inside the grid and not obstacles
             
         """
         (x, y) = node
-        if self.neighbor_type == 4:
-            results = [(x + self.grid_size, y), (x, y - self.grid_size),
-                       (x - self.grid_size, y), (x, y + self.grid_size)]
-        elif self.neighbor_type == 8:
-            results = [(x + self.grid_size, y), (x, y - self.grid_size),
-                       (x - self.grid_size, y), (x, y + self.grid_size),
-                       (x + self.grid_size, y + self.grid_size), (x + self.grid_size, y - self.grid_size),
-                       (x - self.grid_size, y - self.grid_size), (x - self.grid_size, y + self.grid_size)]
+        free, width, steps = self._neighbor_table()
+        indx = int(round((x - self.grid_dim[0]) / self.grid_size))
+        indy = int(round((y - self.grid_dim[2]) / self.grid_size))
+        h, w = self.shape
+        if not (0 <= indx < w and 0 <= indy < h):
+            # off the grid, let the bounds checks of the batch version sort it out
+            return [tuple(n) for n in self.neighbors_many([node])[0].tolist()]
+
+        i = (indy + 1) * width + indx + 1
+        if self.storage == "packed":
+            return [(x + dx, y + dy) for step, _, _, dx, dy in steps if free[(i + step) >> 3] & (128 >> ((i + step) & 7))]
+        return [(x + dx, y + dy) for step, _, _, dx, dy in steps if free[i + step]]
+
+    def neighbors_many(self, nodes):
+        """ Compute the neighbors of a batch of nodes in one vectorized pass
 
-        # Only return coordinates that are in range
-        results = filter(lambda x: self.in_bounds(x, type_='world'), results)
+        Parameter:
+            nodes (array-like): n x 2 world coordinates
 
-        # Only return coordinates that are not obstacles
-        results = filter(lambda x: self.not_obstacles(x, type_='world'), results)
+        Returns:
+            neighbors (numpy.ndarray): m x 2 world coordinates of the valid neighbors, grouped by node
+                and in the same order as `neighbors`
+            owners (numpy.ndarray): For each neighbor, the row of its node in nodes
+
+        """
+        nodes = np.asarray(nodes, dtype=float).reshape(-1, 2)
+        free, width, _ = self._neighbor_table()
+        free = np.frombuffer(free, dtype=np.uint8)
+        offsets = np.array(_OFFSETS[self.neighbor_type])
+
+        cells = np.round((nodes - (self.grid_dim[0], self.grid_dim[2])) / self.grid_size).astype(np.intp)
+        cand = cells[:, None, :] + offsets
+        # clipping to the padding keeps out of bounds candidates blocked
+        h, w = self.shape
+        j = (np.clip(cand[..., 1], -1, h) + 1) * width + np.clip(cand[..., 0], -1, w) + 1
+        if self.storage == "packed":
+            valid = (free[j >> 3] >> (7 - (j & 7))) & 1
+        else:
+            valid = free[j]
 
-        return results
+        owners, k = np.nonzero(valid)
+        neighbors = nodes[owners] + offsets[k] * self.grid_size
+        return neighbors, owners
 
     # Cost of moving from one node to another (edge cost)
     def cost(self, from_node, to_node):
@@ -174,6 +389,8 @@ class OccupancySquareGrid(SquareGrid):
 
     def show_grid(self):
         """A method to display the current occupancy grid"""
+        # imported here so headless users of the graphs never pay for matplotlib
+        import matplotlib.pyplot as plt
 
         # Get grid dims
         minX, maxX, minY, maxY = self.grid_dim
@@ -0,0 +1,73 @@
+import numpy as np
+
+class VertexTable:
+    """Interns vertex keys (strings, tuples, any hashable) as dense integer ids 0..n-1 and back.
+    Algorithms can then keep their per-vertex state in arrays or int-keyed dicts and translate
+    keys only at the API boundary, instead of re-hashing keys in the hot loop
+
+    Usually obtained with `graph.vertex_table()`. Ids are stable: they are never reused or
+    renumbered, even if a vertex is later removed from the graph
+
+    Example:
+        table = genG.vertex_table()
+        i = table.id('v1')
+        table.key(i)                  # 'v1'
+        table.ids(['v1', 'v2'])       # numpy array of ids
+
+    Parameters:
+        keys (iter): Keys to intern, in id order
+        index (dict): Optional key -> id mapping already covering `keys`, which is then used as is
+        frozen (bool): If True, interning a new key raises KeyError (by default False)
+
+    """
+    def __init__(self, keys=(), index=None, frozen=False):
+        self.frozen = False
+        if index is None:
+            self._keys = []
+            self._ids = {}
+            for k in keys:
+                self.intern(k)
+        else:
+            self._keys = keys
+            self._ids = index
+        self.frozen = frozen
+
+    def intern(self, key):
+        """Return the id of key, giving it the next free id if it is new"""
+        i = self._ids.get(key)
+        if i is None:
+            if self.frozen:
+                raise KeyError(key)
+            i = len(self._keys)
+            self._ids[key] = i
+            self._keys.append(key)
+        return i
+
+    def id(self, key):
+        """Return the id of key, raises KeyError if it was never interned"""
+        return self._ids[key]
+
+    def key(self, i):
+        """Return the key with id i"""
+        k = self._keys[i]
+        return k.item() if isinstance(k, np.generic) else k
+
+    def ids(self, keys):
+        """Return the ids of many keys as a numpy int64 array"""
+        ids = self._ids
+        return np.fromiter((ids[k] for k in keys), dtype=np.int64)
+
+    def keys(self, ids):
+        """Return the keys of many ids as a list"""
+        key = self.key
+        return [key(i) for i in ids]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def __iter__(self):
+        for i in range(len(self._keys)):
+            yield self.key(i)
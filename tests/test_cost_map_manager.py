@@ -0,0 +1,121 @@
+import unittest
+import numpy as np
+
+from simpleGraphM.graph.graph_manager import CostMapManager
+from simpleGraphM.graph.memory import peak_memory
+
+class TestCostMapManager(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.a = rng.integers(0, 5, (50, 60)).astype(float)
+        self.b = rng.integers(0, 5, (50, 60)).astype(float)
+        self.cm = CostMapManager()
+        self.cm.add_layer(self.a, "a")
+        self.cm.add_layer(self.b, "b", weight=2)
+
+    def expected(self):
+        return sum(self.cm.weights[n] * g for n, g in self.cm.layers.items())
+
+    def test_weighted_total(self):
+        total = self.cm.return_total_map()
+        np.testing.assert_allclose(total, self.a + 2 * self.b)
+        # cached: the same array, and read-only
+        self.assertIs(self.cm.return_total_map(), total)
+        self.assertRaises(ValueError, total.__setitem__, (0, 0), 1)
+
+        self.cm.set_weight("a", 3)
+        np.testing.assert_allclose(self.cm.return_total_map(), self.expected())
+        self.cm.add_layer(np.ones((50, 60)), "c")
+        np.testing.assert_allclose(self.cm.return_total_map(), self.expected())
+        self.cm.delete_layer("b")
+        np.testing.assert_allclose(self.cm.return_total_map(), self.expected())
+
+    def test_incremental_updates(self):
+        total = self.cm.return_total_map()
+
+        # a new array differing in a rectangle
+        b2 = self.b.copy()
+        b2[10:20, 30:40] += 7
+        self.cm.update_layer(b2, "b", region=np.s_[10:20, 30:40])
+        np.testing.assert_allclose(self.cm.return_total_map(), self.expected())
+
+        # in place changes
+        self.a[5:8, 0:3] = 9
+        self.cm.mark_dirty("a", np.s_[5:8, 0:3])
+        np.testing.assert_allclose(self.cm.return_total_map(), self.expected())
+        self.assertIs(self.cm.return_total_map(), total)
+
+        # steady state calls allocate nothing sizeable
+        _, peak = peak_memory(self.cm.return_total_map)
+        self.assertLess(peak, total.nbytes / 10)
+
+    def test_update_region(self):
+        total = self.cm.return_total_map()
+        self.cm.update_region("b", np.s_[10:20, 30:40], 7)
+        self.assertTrue((self.b[10:20, 30:40] == 7).all())
+        np.testing.assert_allclose(self.cm.return_total_map(), self.expected())
+        self.assertIs(self.cm.return_total_map(), total)
+
+        # only the layer written is re-read over the rectangle
+        self.cm.layers["a"] = np.full_like(self.a, np.nan)
+        self.cm.update_region("b", np.s_[0:5, 0:5], np.arange(25).reshape(5, 5))
+        self.cm.layers["a"] = self.a
+        np.testing.assert_allclose(self.cm.return_total_map(), self.expected())
+
+        # unsigned layers, without wrapping around
+        cm = CostMapManager()
+        cm.add_layer(np.full((4, 4), 200, dtype=np.uint8), "x")
+        cm.add_layer(np.full((4, 4), 100, dtype=np.uint8), "y", weight=2)
+        cm.return_total_map()
+        cm.update_region("y", np.s_[1:3, 1:3], 0)
+        cm.update_region("x", np.s_[0:2, 0:2], 255)
+        np.testing.assert_array_equal(cm.return_total_map(), [[455, 455, 400, 400], [455, 255, 200, 400],
+                                                              [400, 200, 200, 400], [400, 400, 400, 400]])
+
+        # a failed write leaves the total as it was
+        cm.layers["x"].flags.writeable = False
+        self.assertRaises(ValueError, cm.update_region, "x", np.s_[0:1, 0:1], 0)
+        self.assertEqual(cm.return_total_map()[0, 0], 455)
+
+    def test_integer_layers(self):
+        cm = CostMapManager()
+        cm.add_layer(np.ones((3, 3), dtype=int), "x")
+        cm.add_layer(np.ones((3, 3), dtype=int), "y")
+        total = cm.return_total_map()
+        self.assertEqual(total.dtype.kind, "i")
+        self.assertEqual(total.sum(), 18)
+
+        # switching to floats rebuilds the total
+        cm.update_layer(np.full((3, 3), 0.5), "y")
+        np.testing.assert_allclose(cm.return_total_map(), np.full((3, 3), 1.5))
+
+    def test_unsigned_layers(self):
+        cm = CostMapManager()
+        cm.add_layer(np.full((4, 4), 200, dtype=np.uint8), "x")
+        cm.add_layer(np.full((4, 4), 100, dtype=np.uint8), "y")
+        # summed like np.sum does, without wrapping around
+        total = cm.return_total_map()
+        self.assertEqual(total.dtype, np.uint64)
+        np.testing.assert_array_equal(total, 300)
+
+        y = cm.layers["y"].copy()
+        y[0:2, 0:2] = 50
+        cm.update_layer(y, "y", region=np.s_[0:2, 0:2])
+        self.assertEqual(total[0, 0], 250)
+        self.assertEqual(total[3, 3], 300)
+
+        cm.add_layer(np.full((4, 4), 255, dtype=np.uint8), "z", weight=3)
+        np.testing.assert_array_equal(cm.return_total_map()[3, 3], 300 + 765)
+        cm.delete_layer("z")
+        cm.delete_layer("x")
+        np.testing.assert_array_equal(cm.return_total_map(), cm.layers["y"])
+        self.assertIs(cm.return_total_map(), total)
+
+        # a negative weight moves the total to floats
+        cm.add_layer(np.ones((4, 4), dtype=np.uint8), "w", weight=-1)
+        self.assertEqual(cm.return_total_map().dtype.kind, "f")
+        self.assertEqual(cm.return_total_map()[3, 3], 99)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import numpy as np
+
+from simpleGraphM.graph import GraphFactory, GenericGraph, CSRGraph
+from simpleGraphM.algorithms.search import BestFirstSearch, BreadthFirstSearch
+from simpleGraphM.algorithms.flow import MaxFlow
+
+class TestCSRGraph(unittest.TestCase):
+
+    def test_freeze_generic_graph(self):
+        edgeDict = {('v1','v2'): 1,
+                    ('v2','v3'): 2,
+                    ('v3','v4'): 1,
+                    ('v1','v4'): 5,
+                    ('v4','v5'): 1}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, vertex_dict={'v6': 3}, graph_type="directed")
+        csrG = genG.freeze()
+
+        self.assertTrue(isinstance(csrG, CSRGraph))
+        self.assertEqual(csrG.edge_count(), genG.edge_count())
+        self.assertEqual(csrG.node_count(), genG.node_count())
+
+        # same neighbors and costs as the generic graph
+        for v in genG.get_vertices():
+            self.assertEqual(set(csrG.neighbors(v)), set(genG.neighbors(v)))
+        for e, w in edgeDict.items():
+            self.assertEqual(csrG.cost(*e), w)
+        self.assertEqual(csrG.cost('v6'), 3)
+        self.assertRaises(KeyError, csrG.cost, 'v2', 'v1')
+
+        # thawing gives back an equivalent generic graph
+        self.assertEqual(csrG.thaw().edge_dict, genG.edge_dict)
+
+    def test_search_on_csr_graph(self):
+        edgeDict = {('v1','v2'): 1,
+                    ('v2','v3'): 2,
+                    ('v3','v4'): 1,
+                    ('v1','v4'): 5,
+                    ('v4','v5'): 1}
+        csrG = GraphFactory.create_graph("CSR", edge_dict=edgeDict, graph_type="undirected")
+
+        parent, g = BestFirstSearch(csrG, 'v1', 'v5').run()
+        self.assertEqual(g['v5'], 5)
+
+        bfs = BreadthFirstSearch(csrG, start='v1', goal='v5')
+        bfs.run()
+        self.assertEqual(bfs.g['v5'], 2)
+
+    def test_search_matches_generic(self):
+        # timings are in benchmarks/csr_search.py
+        rng = np.random.RandomState(0)
+        n, m = 5000, 25000
+        src, dst, w = rng.randint(0, n, m), rng.randint(0, n, m), rng.rand(m)
+        genG = GenericGraph.from_arrays(src, dst, w, num_vertices=n)
+        graphs = [genG.freeze(), CSRGraph.from_arrays(src, dst, w, num_vertices=n)]
+
+        expected = BestFirstSearch(genG, 0, heuristic_type=None).run()[1]
+        for G in graphs:
+            self.assertEqual(BestFirstSearch(G, 0, heuristic_type=None).run()[1], expected)
+            # decoded rows are bounded, least recently used first out
+            self.assertEqual(len(G._rows), G.max_rows)
+
+        G = graphs[1]
+        G.max_rows = 10
+        G.clear_cache()
+        self.assertEqual(BestFirstSearch(G, 0, heuristic_type=None).run()[1], expected)
+        self.assertEqual(len(G._rows), 10)
+        G.neighbors(1)
+        self.assertEqual(list(G._rows)[-1], 1)
+
+        # in-memory graphs map keys with a dict, not by binary search
+        self.assertIsInstance(G._index, dict)
+
+    def test_max_flow_on_csr_graph(self):
+        edgeDict = {('s','1'): {"cap": 3},
+                    ('s','2'): {"cap": 2},
+                    ('1','2'): {"cap": 5},
+                    ('1','t'): {"cap": 2},
+                    ('2','t'): {"cap": 3},
+                    }
+        csrG = GraphFactory.create_graph("CSR", edge_dict=edgeDict)
+        self.assertEqual(csrG.cost('s', '1', name="cap"), 3)
+
+        mf = MaxFlow(csrG, source='s', sink='t')
+        mf.run()
+        self.assertEqual(mf.maxFlowVal, 5)
+        self.assertEqual(mf.maxFlowVal, mf.minCutVal)
+
+    def test_attribute_columns_and_cost_many(self):
+        edgeDict = {('s','1'): {"cap": 3, "flow": 0},
+                    ('s','2'): {"cap": 2, "flow": 1},
+                    ('1','2'): {"cap": 5, "flow": 0},
+                    ('1','t'): {"cap": 2, "flow": 2},
+                    ('2','t'): {"cap": 3, "flow": 0},
+                    }
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict)
+        csrG = genG.freeze()
+
+        # flat multi-weighted edges are stored column-wise
+        self.assertEqual(set(csrG.edge_attrs), set(["cap", "flow"]))
+        self.assertIsNone(csrG.weights)
+        self.assertEqual(csrG.cost('1', 't', name="flow"), 2)
+        self.assertEqual(csrG.cost('1', 't', name=["cap"]), 2)
+        self.assertEqual(csrG.cost('1', 't'), {"cap": 2, "flow": 2})
+
+        edges = list(edgeDict)
+        for g in (genG, csrG):
+            cap = g.cost_accessor("cap")
+            self.assertEqual([cap(*e) for e in edges], [edgeDict[e]["cap"] for e in edges])
+            self.assertEqual(g.cost_many(edges, name="flow").tolist(), [edgeDict[e]["flow"] for e in edges])
+        self.assertRaises(KeyError, csrG.cost_many, [('t', 's')], name="cap")
+        self.assertRaises(KeyError, csrG.cost, 't', 's', name="cap")
+        self.assertRaises(KeyError, csrG.cost_accessor("cap"), 't', 's')
+
+        # named lookups take the scalar fast path: once a row is decoded, they are list reads
+        # of its cached values, without touching the numpy columns
+        cap = csrG.cost_accessor("cap")
+        expected = [csrG.cost(*e, name="cap") for e in edges]
+        columns, csrG.edge_attrs = csrG.edge_attrs, dict.fromkeys(csrG.edge_attrs)
+        self.assertEqual([csrG.cost(*e, name="cap") for e in edges], expected)
+        self.assertEqual([cap(*e) for e in edges], expected)
+        self.assertEqual(csrG.cost('1', 't', name=["cap"]), 2)
+        csrG.edge_attrs = columns
+
+        # columns can also be given directly
+        csrG = CSRGraph.from_arrays(np.array([0, 1]), np.array([1, 2]), {"cap": np.array([4, 5])})
+        self.assertEqual(csrG.cost_many([(1, 2), (0, 1)], name="cap").tolist(), [5, 4])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from simpleGraphM.graph import GraphFactory, DiskGraph
+from simpleGraphM.algorithms.search import BestFirstSearch
+
+class TestDiskGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "graph.sgm")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lookups_match_csr_graph(self):
+        edgeDict = {(i, j): i + j for i in range(50) for j in (i + 1, i + 7) if j < 50}
+        csrG = GraphFactory.create_graph("CSR", edge_dict=edgeDict, graph_type="undirected")
+        csrG.save(self.path)
+
+        diskG = DiskGraph(self.path, page_size=4, max_pages=3)
+        for v in csrG.get_vertices():
+            self.assertEqual(diskG.neighbors(v), csrG.neighbors(v))
+            for w in csrG.neighbors(v):
+                self.assertEqual(diskG.cost(v, w), csrG.cost(v, w))
+        self.assertRaises(KeyError, diskG.cost, 0, 30)
+        self.assertEqual(diskG.neighbors(100), [])
+
+        # only the hottest pages are kept
+        self.assertLessEqual(len(diskG._pages), 3)
+        self.assertGreater(diskG.hits, 0)
+
+        # accessors and batched costs go through the pages too, never the rows of CSRGraph
+        get = diskG.cost_accessor()
+        edges = [(v, w) for v in csrG.get_vertices() for w in csrG.neighbors(v)]
+        self.assertEqual([get(*e) for e in edges], [csrG.cost(*e) for e in edges])
+        self.assertEqual(diskG.cost_many(edges).tolist(), csrG.cost_many(edges).tolist())
+        self.assertEqual(diskG._edge_pos(3, 10), csrG._edge_pos(3, 10))
+        self.assertEqual(len(diskG._rows), 0)
+        self.assertLessEqual(len(diskG._pages), 3)
+
+    def test_search_on_disk_graph(self):
+        edgeDict = {('v1','v2'): 1,
+                    ('v2','v3'): 2,
+                    ('v3','v4'): 1,
+                    ('v1','v4'): 5,
+                    ('v4','v5'): 1}
+        GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected").save(self.path)
+
+        diskG = DiskGraph(self.path, page_size=2, max_pages=1)
+        parent, g = BestFirstSearch(diskG, 'v1', 'v5').run()
+        self.assertEqual(g['v5'], 5)
+        self.assertEqual(len(diskG._pages), 1)
+
+    def test_column_weights(self):
+        edgeDict = {('s','1'): {"cap": 3, "flow": 0},
+                    ('1','t'): {"cap": 2, "flow": 1}}
+        GraphFactory.create_graph("Generic", edge_dict=edgeDict).save(self.path)
+
+        diskG = DiskGraph.load(self.path)
+        self.assertEqual(diskG.cost('1', 't'), {"cap": 2, "flow": 1})
+        self.assertEqual(diskG.cost('s', '1', name="cap"), 3)
+        self.assertEqual(diskG.cost_accessor("cap")('1', 't'), 2)
+        self.assertEqual(diskG.cost_accessor(["flow"])('1', 't'), 1)
+        self.assertEqual(len(diskG._rows), 0)
+
+if __name__ == "__main__":
+    unittest.main()
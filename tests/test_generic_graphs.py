@@ -1,6 +1,7 @@
 import unittest
 
-from simpleGraphM.graph import GraphFactory
+from simpleGraphM.graph import GraphFactory, GenericGraph
+from simpleGraphM.algorithms.search import BestFirstSearch
 
 class TestGenericGraph(unittest.TestCase):
 
@@ -365,6 +366,10 @@ class TestGenericGraph(unittest.TestCase):
         # Try getting only level 1 as a list
         self.assertEqual(genG.cost('r', 'p', name=["level1"]), {'level2': {'level3': 300}})
 
+        # precompiled accessors resolve the same names
+        self.assertEqual(genG.cost_accessor(["level1", "level2", "level3"])('r', 'p'), 300)
+        self.assertEqual(genG.cost_accessor("cap")('q', 'd'), 6)
+
         # checking neighbor of 
         self.assertEqual(set(genG.neighbors('r')), set(['p', 'a', 'q']) )
         self.assertEqual(set(genG.neighbors('q')), set(['p', 'b', 'd']) )
@@ -478,5 +483,229 @@ class TestGenericGraph(unittest.TestCase):
 
         pass
 
+    def test_generic_graph_bulk_add_remove_edges(self):
+        genG = GraphFactory.create_graph("Generic", edge_dict=None, vertex_dict=None, graph_type="directed")
+
+        # pairs, triples and dicts are all accepted
+        genG.add_edges([(0, 1), (1, 2)], weight=1)
+        genG.add_edges([(2, 3, 5), (3, 0, 7)])
+        genG.add_edges({(0, 2): 9})
+        self.assertEqual(genG.edge_count(), 5)
+        self.assertEqual(genG.cost(2, 3), 5)
+        self.assertEqual(genG.cost(0, 1), 1)
+        self.assertEqual(set(genG.neighbors(0)), set([1, 2]))
+        self.assertEqual(set(genG.get_vertices()), set([0, 1, 2, 3]))
+
+        # replacing an edge does not duplicate adjacency
+        genG.add_edges([(0, 1, 4)])
+        self.assertEqual(list(genG.neighbors(0)), [1, 2])
+        self.assertEqual(genG.cost(0, 1), 4)
+
+        # neighbors are a plain list, safe to index and to keep while the graph changes
+        self.assertEqual(genG.neighbors(0)[0], 1)
+        self.assertEqual(genG.neighbors(0) + genG.neighbors(1), [1, 2, 2])
+        for v in genG.neighbors(0):
+            genG.remove_edges([(0, v)])
+            genG.add_edges([(0, v, 4)])
+
+        genG.remove_edges([(0, 1), (3, 0)])
+        self.assertEqual(set(genG.neighbors(0)), set([2]))
+        self.assertEqual(set(genG.neighbors(3)), set())
+        self.assertRaises(KeyError, genG.remove_edges, [(0, 1)])
+
+        # undirected graphs keep both directions in sync
+        undG = GraphFactory.create_graph("Generic", edge_dict=None, graph_type="undirected")
+        undG.add_edges([('a', 'b', 1), ('b', 'c', 2)])
+        self.assertEqual(undG.cost('b', 'a'), 1)
+        self.assertEqual(set(undG.neighbors('b')), set(['a', 'c']))
+        undG.remove_edges([('c', 'b')])
+        self.assertEqual(set(undG.neighbors('b')), set(['a']))
+        self.assertRaises(KeyError, undG.cost, 'b', 'c')
+
+    def test_generic_graph_predecessors(self):
+        edgeDict = {('a','b'): 1,
+                    ('a','c'): 1,
+                    ('b','c'): 1,
+                    ('c','d'): 1}
+        for eager in (True, False):
+            genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="directed", predecessor_index=eager)
+            self.assertEqual(set(genG.predecessors('c')), set(['a', 'b']))
+            self.assertEqual(genG.in_degree('a'), 0)
+
+            # the index follows edge insertions and removals
+            genG.add_edges([('d', 'a', 1), ('e', 'c', 1)])
+            genG.remove_edges([('a', 'c')])
+            self.assertEqual(set(genG.predecessors('c')), set(['b', 'e']))
+            self.assertEqual(set(genG.predecessors('a')), set(['d']))
+            self.assertEqual(genG.in_degree('e'), 0)
+            self.assertEqual(genG.predecessors('z'), [])
+
+        undG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected")
+        self.assertEqual(set(undG.predecessors('c')), set(['a', 'b', 'd']))
+
+    def test_generic_graph_remove_vertices_cascades(self):
+        edgeDict = {('a','b'): 1,
+                    ('b','c'): 1,
+                    ('c','b'): 1,
+                    ('d','b'): 1,
+                    ('b','b'): 1,
+                    ('c','d'): 1}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="directed")
+        genG.remove_vertices(['b'])
+
+        # every edge touching 'b' is gone
+        self.assertEqual(set(genG.edge_dict), set([('c','d')]))
+        self.assertEqual(set(genG.get_vertices()), set(['a', 'c', 'd']))
+        self.assertEqual(set(genG.neighbors('a')), set())
+        self.assertEqual(set(genG.predecessors('c')), set())
+        self.assertEqual(genG.neighbors('b'), [])
+        self.assertRaises(KeyError, genG.remove_vertices, ['b'])
+
+        undG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected")
+        undG.remove_vertices(['c'])
+        self.assertEqual(set(undG.neighbors('b')), set(['a', 'd', 'b']))
+        self.assertRaises(KeyError, undG.cost, 'd', 'c')
+        self.assertEqual(undG.edge_count(), 5)
+
+    def test_generic_graph_from_arrays(self):
+        import numpy as np
+        src = np.array([0, 0, 1, 2, 3, 0])
+        dst = np.array([1, 2, 3, 3, 4, 1])
+        weight = np.array([1., 2., 3., 4., 5., 6.])
+
+        # duplicated edge (0, 1) keeps the last weight, like a dict update
+        for frozen in (False, True):
+            genG = GenericGraph.from_arrays(src, dst, weight, frozen=frozen)
+            self.assertEqual(genG.edge_count(), 5)
+            self.assertEqual(genG.cost(0, 1), 6.)
+            self.assertEqual(genG.cost(2, 3), 4.)
+            self.assertEqual(set(genG.neighbors(0)), set([1, 2]))
+
+        # dense matrix, vertex 5 is isolated but still part of the graph
+        mat = np.zeros((6, 6))
+        mat[0, 1], mat[1, 2], mat[2, 0] = 16, 10, 4
+        for frozen in (False, True):
+            genG = GenericGraph.from_dense(mat, graph_type="undirected", frozen=frozen)
+            self.assertEqual(genG.edge_count(), 6)
+            self.assertEqual(genG.node_count(), 6)
+            self.assertEqual(genG.cost(1, 0), 16)
+
+        # coo triple
+        for frozen in (False, True):
+            genG = GenericGraph.from_sparse((src, dst, weight), frozen=frozen)
+            self.assertEqual(genG.cost(3, 4), 5.)
+
+        # both paths keep every vertex of the matrix shape and default to the same int weights
+        for frozen in (False, True):
+            genG = GenericGraph.from_sparse((src, dst, weight), shape=(7, 7), frozen=frozen)
+            self.assertEqual(genG.node_count(), 7)
+            self.assertEqual(genG.neighbors(6), [])
+            genG = GenericGraph.from_arrays(src, dst, frozen=frozen)
+            self.assertIs(type(genG.cost(0, 1)), int)
+
+        # undirected duplicates, in either direction, are one edge and the last weight wins
+        src, dst, weight = np.array([0, 1, 0, 2]), np.array([1, 0, 1, 2]), np.array([1., 2., 3., 4.])
+        for frozen in (False, True):
+            genG = GenericGraph.from_arrays(src, dst, weight, graph_type="undirected", frozen=frozen)
+            self.assertEqual(genG.cost(0, 1), 3.)
+            self.assertEqual(genG.cost(1, 0), 3.)
+            self.assertEqual(genG.cost(2, 2), 4.)
+            self.assertEqual(genG.edge_count(), 3)
+
+    def test_generic_graph_canonical_undirected(self):
+        edgeDict = {('v1','v2'): {"cap": 1, "flow": 0},
+                    ('v2','v3'): {"cap": 2, "flow": 0},
+                    ('v3','v3'): {"cap": 3, "flow": 0}}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected", canonical=True)
+        mirG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected")
+
+        # one record per edge, but lookups and iteration behave like a mirrored graph
+        self.assertTrue(genG.is_canonical())
+        self.assertEqual(len(genG.edge_dict.records), 3)
+        self.assertEqual(genG.edge_count(), mirG.edge_count())
+        self.assertEqual(set(genG.edge_dict), set(mirG.edge_dict))
+        for v in mirG.get_vertices():
+            self.assertEqual(set(genG.neighbors(v)), set(mirG.neighbors(v)))
+
+        # both directions share the same weight
+        genG.edge_dict[('v2','v1')]["flow"] += 1
+        self.assertEqual(genG.cost('v1', 'v2', name="flow"), 1)
+
+        genG.add_edges([('v3','v1', {"cap": 4, "flow": 0})])
+        self.assertEqual(genG.cost('v1', 'v3', name="cap"), 4)
+        genG.remove_edges([('v2','v1'), ('v3','v3')])
+        self.assertFalse(('v1','v2') in genG.edge_dict)
+        self.assertEqual(len(genG.edge_dict.records), 2)
+        self.assertEqual(genG.edge_count(), 4)
+        self.assertEqual(set(genG.neighbors('v1')), {'v3'})
+
+        # freezing works as for mirrored graphs
+        self.assertEqual(genG.freeze().edge_count(), 4)
+
+    def test_generic_graph_vertex_table(self):
+        edgeDict = {('v1','v2'): 1,
+                    ('v2','v3'): 2,
+                    ('v1','v3'): 5}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="directed")
+        table = genG.vertex_table()
+
+        # dense ids, translated both ways
+        self.assertEqual(sorted(table.id(v) for v in genG.get_vertices()), [0, 1, 2])
+        for v in genG.get_vertices():
+            self.assertEqual(table.key(table.id(v)), v)
+        self.assertEqual(table.keys(table.ids(['v3', 'v1']).tolist()), ['v3', 'v1'])
+        self.assertEqual(set(table.keys(genG.neighbor_ids(genG.vertex_id('v1')))), {'v2', 'v3'})
+
+        # new vertices are interned as they are added, existing ids never change
+        genG.add_edges([('v3','v4')])
+        genG.remove_vertices(['v2'])
+        self.assertEqual(table.id('v4'), 3)
+        self.assertEqual(table.key(1), 'v2')
+        self.assertRaises(KeyError, table.id, 'v5')
+
+        # frozen graphs share their key arrays
+        csrG = genG.freeze()
+        table = csrG.vertex_table()
+        self.assertEqual(table.key(csrG.vertex_id('v4')), 'v4')
+        self.assertRaises(KeyError, table.intern, 'v5')
+
+    def test_generic_graph_reorder(self):
+        import random
+        import numpy as np
+        # a 20x20 grid graph with vertices inserted in random order
+        cells = [(x, y) for x in range(20) for y in range(20)]
+        random.Random(0).shuffle(cells)
+        edgeDict = {}
+        for x, y in cells:
+            for nb in ((x+1, y), (x, y+1)):
+                if nb[0] < 20 and nb[1] < 20:
+                    edgeDict[((x, y), nb)] = 1
+
+        def mean_id_distance(genG):
+            csrG = genG.freeze()
+            src = np.repeat(np.arange(csrG.node_count()), np.diff(csrG.indptr))
+            return np.abs(src - csrG.indices).mean()
+
+        for method in ("rcm", "bfs", "dfs", "hilbert"):
+            genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected")
+            before = mean_id_distance(genG)
+            order = genG.reorder(method)
+            self.assertEqual(sorted(order), sorted(cells))
+            self.assertEqual(list(genG.vertex_dict), order)
+            self.assertLess(mean_id_distance(genG), before / 4)
+
+            # same graph, just renumbered
+            parent, g = BestFirstSearch(genG, (0, 0), (19, 19)).run()
+            self.assertEqual(g[(19, 19)], 38)
+
+        # relabeling replaces keys by their new ids
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="directed")
+        order = genG.reorder("rcm", relabel=True)
+        self.assertEqual(sorted(genG.vertex_dict), list(range(400)))
+        i, j = order.index((3, 4)), order.index((3, 5))
+        self.assertEqual(genG.cost(i, j), 1)
+        self.assertTrue(i in genG.predecessors(j))
+        self.assertRaises(ValueError, genG.reorder, "spectral")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
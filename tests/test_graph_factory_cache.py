@@ -0,0 +1,117 @@
+import unittest
+import numpy as np
+
+from simpleGraphM.graph import GraphFactory
+
+class TestGraphFactoryCache(unittest.TestCase):
+
+    def setUp(self):
+        GraphFactory.invalidate()
+
+    def tearDown(self):
+        GraphFactory.invalidate()
+
+    def test_cached_generic_graph(self):
+        edgeDict = {('v1','v2'): 1, ('v2','v3'): 2}
+        info = GraphFactory.cache_info()
+        genG = GraphFactory.create_graph("Generic", cache=True, edge_dict=edgeDict, graph_type="undirected")
+        again = GraphFactory.create_graph("Generic", cache=True, edge_dict=dict(edgeDict), graph_type="undirected")
+        self.assertIs(genG, again)
+        self.assertEqual(GraphFactory.cache_info()["hits"], info["hits"] + 1)
+        self.assertEqual(GraphFactory.cache_info()["misses"], info["misses"] + 1)
+
+        # different content or type gives a different graph
+        other = GraphFactory.create_graph("Generic", cache=True, edge_dict={('v1','v2'): 5, ('v2','v3'): 2}, graph_type="undirected")
+        self.assertIsNot(other, genG)
+        self.assertIsNot(GraphFactory.create_graph("CSR", cache=True, edge_dict=edgeDict, graph_type="undirected"), genG)
+        # uncached creation is unaffected
+        self.assertIsNot(GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected"), genG)
+
+        # shared instances are read-only
+        self.assertRaises(TypeError, genG.add_edges, [('v3','v4')])
+        self.assertRaises(TypeError, genG.remove_edges, [('v1','v2')])
+        self.assertRaises(TypeError, genG.set_weight, 'v1', 'v2', value=3)
+        self.assertEqual(genG.overlay().edge_count(), 4)
+
+        GraphFactory.invalidate("Generic", edge_dict=edgeDict, graph_type="undirected")
+        self.assertIsNot(GraphFactory.create_graph("Generic", cache=True, edge_dict=edgeDict, graph_type="undirected"), genG)
+
+    def test_cached_graph_is_not_mutated(self):
+        from simpleGraphM.algorithms.flow import MaxFlow
+        edgeDict = {('s','1'): {'cap': 3}, ('1','t'): {'cap': 2}, ('s','t'): {'cap': 1}}
+        genG = GraphFactory.create_graph("Generic", cache=True, edge_dict=edgeDict)
+
+        # the caller's dicts are copied
+        edgeDict[('s','1')]['cap'] = 7
+        self.assertEqual(genG.edge_dict[('s','1')], {'cap': 3})
+
+        mf = MaxFlow(genG, 's', 't')
+        mf.run()
+        self.assertEqual(mf.maxFlowVal, 3)
+        hit = GraphFactory.create_graph("Generic", cache=True, edge_dict={('s','1'): {'cap': 3}, ('1','t'): {'cap': 2}, ('s','t'): {'cap': 1}})
+        self.assertIs(hit, genG)
+        self.assertEqual(hit.edge_dict, {('s','1'): {'cap': 3}, ('1','t'): {'cap': 2}, ('s','t'): {'cap': 1}})
+
+        # views write onto the shared weights, so they are read-only as well and MaxFlow overlays them
+        view = genG.subgraph(['s', '1', 't'])
+        self.assertTrue(view.read_only)
+        mf = MaxFlow(view, 's', 't')
+        mf.run()
+        self.assertEqual(mf.maxFlowVal, 3)
+        mf = MaxFlow(genG.overlay(), 's', 't')
+        mf.run()
+        self.assertEqual(mf.maxFlowVal, 3)
+        self.assertEqual(hit.edge_dict, {('s','1'): {'cap': 3}, ('1','t'): {'cap': 2}, ('s','t'): {'cap': 1}})
+
+        # writes around the graph's API are refused too, weights included, copies are writable
+        self.assertRaises(TypeError, genG.edge_dict.__setitem__, ('s','1'), 5)
+        self.assertRaises(TypeError, genG.edge_dict[('s','1')].__setitem__, 'cap', 99)
+        self.assertRaises(TypeError, genG.vertex_dict.pop, 's')
+        copied = GraphFactory.create_graph("Generic", edge_dict=genG.edge_dict)
+        copied.set_weight('s', '1', value=5)
+        self.assertEqual(genG.cost('s', '1'), {'cap': 3})
+
+        nested = GraphFactory.create_graph("Generic", cache=True, edge_dict={(1, 2): {'a': [1, {'x': 2}]}}, graph_type="undirected")
+        self.assertRaises(TypeError, nested.edge_dict[(1, 2)]['a'].append, 3)
+        self.assertRaises(TypeError, nested.edge_dict[(1, 2)]['a'][1].update, x=3)
+        self.assertIs(nested.edge_dict[(2, 1)], nested.edge_dict[(1, 2)])
+        ovG = nested.overlay()
+        ovG.edge_dict[(1, 2)]['b'] = 0
+        self.assertEqual(ovG.cost(2, 1), {'a': [1, {'x': 2}], 'b': 0})
+        self.assertEqual(nested.cost(1, 2), {'a': [1, {'x': 2}]})
+
+        undirected = GraphFactory.create_graph("Generic", cache=True, edge_dict={(1, 2): 1}, graph_type="undirected", canonical=True)
+        self.assertTrue(undirected.is_canonical())
+        self.assertRaises(TypeError, undirected.edge_dict.__setitem__, (2, 1), 5)
+
+        self.assertRaises(ValueError, GraphFactory.create_graph, "Generic", cache=True, edge_dict={(1, 2): 1}, deep_copy=False)
+
+    def test_cached_grid(self):
+        obstacles = np.array([(1, 1), (2, 3)])
+        kwargs = dict(grid_dim=[0, 9, 0, 9], grid_size=1, neighbor_type=4)
+        sq = GraphFactory.create_graph("OccupancySquareGrid", cache=True, obstacles=obstacles, **kwargs)
+        self.assertIs(GraphFactory.create_graph("OccupancySquareGrid", cache=True, obstacles=obstacles.copy(), **kwargs), sq)
+        self.assertIsNot(GraphFactory.create_graph("OccupancySquareGrid", cache=True, obstacles=obstacles[:1], **kwargs), sq)
+        self.assertRaises(ValueError, sq.set_obstacles, [(4, 4)])
+
+        # the caller's own array stays writable
+        grid = np.zeros((10, 10))
+        GraphFactory.create_graph("OccupancySquareGrid", cache=True, grid=grid, **kwargs)
+        grid[0, 0] = 1
+
+        self.assertRaises(TypeError, GraphFactory.cache_key, "Generic", edge_dict=object())
+
+    def test_cache_is_bounded(self):
+        size = GraphFactory.cache_size
+        try:
+            GraphFactory.cache_size = 3
+            graphs = [GraphFactory.create_graph("Generic", cache=True, edge_dict={(0, i): 1}) for i in range(5)]
+            self.assertEqual(GraphFactory.cache_info()["size"], 3)
+            # the oldest were evicted
+            self.assertIsNot(GraphFactory.create_graph("Generic", cache=True, edge_dict={(0, 0): 1}), graphs[0])
+            self.assertIs(GraphFactory.create_graph("Generic", cache=True, edge_dict={(0, 4): 1}), graphs[4])
+        finally:
+            GraphFactory.cache_size = size
+
+if __name__ == "__main__":
+    unittest.main()
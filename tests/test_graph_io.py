@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from simpleGraphM.graph import GraphFactory, GenericGraph, CSRGraph
+from simpleGraphM.graph.graph_io import load_graph, read_edge_list
+from simpleGraphM.algorithms.search import BestFirstSearch
+
+class TestGraphIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_save_load_generic_graph(self):
+        edgeDict = {('r','p'): {"cap": 6, "flow": 0},
+                    ('r','a'): {"cap": 9, "flow": 1},
+                    ('p','b'): {"cap": 3, "flow": 0},
+                    ('a','b'): {"cap": 2, "flow": 2}}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, vertex_dict={'z': 4}, graph_type="directed")
+        path = os.path.join(self.tmpdir.name, "generic.sgm")
+        genG.save(path)
+
+        for mmap in (True, False):
+            csrG = GenericGraph.load(path, mmap=mmap)
+            self.assertTrue(isinstance(csrG, CSRGraph))
+            self.assertEqual(isinstance(csrG.indices, np.memmap), mmap)
+            self.assertEqual(set(csrG.neighbors('r')), set(['p', 'a']))
+            self.assertEqual(csrG.cost('a', 'b', name="flow"), 2)
+            self.assertEqual(csrG.cost('z'), 4)
+            self.assertEqual(csrG.neighbors('missing'), [])
+            self.assertEqual(csrG.thaw().edge_dict, edgeDict)
+            # memory mapped keys are searched in place, keys read into memory get a dict
+            self.assertEqual(isinstance(csrG._index, dict), not mmap)
+
+    def test_save_load_tuple_keys_and_search(self):
+        edgeDict = {((0, 0), (0, 1)): 1.0,
+                    ((0, 1), (1, 1)): 1.0,
+                    ((0, 0), (1, 1)): 3.0}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected")
+        path = os.path.join(self.tmpdir.name, "tuples.sgm")
+        genG.save(path)
+
+        csrG = load_graph(path)
+        parent, g = BestFirstSearch(csrG, (0, 0), (1, 1)).run()
+        self.assertEqual(g[(1, 1)], 2.0)
+
+        # object weights cannot be written raw
+        genG.add_edge({((0, 0), (2, 2)): {"nested": {"cap": 1}}})
+        self.assertRaises(TypeError, genG.save, path)
+
+    def test_save_load_grid(self):
+        grid_dim = [-5, 5, -5, 5]
+        sq = GraphFactory.create_graph("OccupancySquareGrid", grid=None, grid_dim=grid_dim, grid_size=1, neighbor_type=8)
+        sq.set_obstacles([(0, y) for y in range(-3, 4)])
+        path = os.path.join(self.tmpdir.name, "grid.sgm")
+        sq.save(path)
+
+        sq2 = load_graph(path)
+        self.assertTrue("OccupancySquareGrid" in str(type(sq2)))
+        self.assertEqual(sq2.grid_dim, grid_dim)
+        self.assertTrue(np.array_equal(sq2.grid, sq.grid))
+        self.assertFalse(sq2.not_obstacles((0, 0), type_='world'))
+        # the mapping is locked in place while neighbors are cached, not copied
+        self.assertEqual(sq2.neighbors((-5, -5)), sq.neighbors((-5, -5)))
+        self.assertIsInstance(sq2.grid, np.memmap)
+
+        # writes to a loaded grid stay private
+        sq2.set_obstacles([(4, 4)])
+        self.assertTrue(load_graph(path).not_obstacles((4, 4), type_='world'))
+
+    def test_read_edge_list_in_chunks(self):
+        path = os.path.join(self.tmpdir.name, "edges.csv")
+        with open(path, "w") as f:
+            f.write("src,dst,cap,cost\n")
+            f.write("# a comment\n")
+            for i in range(25):
+                f.write("{},{},{},{}\n".format(i, i + 1, i * 2, 0.5))
+
+        # chunks smaller than the file
+        genG = GenericGraph.from_edge_list(path, chunk_size=4, skip_header=True, vertex_type=int,
+                                           columns={"cap": 2, "cost": 3})
+        self.assertEqual(genG.edge_count(), 25)
+        self.assertEqual(genG.cost(3, 4), {"cap": 6.0, "cost": 0.5})
+
+        # appending whitespace lines and plain edge tuples to an existing graph
+        read_edge_list(["100 101 7", "101 102 8"], graph=genG, vertex_type=int, weight_col=2)
+        self.assertEqual(genG.cost(101, 102), 8.0)
+        read_edge_list(iter([('a', 'b', 3), ('b', 'c', 4)]), graph=genG, chunk_size=1)
+        self.assertEqual(genG.cost('b', 'c'), 4)
+        self.assertEqual(genG.edge_count(), 29)
+
+if __name__ == "__main__":
+    unittest.main()
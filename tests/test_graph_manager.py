@@ -0,0 +1,127 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from simpleGraphM.graph import GraphFactory, CSRGraph
+from simpleGraphM.graph.graph_manager import GraphManager
+
+class TestGraphManager(unittest.TestCase):
+
+    def setUp(self):
+        GraphManager.clear()
+        GraphManager.set_memory_budget(None)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        GraphManager.clear()
+        GraphManager.set_memory_budget(None)
+        self.tmp.cleanup()
+
+    def make_graph(self, n):
+        return GraphFactory.create_graph("Generic", edge_dict={(i, i+1): 1 for i in range(n)})
+
+    def test_lazy_loading(self):
+        path = os.path.join(self.tmp.name, "graph.sgm")
+        self.make_graph(10).save(path)
+        loads = []
+        GraphManager.add_layer(path, "file")
+        GraphManager.add_layer(lambda: loads.append(1) or self.make_graph(5), "func")
+        self.assertFalse(GraphManager.is_loaded("file"))
+        self.assertTrue(GraphManager.has_layer("func"))
+
+        self.assertTrue(isinstance(GraphManager.get_layer("file"), CSRGraph))
+        self.assertEqual(GraphManager.get_layer("func").edge_count(), 5)
+        self.assertEqual(GraphManager.get_layer("func").edge_count(), 5)
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(GraphManager.stats(), {"hits": 1, "misses": 2, "evictions": 0, "layers": 2, "loaded": 2})
+        self.assertRaises(AssertionError, GraphManager.add_layer, self.make_graph(1), "file")
+
+    def test_memory_budget_eviction(self):
+        size = self.make_graph(100).memory_usage()["total"]
+        GraphManager.set_memory_budget(int(2.5 * size))
+        GraphManager.add_layer(self.make_graph(100), "pinned")
+        for name in ("a", "b", "c"):
+            GraphManager.add_layer(lambda: self.make_graph(100), name)
+
+        GraphManager.get_layer("a")
+        GraphManager.get_layer("b")
+        # loading c evicts a, the least recently used lazy layer. pinned layers stay
+        GraphManager.get_layer("c")
+        self.assertFalse(GraphManager.is_loaded("a"))
+        self.assertTrue(GraphManager.is_loaded("pinned"))
+        self.assertEqual(GraphManager.stats()["evictions"], 2)
+        self.assertLessEqual(GraphManager.memory_usage()["total"], 2.5 * size)
+
+        # evicted layers are simply loaded again
+        self.assertEqual(GraphManager.get_layer("a").edge_count(), 100)
+        self.assertEqual(GraphManager.stats()["misses"], 4)
+
+    def test_concurrent_get_layer_loads_once(self):
+        loads = []
+        def loader():
+            loads.append(1)
+            return self.make_graph(1000)
+        GraphManager.add_layer(loader, "shared")
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(GraphManager.get_layer("shared"))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(loads), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(GraphManager.stats()["hits"] + GraphManager.stats()["misses"], 8)
+
+    def test_publish_keeps_readers_consistent(self):
+        GraphManager.add_layer(self.make_graph(10), "map")
+        self.assertEqual(GraphManager.layer_version("map"), 1)
+        reader = GraphManager.get_layer("map")
+
+        # writers build the next version off to the side
+        version = GraphManager.publish("map", lambda g: GraphFactory.create_graph("Generic", edge_dict={(0, 1): 2}))
+        self.assertEqual(version, 2)
+        with GraphManager.edit_layer("map") as g:
+            g.add_edges([(1, 2, 3)])
+            # not visible until the edit completes
+            self.assertEqual(GraphManager.get_layer("map").edge_count(), 1)
+        self.assertEqual(GraphManager.layer_version("map"), 3)
+        self.assertEqual(GraphManager.get_layer("map").cost(1, 2), 3)
+
+        # the reader still holds the version it started with
+        self.assertEqual(reader.edge_count(), 10)
+
+        # failed edits are not published
+        with self.assertRaises(RuntimeError):
+            with GraphManager.edit_layer("map") as g:
+                g.add_edges([(2, 3)])
+                raise RuntimeError()
+        self.assertEqual(GraphManager.get_layer("map").edge_count(), 2)
+        self.assertEqual(GraphManager.layer_version("map"), 3)
+
+    def test_readers_during_updates(self):
+        GraphManager.add_layer(self.make_graph(50), "map")
+        stop = threading.Event()
+        seen = []
+
+        def read():
+            while not stop.is_set():
+                g = GraphManager.get_layer("map")
+                # every published version is complete: a path 0..n
+                n = g.edge_count()
+                seen.append(all(g.cost(i, i+1) == 1 for i in range(n)))
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for t in readers:
+            t.start()
+        for n in range(51, 80):
+            GraphManager.publish("map", lambda g, n=n: self.make_graph(n))
+        stop.set()
+        for t in readers:
+            t.join()
+        self.assertTrue(seen and all(seen))
+        self.assertEqual(GraphManager.get_layer("map").edge_count(), 79)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import copy
+import unittest
+
+from simpleGraphM.graph import GraphFactory
+from simpleGraphM.algorithms.search import BestFirstSearch
+
+class TestGraphVersions(unittest.TestCase):
+
+    def setUp(self):
+        self.edgeDict = {('v1','v2'): 1,
+                         ('v2','v3'): 2,
+                         ('v3','v4'): 1,
+                         ('v1','v4'): 5,
+                         ('v4','v5'): 1}
+
+    def test_version_and_mutation_log(self):
+        genG = GraphFactory.create_graph("Generic", edge_dict=self.edgeDict, graph_type="directed", versioned=True)
+        self.assertEqual(genG.version, 0)
+
+        genG.add_edges([('v5','v6', 1), ('v1','v2', 3)])
+        genG.set_weight('v4', 'v5', value=2)
+        genG.add_vertex({'v7': 1})
+        genG.remove_vertices(['v6'])
+        self.assertEqual(genG.version, 6)
+        self.assertEqual([e[1] for e in genG.mutation_log],
+                         ["add_edge", "reweight_edge", "reweight_edge", "add_vertex", "remove_edge", "remove_vertex"])
+        self.assertEqual(genG.changes_since(4), genG.mutation_log[4:])
+        self.assertEqual(genG.changes_since(6), [])
+
+        # a failed mutation changes nothing
+        self.assertRaises(KeyError, genG.remove_edges, [('v5','v1')])
+        self.assertEqual(genG.version, 6)
+
+        # the counter runs without the log too
+        genG = GraphFactory.create_graph("Generic", edge_dict=self.edgeDict)
+        genG.add_edges([('v5','v6')])
+        self.assertEqual(genG.version, 1)
+        self.assertRaises(ValueError, genG.changes_since, 0)
+
+    def test_snapshots(self):
+        for graph_type in ("directed", "undirected"):
+            genG = GraphFactory.create_graph("Generic", edge_dict=self.edgeDict, graph_type=graph_type)
+            snap = genG.snapshot()
+            edges, vertices = dict(genG.edge_dict), dict(genG.vertex_dict)
+
+            genG.remove_edges([('v3','v4')])
+            genG.add_edges([('v5','v6', 1)])
+            genG.set_weight('v1', 'v4', value=2)
+            genG.remove_vertices(['v2'])
+
+            # the snapshot still shows the graph as it was
+            self.assertEqual(snap.version, 0)
+            self.assertEqual(dict(snap.edge_dict), edges)
+            self.assertEqual(dict(snap.vertex_dict), vertices)
+            self.assertEqual(set(snap.neighbors('v3')), set(w for (u, w) in edges if u == 'v3'))
+            self.assertEqual(snap.cost('v1', 'v4'), 5)
+            parent, g = BestFirstSearch(snap, 'v1', 'v5').run()
+            self.assertEqual(g['v5'], 5)
+            parent, g = BestFirstSearch(genG, 'v1', 'v5').run()
+            self.assertEqual(g['v5'], 3)
+
+            self.assertRaises(TypeError, snap.add_edges, [('v1','v5')])
+            self.assertRaises(KeyError, snap.cost, 'v5', 'v6')
+
+            # nor can the snapshot's dicts be written to
+            with self.assertRaises(TypeError):
+                snap.edge_dict[('v1','v2')] = 99
+            with self.assertRaises(TypeError):
+                del snap.edge_dict[('v1','v2')]
+            self.assertRaises(TypeError, snap.edge_dict.pop, ('v1','v2'))
+            self.assertRaises(TypeError, snap.edge_dict.update, {('v1','v2'): 99})
+            self.assertRaises(TypeError, snap.vertex_dict.update, {'v9': 1})
+            self.assertEqual(snap.cost('v1', 'v2'), 1)
+
+    def test_snapshot_keeps_replaced_attributes(self):
+        edgeDict = {('s','t'): {"cap": 3, "flow": 0}}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected", canonical=True)
+        snap = genG.snapshot()
+        genG.set_weight('t', 's', value=2, name="flow")
+        self.assertEqual(genG.cost('s', 't', name="flow"), 2)
+        self.assertEqual(snap.cost('s', 't', name="flow"), 0)
+        self.assertEqual(snap.cost('t', 's', name="flow"), 0)
+        with self.assertRaises(TypeError):
+            snap.edge_dict[('s','t')]["flow"] = 5
+        self.assertEqual(snap.cost('s', 't', name="flow"), 0)
+
+        # dead snapshots are not kept up to date
+        del snap
+        self.assertEqual(len(genG._snapshots), 0)
+        self.assertEqual(copy.deepcopy(genG).edge_dict[('t', 's')]["flow"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+
+from simpleGraphM.graph import GraphFactory, GraphView
+from simpleGraphM.algorithms.search import BestFirstSearch, BreadthFirstSearch
+from simpleGraphM.algorithms.flow import MaxFlow
+
+class TestGraphView(unittest.TestCase):
+
+    def test_subgraph_search(self):
+        edgeDict = {('v1','v2'): 1,
+                    ('v2','v3'): 2,
+                    ('v3','v4'): 1,
+                    ('v1','v4'): 5,
+                    ('v4','v5'): 1}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected")
+        subG = genG.subgraph(['v1', 'v4', 'v5'])
+
+        self.assertTrue(isinstance(subG, GraphView))
+        self.assertEqual(set(subG.neighbors('v1')), {'v4'})
+        self.assertEqual(subG.neighbors('v2'), [])
+        self.assertEqual(subG.node_count(), 3)
+        self.assertEqual(subG.edge_count(), 4)
+        self.assertRaises(KeyError, subG.cost, 'v1', 'v2')
+
+        # the path through v2, v3 is not available in the view
+        parent, g = BestFirstSearch(subG, 'v1', 'v5').run()
+        self.assertEqual(g['v5'], 6)
+        bfs = BreadthFirstSearch(subG, start='v1', goal='v5')
+        bfs.run()
+        self.assertEqual(bfs.g['v5'], 2)
+
+        # the parent graph is unaffected
+        parent, g = BestFirstSearch(genG, 'v1', 'v5').run()
+        self.assertEqual(g['v5'], 5)
+
+        # undirected edges are kept in both directions, whichever one is given
+        edgeG = genG.edge_filter([('v1', 'v2'), ('v3', 'v2')])
+        self.assertEqual(edgeG.neighbors('v1'), ['v2'])
+        self.assertEqual(sorted(edgeG.neighbors('v2')), ['v1', 'v3'])
+        self.assertEqual(edgeG.cost('v2', 'v1'), 1)
+        self.assertEqual(edgeG.cost('v2', 'v3'), 2)
+        self.assertEqual(edgeG.edge_count(), 4)
+
+    def test_edge_filter_max_flow(self):
+        edgeDict = {('s','1'): {"cap": 3},
+                    ('s','2'): {"cap": 2},
+                    ('1','2'): {"cap": 5},
+                    ('1','t'): {"cap": 2},
+                    ('2','t'): {"cap": 3},
+                    }
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict)
+        bigG = genG.edge_filter(lambda u, v, w: w["cap"] > 2)
+        self.assertEqual(set(bigG.edge_dict), {('s','1'), ('1','2'), ('2','t')})
+
+        mf = MaxFlow(bigG, source='s', sink='t')
+        mf.run()
+        self.assertEqual(mf.maxFlowVal, 3)
+        # flows are written onto the shared weights
+        self.assertEqual(genG.cost('1', '2', name="flow"), 3)
+
+        # same result from a boolean mask, chained with a subgraph
+        mask = [w["cap"] > 2 for w in genG.edge_dict.values()]
+        maskG = genG.edge_filter(mask).subgraph(['s', '1', '2', 't'])
+        self.assertEqual(set(maskG.edge_dict), set(bigG.edge_dict))
+        mf = MaxFlow(maskG.overlay(), source='s', sink='t')
+        mf.run()
+        self.assertEqual(mf.maxFlowVal, 3)
+
+        # edges given as lists are edges, not a mask
+        listG = genG.edge_filter([['s', '1'], ['1', '2']])
+        self.assertEqual(set(listG.edge_dict), {('s','1'), ('1','2')})
+        self.assertEqual(set(genG.edge_filter(np.array(mask)).edge_dict), set(bigG.edge_dict))
+
+if __name__ == "__main__":
+    unittest.main()
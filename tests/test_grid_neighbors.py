@@ -0,0 +1,102 @@
+import unittest
+import numpy as np
+
+from simpleGraphM.graph import GraphFactory
+
+class TestGridNeighbors(unittest.TestCase):
+
+    def make_grid(self, neighbor_type, grid_size=1):
+        grid_dim = [-10, 10, -5, 5]
+        sq = GraphFactory.create_graph("OccupancySquareGrid", grid=None, grid_dim=grid_dim, grid_size=grid_size, neighbor_type=neighbor_type)
+        rng = np.random.RandomState(0)
+        cells = np.argwhere(rng.rand(*sq.grid.shape) < 0.3)
+        sq.set_obstacles([(grid_dim[0] + ix * grid_size, grid_dim[2] + iy * grid_size) for iy, ix in cells])
+        return sq
+
+    def reference_neighbors(self, sq, node):
+        """neighbors as computed by chained in_bounds / not_obstacles filters"""
+        (x, y) = node
+        g = sq.grid_size
+        results = [(x + g, y), (x, y - g), (x - g, y), (x, y + g)]
+        if sq.neighbor_type == 8:
+            results += [(x + g, y + g), (x + g, y - g), (x - g, y - g), (x - g, y + g)]
+        results = [n for n in results if sq.in_bounds(n, type_='world')]
+        return [n for n in results if sq.not_obstacles(n, type_='world')]
+
+    def all_nodes(self, sq):
+        minX, maxX, minY, maxY = sq.grid_dim
+        g = sq.grid_size
+        return [(minX + ix * g, minY + iy * g) for iy in range(sq.grid.shape[0]) for ix in range(sq.grid.shape[1])]
+
+    def test_neighbors_match_reference(self):
+        for neighbor_type in (4, 8):
+            for grid_size in (1, 0.5):
+                sq = self.make_grid(neighbor_type, grid_size)
+                for node in self.all_nodes(sq):
+                    self.assertEqual(sq.neighbors(node), self.reference_neighbors(sq, node))
+
+    def test_neighbors_off_grid(self):
+        sq = self.make_grid(8)
+        sq.grid[:] = 0
+        self.assertEqual(sorted(sq.neighbors((-11, 0))), [(-10, -1), (-10, 0), (-10, 1)])
+        self.assertEqual(sq.neighbors((-12, 0)), [])
+
+    def test_neighbors_many(self):
+        sq = self.make_grid(8)
+        nodes = self.all_nodes(sq)
+        neighbors, owners = sq.neighbors_many(nodes)
+        expected = [(i, n) for i, node in enumerate(nodes) for n in self.reference_neighbors(sq, node)]
+        self.assertEqual([(i, tuple(n)) for i, n in zip(owners.tolist(), neighbors.tolist())], expected)
+
+        neighbors, owners = sq.neighbors_many([])
+        self.assertEqual(neighbors.shape, (0, 2))
+
+    def test_cache_follows_grid_changes(self):
+        sq = self.make_grid(4)
+        sq.grid[:] = 0
+        self.assertEqual(len(sq.neighbors((0, 0))), 4)
+
+        # the grid is locked while its neighbors are cached, rather than going stale
+        with self.assertRaises(ValueError):
+            sq.grid[5, 11] = 1
+        self.assertEqual(len(sq.neighbors((0, 0))), 4)
+        sq.clear_cache()
+        sq.grid[5, 11] = 1
+        self.assertNotIn((1, 0), sq.neighbors((0, 0)))
+        sq.set_node_value(11, 5, 0)
+        self.assertIn((1, 0), sq.neighbors((0, 0)))
+
+        sq.set_obstacles([(1, 0)])
+        self.assertNotIn((1, 0), sq.neighbors((0, 0)))
+
+        sq.set_node_value(10, 6, 1)     # index coordinates of (0, 1)
+        self.assertNotIn((0, 1), sq.neighbors((0, 0)))
+
+        sq.grid = np.zeros_like(sq.grid)
+        self.assertEqual(len(sq.neighbors((0, 0))), 4)
+
+        sq.neighbor_type = 8
+        self.assertEqual(len(sq.neighbors((0, 0))), 8)
+
+        # the caller's own array is left writable, the grid locks a copy of it instead
+        arr = np.zeros((11, 21))
+        own = GraphFactory.create_graph("OccupancySquareGrid", grid=arr, grid_dim=[-10, 10, -5, 5], grid_size=1)
+        self.assertEqual(len(own.neighbors((0, 0))), 4)
+        arr[5, 11] = 1
+        self.assertTrue(arr.flags.writeable)
+        self.assertIsNot(own.grid, arr)
+        self.assertEqual(len(own.neighbors((0, 0))), 4)
+        with self.assertRaises(ValueError):
+            own.grid[5, 11] = 1
+
+        # the same holds for the bits of packed grids
+        packed = GraphFactory.create_graph("OccupancySquareGrid", grid=np.zeros((11, 21)), grid_dim=[-10, 10, -5, 5],
+                                           grid_size=1, storage="packed")
+        self.assertEqual(len(packed.neighbors((0, 0))), 4)
+        with self.assertRaises(ValueError):
+            packed.bits[5, 1] = 255
+        packed.set_node_value(11, 5, 1)
+        self.assertNotIn((1, 0), packed.neighbors((0, 0)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+
+from simpleGraphM.graph import GraphFactory
+from simpleGraphM.algorithms.search import BestFirstSearch, GridSearch
+
+class TestGridSearch(unittest.TestCase):
+
+    def make_grid(self, neighbor_type, grid_size=1, density=0.25):
+        grid_dim = [-15, 15, -10, 10]
+        sq = GraphFactory.create_graph("OccupancySquareGrid", grid=None, grid_dim=grid_dim, grid_size=grid_size, neighbor_type=neighbor_type)
+        rng = np.random.RandomState(1)
+        cells = np.argwhere(rng.rand(*sq.grid.shape) < density)
+        if len(cells):
+            sq.set_obstacles([(grid_dim[0] + ix * grid_size, grid_dim[2] + iy * grid_size) for iy, ix in cells])
+        # keep the corners free
+        h, w = sq.shape
+        sq.set_node_value(0, 0, 0)
+        sq.set_node_value(w - 1, h - 1, 0)
+        return sq
+
+    def check_path(self, sq, path, start, goal):
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], goal)
+        for a, b in zip(path, path[1:]):
+            self.assertIn(b, list(sq.neighbors(a)))
+        return sum(sq.cost(a, b) for a, b in zip(path, path[1:]))
+
+    def test_same_costs_as_best_first_search(self):
+        for neighbor_type in (4, 8):
+            for grid_size in (1, 0.5):
+                for heuristic in (None, 'diagonal_nonuniform'):
+                    sq = self.make_grid(neighbor_type, grid_size)
+                    start, goal = (-15, -10), (15, 10)
+                    _, g = BestFirstSearch(sq, start, goal, heuristic_type=heuristic).run()
+
+                    gsearch = GridSearch(sq, start, goal, heuristic_type=heuristic)
+                    path = gsearch.run()
+                    cost = self.check_path(sq, path, start, goal)
+                    self.assertAlmostEqual(cost, g[goal], places=3)
+                    self.assertAlmostEqual(float(gsearch.g[-1, -1]), g[goal], places=3)
+
+    def test_dijkstra_without_goal(self):
+        sq = self.make_grid(8)
+        _, g = BestFirstSearch(sq, (-15, -10), heuristic_type=None).run()
+
+        gsearch = GridSearch(sq, (-15, -10))
+        self.assertEqual(gsearch.run(), [])
+        self.assertEqual(gsearch.g.shape, sq.grid.shape)
+        self.assertEqual(gsearch.g.dtype, np.float32)
+        self.assertEqual(gsearch.parent.dtype, np.int32)
+        self.assertEqual(int(np.isfinite(gsearch.g).sum()), len(g))
+        for node, cost in g.items():
+            self.assertAlmostEqual(float(gsearch.g.flat[gsearch.cell_id(node)]), cost, places=3)
+        self.assertEqual(gsearch.path((-15, -10)), [(-15, -10)])
+
+    def test_unreachable_goal(self):
+        sq = self.make_grid(4, density=0)
+        sq.set_obstacles([(14, 10), (15, 9)])
+        gsearch = GridSearch(sq, (-15, -10), (15, 10), heuristic_type='manhattan')
+        self.assertEqual(gsearch.run(), [])
+        with self.assertRaises(ValueError):
+            GridSearch(sq, (-16, -10))
+
+    def test_memory_usage(self):
+        sq = self.make_grid(8, density=0)
+        gsearch = GridSearch(sq, (-15, -10), heuristic_type=None)
+        gsearch.run()
+        bfs = BestFirstSearch(sq, (-15, -10), heuristic_type=None)
+        bfs.run()
+        cells = sq.grid.size
+        self.assertLessEqual(gsearch.memory_usage()["g"] + gsearch.memory_usage()["parent"], 8 * cells + 200)
+        self.assertLess(gsearch.memory_usage()["total"], bfs.memory_usage()["total"] / 5)
+
+if __name__ == "__main__":
+    unittest.main()
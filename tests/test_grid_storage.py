@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from simpleGraphM.graph import GraphFactory
+from simpleGraphM.graph.square_grid import SquareGrid, OccupancySquareGrid
+from simpleGraphM.graph.grid_utils import init_grid
+from simpleGraphM.algorithms.search import GridSearch
+
+class TestGridStorage(unittest.TestCase):
+
+    grid_dim = [-15, 15, -10, 10]
+
+    def make_grids(self, neighbor_type=8):
+        """The same random occupancy grid, stored as float64, uint8 and packed bits"""
+        rng = np.random.RandomState(2)
+        cells = np.argwhere(rng.rand(21, 31) < 0.25)
+        obstacles = [(self.grid_dim[0] + ix, self.grid_dim[2] + iy) for iy, ix in cells]
+        specs = [{}, {"dtype": np.uint8}, {"storage": "packed"}]
+        return [GraphFactory.create_graph("OccupancySquareGrid", grid_dim=self.grid_dim, grid_size=1,
+                                          neighbor_type=neighbor_type, obstacles=obstacles, **spec) for spec in specs]
+
+    def test_init_grid_dtype(self):
+        self.assertEqual(init_grid(self.grid_dim, 1, init_val=0).dtype, np.float64)
+        grid = init_grid(self.grid_dim, 1, init_val=3, dtype=np.uint8)
+        self.assertEqual(grid.dtype, np.uint8)
+        self.assertTrue((grid == 3).all())
+        self.assertEqual(SquareGrid(grid_dim=self.grid_dim, grid_size=1, dtype=np.int16).grid.dtype, np.int16)
+
+    def test_storage(self):
+        dense, small, packed = self.make_grids()
+        self.assertEqual(dense.grid.dtype, np.float64)
+        self.assertEqual(small.grid.dtype, np.uint8)
+        self.assertEqual(packed.bits.shape, (21, 4))
+        self.assertEqual(packed.shape, dense.shape)
+        np.testing.assert_array_equal(packed.grid, dense.grid)
+        np.testing.assert_array_equal(small.grid, dense.grid)
+
+        # the unpacked grid is a copy, edits must go through the grid methods
+        with self.assertRaises(ValueError):
+            packed.grid[0, 0] = 1
+
+        self.assertEqual(small.grid.nbytes * 8, dense.grid.nbytes)
+        self.assertLess(small.memory_usage()["grid"], dense.memory_usage()["grid"] / 4)
+        self.assertEqual(packed.bits.nbytes, 21 * 4)
+        self.assertLess(packed.memory_usage()["grid"], small.memory_usage()["grid"])
+
+        with self.assertRaises(ValueError):
+            GraphFactory.create_graph("OccupancySquareGrid", grid_dim=self.grid_dim, grid_size=1, storage="sparse")
+
+    def test_obstacle_tests_agree(self):
+        grids = self.make_grids()
+        dense = grids[0]
+        for iy in range(dense.shape[0]):
+            for ix in range(dense.shape[1]):
+                node = (self.grid_dim[0] + ix, self.grid_dim[2] + iy)
+                expected = dense.not_obstacles((ix, iy))
+                for sq in grids:
+                    self.assertEqual(sq.not_obstacles((ix, iy)), expected)
+                    self.assertEqual(sq.not_obstacles(node, type_='world'), expected)
+                    self.assertEqual(sq.neighbors(node), dense.neighbors(node))
+
+        nodes = [(x, y) for x in range(-15, 16, 3) for y in range(-10, 11, 2)]
+        expected = dense.neighbors_many(nodes)
+        for sq in grids[1:]:
+            neighbors, owners = sq.neighbors_many(nodes)
+            np.testing.assert_array_equal(neighbors, expected[0])
+            np.testing.assert_array_equal(owners, expected[1])
+
+    def test_set_obstacles_and_node_values(self):
+        for sq in self.make_grids(neighbor_type=4):
+            sq.set_node_value(20, 10, 0)
+            sq.set_node_value(16, 10, 0)
+            self.assertIn((1, 0), sq.neighbors((0, 0)))
+            sq.set_obstacles([(1, 0), (-1, 0)])
+            self.assertFalse(sq.not_obstacles((1, 0), type_='world'))
+            self.assertNotIn((1, 0), sq.neighbors((0, 0)))
+            sq.set_node_value(16, 10, 0)
+            self.assertTrue(sq.not_obstacles((16, 10)))
+            self.assertIn((1, 0), sq.neighbors((0, 0)))
+            self.assertNotIn((-1, 0), sq.neighbors((0, 0)))
+
+    def test_grid_search_on_packed_grid(self):
+        dense, small, packed = self.make_grids()
+        for sq in (dense, small, packed):
+            sq.set_node_value(0, 0, 0)
+            sq.set_node_value(30, 20, 0)
+        paths = [GridSearch(sq, (-15, -10), (15, 10), heuristic_type='diagonal_nonuniform').run() for sq in (dense, small, packed)]
+        self.assertTrue(paths[0])
+        self.assertEqual(paths[1], paths[0])
+        self.assertEqual(paths[2], paths[0])
+
+    def test_save_load_packed(self):
+        packed = self.make_grids()[2]
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "grid.sgm")
+            packed.save(path)
+            loaded = SquareGrid.load(path)
+        self.assertEqual(loaded.storage, "packed")
+        np.testing.assert_array_equal(loaded.bits, packed.bits)
+        self.assertEqual(loaded.neighbors((0, 0)), packed.neighbors((0, 0)))
+
+    def test_packed_file_holds_bits(self):
+        sq = OccupancySquareGrid(grid_dim=[0, 999, 0, 999], grid_size=1, storage="packed")
+        sq.set_obstacles([(3, 4), (999, 999)])
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "grid.sgm")
+            sq.save(path)
+            # 1000 x 1000 cells at one bit each, plus the header
+            self.assertLess(os.path.getsize(path), 130000)
+
+            loaded = SquareGrid.load(path)
+            # the bits are memory mapped as they are, not unpacked and packed again
+            self.assertIsInstance(loaded.bits, np.memmap)
+            loaded.neighbors((1, 1))
+            self.assertIsInstance(loaded.bits, np.memmap)
+            self.assertEqual(loaded.shape, (1000, 1000))
+            self.assertFalse(loaded.not_obstacles((999, 999)))
+            self.assertTrue(loaded.not_obstacles((998, 999)))
+            loaded.set_node_value(0, 0, 1)
+            self.assertFalse(loaded.not_obstacles((0, 0)))
+            del loaded
+
+            loaded = SquareGrid.load(path, mmap=False)
+            self.assertNotIsInstance(loaded.bits, np.memmap)
+            np.testing.assert_array_equal(loaded.bits, sq.bits)
+
+    def test_cached_packed_grid_is_read_only(self):
+        sq = GraphFactory.create_graph("OccupancySquareGrid", cache=True, grid_dim=self.grid_dim, grid_size=1, storage="packed")
+        with self.assertRaises(ValueError):
+            sq.set_node_value(0, 0, 1)
+        GraphFactory.invalidate()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+import unittest
+
+# Import the package in a fresh interpreter and report which heavy optional dependencies got
+# pulled in. Checked by module rather than by wall-clock time, which is unreliable on loaded
+# machines; matplotlib.pyplot alone used to cost ~0.5s of the import
+_SCRIPT = """
+import sys
+import simpleGraphM.graph
+import simpleGraphM.algorithms
+print(' '.join(m for m in ('matplotlib', 'matplotlib.pyplot') if m in sys.modules))
+"""
+
+class TestImportTime(unittest.TestCase):
+
+    def test_import_does_not_load_matplotlib(self):
+        out = subprocess.run([sys.executable, "-c", _SCRIPT], check=True, capture_output=True, text=True).stdout
+        self.assertEqual(out.strip(), "")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+
+from simpleGraphM.graph import GraphFactory
+from simpleGraphM.graph.graph_manager import CostMapManager
+from simpleGraphM.graph.memory import sizeof, peak_memory
+from simpleGraphM.algorithms.search import BestFirstSearch
+
+class TestMemoryUsage(unittest.TestCase):
+
+    def test_graph_memory_usage(self):
+        edgeDict = {(i, i+1): {"cap": i} for i in range(1000)}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="directed")
+
+        report = genG.memory_usage()
+        self.assertEqual(set(report), {"edge_dict", "vertex_dict", "adjList", "predList", "vertex_table", "total"})
+        self.assertEqual(report["total"], sum(v for k, v in report.items() if k != "total"))
+        self.assertEqual(report["predList"], 0)
+        # weights are only counted deep
+        self.assertGreater(report["edge_dict"], genG.memory_usage(deep=False)["edge_dict"])
+
+        genG.predecessors(0)
+        self.assertGreater(genG.memory_usage()["predList"], 0)
+
+        # frozen graphs hold far less than their dict counterparts
+        csrG = genG.freeze()
+        self.assertLess(csrG.memory_usage()["total"], report["total"] / 2)
+
+    def test_grid_and_cost_map_memory_usage(self):
+        grid = GraphFactory.create_graph("OccupancySquareGrid", grid_dim=[0, 99, 0, 99], grid_size=1, neighbor_type=4)
+        report = grid.memory_usage()
+        self.assertGreaterEqual(report["grid"], grid.grid.nbytes)
+
+        cm = CostMapManager()
+        cm.add_layer(np.zeros((10, 10)), "a")
+        cm.add_layer(np.zeros((20, 20)), "b")
+        report = cm.memory_usage()
+        self.assertGreater(report["b"], report["a"])
+        self.assertEqual(report["total"], report["a"] + report["b"])
+
+    def test_search_memory_usage(self):
+        grid = GraphFactory.create_graph("OccupancySquareGrid", grid_dim=[0, 29, 0, 29], grid_size=1, neighbor_type=8)
+        search = BestFirstSearch(grid, (0, 0), (29, 29))
+        before = search.memory_usage()["total"]
+
+        (parent, g), peak = peak_memory(search.run)
+        self.assertEqual(set(search.memory_usage()), {"g", "parent", "frontier", "boundary_nodes", "total"})
+        self.assertGreater(search.memory_usage()["g"], sizeof({}))
+        self.assertGreater(search.memory_usage()["total"], before)
+        self.assertGreater(peak, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+from simpleGraphM.graph import GraphFactory, OverlayGraph
+from simpleGraphM.algorithms.flow import MaxFlow
+
+class TestOverlayGraph(unittest.TestCase):
+
+    def test_overlay_does_not_modify_base(self):
+        edgeDict = {('v1','v2'): {"cap": 1},
+                    ('v2','v3'): {"cap": 2},
+                    ('v3','v4'): {"cap": 3}}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="directed")
+        ovG = genG.overlay()
+        self.assertTrue(isinstance(ovG, OverlayGraph))
+
+        ovG.add_edge({('v4','v5'): {"cap": 4}})
+        ovG.remove_edges([('v1','v2')])
+        ovG.set_weight('v2', 'v3', value=20, name="cap")
+
+        # the overlay sees its own changes
+        self.assertEqual(set(ovG.neighbors('v4')), set(['v5']))
+        self.assertEqual(set(ovG.neighbors('v1')), set())
+        self.assertRaises(KeyError, ovG.cost, 'v1', 'v2')
+        self.assertEqual(ovG.cost('v2', 'v3', name="cap"), 20)
+        self.assertEqual(ovG.cost('v3', 'v4', name="cap"), 3)
+        self.assertEqual(ovG.edge_count(), 3)
+        self.assertEqual(set(ovG.get_vertices()), set(['v1', 'v2', 'v3', 'v4', 'v5']))
+
+        # the base is untouched
+        self.assertEqual(genG.cost('v2', 'v3', name="cap"), 2)
+        self.assertEqual(genG.cost('v1', 'v2', name="cap"), 1)
+        self.assertEqual(set(genG.neighbors('v4')), set())
+        self.assertEqual(genG.edge_count(), 3)
+
+        # only the changed edges and vertices are stored
+        self.assertEqual(ovG.change_count(), 4)
+
+    def test_overlay_copies_on_write_only(self):
+        edgeDict = {('a','b'): {"cap": 1, "flow": 0},
+                    ('b','c'): {"cap": 2, "flow": 0},
+                    ('c','c'): {"cap": 3, "flow": 0}}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected")
+        ovG = genG.overlay()
+
+        # plain reads do not copy anything
+        self.assertEqual(dict(ovG.edge_dict)[('a','b')], {"cap": 1, "flow": 0})
+        self.assertEqual(len(list(ovG.edge_dict.values())), 5)
+        self.assertEqual(ovG.edge_dict[('b','c')]["cap"], 2)
+        self.assertEqual(ovG.change_count(), 0)
+
+        # a write copies the weight once, shared by both directions of the undirected edge
+        ovG.edge_dict[('a','b')]['flow'] = 5
+        self.assertEqual(ovG.edge_dict[('b','a')]['flow'], 5)
+        ovG.edge_dict[('b','a')]['flow'] += 1
+        self.assertEqual(ovG.edge_dict[('a','b')]['flow'], 6)
+        self.assertEqual(genG.edge_dict[('a','b')], {"cap": 1, "flow": 0})
+        self.assertTrue(genG.edge_dict[('b','a')] is genG.edge_dict[('a','b')])
+
+        # nested weights are copied on write too, from the top
+        nestedG = GraphFactory.create_graph("Generic", edge_dict={('a','b'): {"level1": {"level2": {"level3": [1, 2]}}}})
+        ovG2 = nestedG.overlay()
+        ovG2.edge_dict[('a','b')]["level1"]["level2"]["level3"].append(3)
+        ovG2.edge_dict[('a','b')]["level1"]["level2"]["x"] = 99
+        self.assertEqual(ovG2.cost('a', 'b', name=["level1", "level2"]), {"level3": [1, 2, 3], "x": 99})
+        self.assertEqual(nestedG.edge_dict[('a','b')], {"level1": {"level2": {"level3": [1, 2]}}})
+        self.assertEqual(nestedG.overlay().edge_dict[('a','b')]["level1"]["level2"]["level3"], [1, 2])
+
+        # self loops of undirected graphs are removed like in GenericGraph
+        ovG.remove_edges([('c','c')])
+        self.assertFalse(('c','c') in ovG.edge_dict)
+        self.assertEqual(ovG.neighbors('c'), ['b'])
+        self.assertTrue(('c','c') in genG.edge_dict)
+
+    def test_max_flow_on_overlay(self):
+        edgeDict = {('s','1'): {"cap": 3},
+                    ('s','2'): {"cap": 2},
+                    ('1','2'): {"cap": 5},
+                    ('1','t'): {"cap": 2},
+                    ('2','t'): {"cap": 3},
+                    }
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="directed")
+
+        for method in ("edmonds_karp", "push_relabel"):
+            mf = MaxFlow(genG.overlay(), source='s', sink='t')
+            mf.run(method)
+            self.assertEqual(mf.maxFlowVal, 5)
+            self.assertEqual(mf.maxFlowVal, mf.minCutVal)
+
+        # flows were only written to the overlays
+        self.assertEqual(genG.edge_dict[('s','1')], {"cap": 3})
+        self.assertEqual(genG.vertex_dict['s'], None)
+
+if __name__ == "__main__":
+    unittest.main()
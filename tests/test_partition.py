@@ -0,0 +1,65 @@
+import unittest
+
+from simpleGraphM.graph import GraphFactory
+from simpleGraphM.algorithms.partition import GraphPartition
+from simpleGraphM.algorithms.search import BestFirstSearch
+
+class TestGraphPartition(unittest.TestCase):
+
+    def setUp(self):
+        # a 20x20 grid graph
+        edgeDict = {}
+        for x in range(20):
+            for y in range(20):
+                for nb in ((x+1, y), (x, y+1)):
+                    if nb[0] < 20 and nb[1] < 20:
+                        edgeDict[((x, y), nb)] = 1
+        self.genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="undirected")
+
+    def test_balanced_parts_with_small_cut(self):
+        gp = GraphPartition(self.genG, k=4)
+        parts = gp.run()
+
+        self.assertEqual(len(parts), 400)
+        self.assertEqual(sum(gp.part_sizes), 400)
+        self.assertLessEqual(max(gp.part_sizes), gp.max_size)
+        # a perfect split into quadrants cuts 40 edges, random assignment ~570
+        self.assertLess(gp.cut_size, 100)
+
+        # boundary vertices are exactly those with a neighbor in another part
+        for p in range(4):
+            for v in gp.part_vertices(p):
+                crosses = any(parts[w] != p for w in self.genG.neighbors(v))
+                self.assertEqual(v in gp.boundary[p], crosses)
+
+    def test_part_subgraphs(self):
+        gp = GraphPartition(self.genG, k=3)
+        gp.run()
+        subGs = gp.subgraphs()
+        self.assertEqual(sum(subG.node_count() for subG in subGs), 400)
+
+        p = gp.parts[(0, 0)]
+        subG = gp.subgraph(p)
+        self.assertEqual(set(subG.get_vertices()), set(subGs[p].get_vertices()))
+        for v in subG.get_vertices():
+            for w in subG.neighbors(v):
+                self.assertEqual(gp.parts[w], p)
+
+        parent, g = BestFirstSearch(subG, (0, 0)).run()
+        self.assertLessEqual(len(g), gp.part_sizes[p])
+
+    def test_disconnected_and_small_graphs(self):
+        edgeDict = {('a','b'): 1, ('c','d'): 1, ('e','f'): 1}
+        genG = GraphFactory.create_graph("Generic", edge_dict=edgeDict, graph_type="directed")
+        gp = GraphPartition(genG, k=3)
+        gp.run()
+        self.assertEqual(gp.cut_size, 0)
+        self.assertEqual(gp.part_sizes, [2, 2, 2])
+
+        gp = GraphPartition(genG, k=1)
+        gp.run()
+        self.assertEqual(gp.boundary, [set()])
+        self.assertRaises(ValueError, GraphPartition, genG, 0)
+
+if __name__ == "__main__":
+    unittest.main()